@@ -4,17 +4,71 @@ Nexus App Error Fixer
 Automatically fixes all Dart compilation errors in the Nexus app
 """
 
+import argparse
+import difflib
 import os
 import re
 import sys
+from pathlib import Path
 
-def fix_pubspec_yaml(project_path):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+from content_io import read_text, write_bytes_if_changed
+from dart_index import index_source
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+
+class FileSet:
+    """Project files loaded once, patched in memory, and written once."""
+
+    def __init__(self, project_path):
+        self.project_path = project_path
+        self.original = {}
+        self.current = {}
+
+    def get(self, rel_path):
+        if rel_path not in self.current:
+            self.original[rel_path] = read_text(Path(self.project_path, rel_path))
+            self.current[rel_path] = self.original[rel_path]
+        return self.current[rel_path]
+
+    def set(self, rel_path, content):
+        self.current[rel_path] = content
+
+    def changed(self):
+        return [p for p in self.current if self.current[p] != self.original[p]]
+
+    def diff(self):
+        chunks = []
+        for rel_path in self.changed():
+            chunks.extend(difflib.unified_diff(
+                self.original[rel_path].splitlines(keepends=True),
+                self.current[rel_path].splitlines(keepends=True),
+                fromfile=f'a/{rel_path}',
+                tofile=f'b/{rel_path}',
+            ))
+        return ''.join(chunks)
+
+    def write(self):
+        written = self.changed()
+        for rel_path in written:
+            write_bytes_if_changed(Path(self.project_path, rel_path), self.current[rel_path].encode('utf-8'))
+            self.original[rel_path] = self.current[rel_path]
+        return written
+
+
+class Patch:
+    """A fixer that rewrites the content of one project file."""
+
+    def __init__(self, rel_path, fixer):
+        self.rel_path = rel_path
+        self.fixer = fixer
+
+    def apply(self, files):
+        files.set(self.rel_path, self.fixer(files.get(self.rel_path)))
+
+
+def fix_pubspec_yaml(content):
     """Add missing google_sign_in dependency"""
-    pubspec_path = os.path.join(project_path, 'pubspec.yaml')
-    
-    with open(pubspec_path, 'r') as f:
-        content = f.read()
-    
     # Check if google_sign_in is already there
     if 'google_sign_in:' not in content:
         print("✓ Adding google_sign_in to pubspec.yaml")
@@ -25,18 +79,14 @@ def fix_pubspec_yaml(project_path):
             'firebase_core: ^4.3.0',
             'firebase_core: ^4.3.0\n  google_sign_in: ^6.2.1'
         )
-        
-        with open(pubspec_path, 'w') as f:
-            f.write(content)
     else:
         print("✓ google_sign_in already in pubspec.yaml")
+    
+    return content
 
-def fix_journey_provider(project_path):
+def fix_journey_provider(content):
     """Fix duplicate allJourneyProgressProvider declaration"""
-    file_path = os.path.join(project_path, 'lib/core/providers/journey_provider.dart')
-    
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
+    lines = content.splitlines(keepends=True)
     
     print("✓ Fixing duplicate allJourneyProgressProvider in journey_provider.dart")
     
@@ -60,16 +110,10 @@ def fix_journey_provider(project_path):
         
         new_lines.append(line)
     
-    with open(file_path, 'w') as f:
-        f.writelines(new_lines)
+    return ''.join(new_lines)
 
-def fix_firestore_service(project_path):
+def fix_firestore_service(content):
     """Fix duplicate getUser and updateUserFields declarations"""
-    file_path = os.path.join(project_path, 'lib/core/services/firestore_service.dart')
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
     print("✓ Fixing duplicate methods in firestore_service.dart")
     
     # Remove the duplicate getUser method (around line 533)
@@ -81,22 +125,17 @@ def fix_firestore_service(project_path):
     pattern = r'\/\/ Duplicate updateUserFields.*?Future<void> updateUserFields\(String userId, Map<String, dynamic> fields\) async \{.*?\n  \}'
     content = re.sub(pattern, '', content, flags=re.DOTALL)
     
-    with open(file_path, 'w') as f:
-        f.write(content)
+    return content
 
-def fix_user_model(project_path):
+def fix_user_model(content):
     """Add missing fromFirestore and toFirestore methods to UserModel"""
-    file_path = os.path.join(project_path, 'lib/core/models/user_model.dart')
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
     print("✓ Adding missing methods to UserModel")
     
     # Check if methods already exist
-    if 'fromFirestore' not in content:
-        # Find the last closing brace of the class
-        insert_position = content.rfind('}')
+    idx = index_source(content)
+    if idx.has_class('UserModel') and not idx.has_member('UserModel', 'UserModel.fromFirestore', 'fromFirestore'):
+        # Append to the end of the UserModel class body
+        insert_position = idx.class_end('UserModel')
         
         methods = '''
   // Firestore serialization
@@ -144,17 +183,11 @@ def fix_user_model(project_path):
   }
 '''
         content = content[:insert_position] + methods + content[insert_position:]
-        
-        with open(file_path, 'w') as f:
-            f.write(content)
+    
+    return content
 
-def fix_assessment_model(project_path):
+def fix_assessment_model(content):
     """Add missing fromFirestore methods to AssessmentResult"""
-    file_path = os.path.join(project_path, 'lib/core/models/assessment_model.dart')
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
     print("✓ Adding missing methods to AssessmentResult")
     
     if 'AssessmentResult.fromFirestore' not in content:
@@ -192,17 +225,11 @@ def fix_assessment_model(project_path):
   '''
         
         content = re.sub(pattern, r'\1' + method + r'\2', content, flags=re.DOTALL)
-        
-        with open(file_path, 'w') as f:
-            f.write(content)
+    
+    return content
 
-def fix_journey_model(project_path):
+def fix_journey_model(content):
     """Add missing fromFirestore and id parameter to JourneyProgress"""
-    file_path = os.path.join(project_path, 'lib/core/models/journey_model.dart')
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
     print("✓ Adding missing methods to JourneyProgress")
     
     # Add id parameter if missing
@@ -217,7 +244,8 @@ def fix_journey_model(project_path):
         )
     
     # Add fromFirestore if missing
-    if 'JourneyProgress.fromFirestore' not in content:
+    idx = index_source(content)
+    if idx.has_class('JourneyProgress') and not idx.has_member('JourneyProgress', 'JourneyProgress.fromFirestore', 'fromFirestore'):
         method = '''
   factory JourneyProgress.fromFirestore(Map<String, dynamic> data) {
     return JourneyProgress(
@@ -252,24 +280,18 @@ def fix_journey_model(project_path):
   }
 '''
         # Find the class end and insert before it
-        insert_pos = content.find('class JourneyProgress {')
-        insert_pos = content.find('}', insert_pos)
+        insert_pos = idx.class_end('JourneyProgress')
         content = content[:insert_pos] + method + '\n' + content[insert_pos:]
     
-    with open(file_path, 'w') as f:
-        f.write(content)
+    return content
 
-def fix_story_model(project_path):
+def fix_story_model(content):
     """Add missing methods to story models"""
-    file_path = os.path.join(project_path, 'lib/core/models/story_model.dart')
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
     print("✓ Adding missing methods to story models")
     
     # Add StoryProgress.fromFirestore if missing
-    if 'StoryProgress.fromFirestore' not in content:
+    idx = index_source(content)
+    if idx.has_class('StoryProgress') and not idx.has_member('StoryProgress', 'StoryProgress.fromFirestore', 'fromFirestore'):
         method = '''
   factory StoryProgress.fromFirestore(Map<String, dynamic> data) {
     return StoryProgress(
@@ -294,13 +316,12 @@ def fix_story_model(project_path):
   }
 '''
         # Find StoryProgress class
-        insert_pos = content.find('class StoryProgress {')
-        if insert_pos != -1:
-            insert_pos = content.find('}', insert_pos)
-            content = content[:insert_pos] + method + '\n' + content[insert_pos:]
+        insert_pos = idx.class_end('StoryProgress')
+        content = content[:insert_pos] + method + '\n' + content[insert_pos:]
     
     # Add PollVote.fromFirestore if missing
-    if 'PollVote.fromFirestore' not in content:
+    idx = index_source(content)
+    if idx.has_class('PollVote') and not idx.has_member('PollVote', 'PollVote.fromFirestore', 'fromFirestore'):
         # Add id parameter to PollVote first
         content = content.replace(
             'const PollVote({',
@@ -332,21 +353,14 @@ def fix_story_model(project_path):
     };
   }
 '''
-        insert_pos = content.find('class PollVote {')
-        if insert_pos != -1:
-            insert_pos = content.find('}', insert_pos)
-            content = content[:insert_pos] + method + '\n' + content[insert_pos:]
+        idx = index_source(content)
+        insert_pos = idx.class_end('PollVote')
+        content = content[:insert_pos] + method + '\n' + content[insert_pos:]
     
-    with open(file_path, 'w') as f:
-        f.write(content)
+    return content
 
-def fix_session_response_model(project_path):
+def fix_session_response_model(content):
     """Add id parameter and methods to SessionResponse"""
-    file_path = os.path.join(project_path, 'lib/core/models/journey_model.dart')
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
     print("✓ Fixing SessionResponse model")
     
     # Add id parameter
@@ -361,7 +375,8 @@ def fix_session_response_model(project_path):
         )
     
     # Add fromFirestore method
-    if 'SessionResponse.fromFirestore' not in content:
+    idx = index_source(content)
+    if idx.has_class('SessionResponse') and not idx.has_member('SessionResponse', 'SessionResponse.fromFirestore', 'fromFirestore'):
         method = '''
   factory SessionResponse.fromFirestore(Map<String, dynamic> data) {
     return SessionResponse(
@@ -385,22 +400,36 @@ def fix_session_response_model(project_path):
     };
   }
 '''
-        # Find SessionResponse class and add method
-        insert_pos = content.find('class SessionResponse {')
-        if insert_pos != -1:
-            # Find the constructor closing brace
-            insert_pos = content.find('});', insert_pos) + 3
-            content = content[:insert_pos] + '\n' + method + content[insert_pos:]
+        # Add the methods right after the constructor (or at the class end)
+        ctor = idx.member('SessionResponse', 'SessionResponse')
+        insert_pos = ctor.end if ctor else idx.class_end('SessionResponse')
+        content = content[:insert_pos] + '\n' + method + content[insert_pos:]
     
-    with open(file_path, 'w') as f:
-        f.write(content)
+    return content
+
+PATCHES = [
+    Patch('pubspec.yaml', fix_pubspec_yaml),
+    Patch('lib/core/providers/journey_provider.dart', fix_journey_provider),
+    Patch('lib/core/services/firestore_service.dart', fix_firestore_service),
+    Patch('lib/core/models/user_model.dart', fix_user_model),
+    Patch('lib/core/models/assessment_model.dart', fix_assessment_model),
+    Patch('lib/core/models/journey_model.dart', fix_journey_model),
+    Patch('lib/core/models/story_model.dart', fix_story_model),
+    Patch('lib/core/models/journey_model.dart', fix_session_response_model),
+]
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 fix_nexus_errors.py /path/to/nexus_app")
-        sys.exit(1)
-    
-    project_path = sys.argv[1]
+    parser = argparse.ArgumentParser(
+        usage="python3 fix_nexus_errors.py [--dry-run] /path/to/nexus_app",
+        description="Automatically fixes Dart compilation errors in the Nexus app",
+    )
+    parser.add_argument('project_path')
+    parser.add_argument('--dry-run', action='store_true', help="print the combined diff without writing files")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+    
+    project_path = args.project_path
     
     if not os.path.exists(project_path):
         print(f"Error: Project path {project_path} does not exist")
@@ -409,20 +438,26 @@ def main():
     print("🔧 Starting Nexus App Error Fixer...\n")
     
     try:
-        fix_pubspec_yaml(project_path)
-        fix_journey_provider(project_path)
-        fix_firestore_service(project_path)
-        fix_user_model(project_path)
-        fix_assessment_model(project_path)
-        fix_journey_model(project_path)
-        fix_story_model(project_path)
-        fix_session_response_model(project_path)
+        # Every file is read once; patches sharing a file see each other's edits.
+        files = FileSet(project_path)
+        for patch in PATCHES:
+            with section("patch", file=patch.rel_path, stage=patch.fixer.__name__):
+                patch.apply(files)
+        
+        if args.dry_run:
+            diff = files.diff()
+            print("\n" + (diff if diff else "No changes needed.\n"), end='')
+            return
         
-        print("\n✅ All fixes applied successfully!")
+        written = files.write()
+        print(f"\n✅ All fixes applied successfully! ({len(written)} file(s) updated)")
+        for rel_path in written:
+            print("   -", rel_path)
         print("\n📦 Running flutter pub get...")
         
         os.chdir(project_path)
-        os.system('flutter pub get')
+        with section("pub_get"):
+            os.system('flutter pub get')
         
         print("\n🎉 Done! Try running your app now:")
         print("   cd", project_path)
@@ -433,4 +468,4 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
@@ -397,13 +397,8 @@ class AppConfig {
       'journeys_married_v2_parenting.json';
 
   // Legacy journey configs (deprecated - keep for migration)
-  static const String legacySinglesJourneyConfig = 'singles_v1.json';
   static const String legacyMarriedJourneyConfig = 'married_v1.json';
 
-  // Fallback path for singles when v2 is empty
-  static const String singlesV1FallbackPath =
-      '$journeysConfigPath/$legacySinglesJourneyConfig';
-
   // Full config paths - Assessments
   static const String singlesReadinessPath =
       '$assessmentsConfigPath/$singlesReadinessConfig';
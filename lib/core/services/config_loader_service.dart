@@ -100,27 +100,12 @@ class ConfigLoaderService {
   // Separate catalogs for each relationship status
 
   /// Load Singles (Never Married) Journey Catalog
-  /// Falls back to singles_v1.json if the v2 file is empty
+  /// Generated from assets/data/journeys/singles_v1.json by tools/build_singles_v2_catalog.py
   Future<JourneyCatalog> loadSinglesNeverMarriedJourneyCatalog() async {
     if (_singlesNeverMarriedJourneyCatalog != null) return _singlesNeverMarriedJourneyCatalog!;
     
-    try {
-      final jsonData = await _loadJsonAsset(AppConfig.singlesNeverMarriedJourneyPath);
-      final catalog = JourneyCatalog.fromJson(jsonData);
-      
-      // If v2 file is empty, fall back to v1
-      if (catalog.products.isEmpty) {
-        final fallbackData = await _loadJsonAsset(AppConfig.singlesV1FallbackPath);
-        _singlesNeverMarriedJourneyCatalog = JourneyCatalog.fromJson(fallbackData);
-      } else {
-        _singlesNeverMarriedJourneyCatalog = catalog;
-      }
-    } catch (_) {
-      // On any error, use the v1 fallback
-      final fallbackData = await _loadJsonAsset(AppConfig.singlesV1FallbackPath);
-      _singlesNeverMarriedJourneyCatalog = JourneyCatalog.fromJson(fallbackData);
-    }
-    
+    final jsonData = await _loadJsonAsset(AppConfig.singlesNeverMarriedJourneyPath);
+    _singlesNeverMarriedJourneyCatalog = JourneyCatalog.fromJson(jsonData);
     return _singlesNeverMarriedJourneyCatalog!;
   }
 
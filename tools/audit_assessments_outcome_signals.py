@@ -1,100 +1,186 @@
+import argparse
 import json
 import re
+import sys
 from collections import Counter, defaultdict
+from functools import partial
 from pathlib import Path
 
+from content_io import read_bytes, read_json
+from content_manifest import Manifest, fingerprint
+from tool_jobs import add_jobs_arg, map_jobs
+from tool_profile import add_profile_args, run_main, section, start_profile
+
 ASSESS_DIR = Path("assets/config/assessments")
 TOKEN_RE = re.compile(r"^[a-z0-9_]+$")
 
 def load(path: Path):
-    return json.loads(path.read_text(encoding="utf-8"))
+    return read_json(path)
 
-def main():
-    if not ASSESS_DIR.exists():
-        raise SystemExit(f"❌ Missing folder: {ASSESS_DIR} (run from repo root)")
+def iter_findings(data: dict, combos: bool = True):
+    """Yield (kind, row) findings for one assessment as they are discovered.
 
-    files = sorted(ASSESS_DIR.glob("*.json"))
-    if not files:
-        raise SystemExit(f"❌ No JSON files in {ASSESS_DIR}")
+    Kinds are "bad_token", "restoration", "combos" (one per question, only
+    when `combos` is set) and, once the whole file has been seen,
+    "duplicate". Only the token counts are held for the whole file.
+    """
+    # Collect outcomeSignal tokens to detect duplicates in the file
+    counts = Counter()
 
-    overall_bad = 0
-    overall_restoration = 0
+    for qi, q in enumerate(data.get("questions", [])):
+        qid = (q.get("id") or "").strip() or f"q{qi+1}"
+        dim = (q.get("dimension") or "").strip()
+        opts = q.get("options", [])
+        question_combos = defaultdict(int)
 
-    for path in files:
-        data = load(path)
-        questions = data.get("questions", [])
-        print(f"\n==== {path.name} ====")
-
-        # Collect outcomeSignal tokens to detect duplicates in the file
-        tokens = []
-        bad_rows = []
-        restoration_rows = []
-
-        for qi, q in enumerate(questions):
-            qid = (q.get("id") or "").strip() or f"q{qi+1}"
-            dim = (q.get("dimension") or "").strip()
-            opts = q.get("options", [])
-
-            for oi, opt in enumerate(opts):
-                tier = (opt.get("signalTier") or "").strip()
-                sig = (opt.get("outcomeSignal") or "").strip()
+        for oi, opt in enumerate(opts):
+            tier = (opt.get("signalTier") or "").strip()
+            sig = (opt.get("outcomeSignal") or "").strip()
+            if sig:
+                counts[sig] += 1
+            if sig and not TOKEN_RE.fullmatch(sig):
+                yield "bad_token", (qid, dim, tier, sig)
+            if tier.upper() == "RESTORATION":
+                yield "restoration", (qid, dim, sig, opt.get("text", ""))
+            if combos:
                 lbl = (opt.get("outcomeLabel") or "").strip()
-                if sig:
-                    tokens.append(sig)
-                if sig and not TOKEN_RE.fullmatch(sig):
-                    bad_rows.append((qid, dim, tier, sig))
-                if tier.upper() == "RESTORATION":
-                    restoration_rows.append((qid, dim, sig, opt.get("text", "")))
-
-        # Print bad outcomeSignal lines
-        if bad_rows:
-            print("BAD outcomeSignal (must be snake_case token):")
-            for (qid, dim, tier, sig) in bad_rows[:80]:
-                print(f" - {qid} [{dim}] tier={tier} outcomeSignal={sig}")
-        else:
-            print("✅ No bad outcomeSignal tokens found.")
-
-        # Print restoration tiers
-        if restoration_rows:
-            print("⚠️ Found RESTORATION tiers (should map to DEVELOPING):")
-            for (qid, dim, sig, text) in restoration_rows[:80]:
-                print(f" - {qid} [{dim}] outcomeSignal={sig} optionText={text}")
-        else:
-            print("✅ No RESTORATION tiers found.")
-
-        # Token collisions
-        counts = Counter(tokens)
-        dups = [t for t, c in counts.items() if c > 1]
-        if dups:
-            print("⚠️ Duplicate outcomeSignal tokens within file:")
-            for t in dups[:80]:
-                print(f" - {t} (x{counts[t]})")
-        else:
-            print("✅ No duplicate outcomeSignal tokens within file.")
+                question_combos[(tier, sig, lbl)] += 1
 
-        # Per-question summary
-        print("\n-- Question summaries --")
-        for qi, q in enumerate(questions):
-            qid = (q.get("id") or "").strip() or f"q{qi+1}"
+        if combos:
             title = (q.get("title") or q.get("prompt") or "").strip()
-            dim = (q.get("dimension") or "").strip()
-            opts = q.get("options", [])
+            yield "combos", (qid, dim, title, list(question_combos.items()))
 
-            combos = defaultdict(int)
-            for opt in opts:
-                tier = (opt.get("signalTier") or "").strip()
-                sig = (opt.get("outcomeSignal") or "").strip()
-                lbl = (opt.get("outcomeLabel") or "").strip()
-                combos[(tier, sig, lbl)] += 1
+    # Token collisions
+    for t, c in counts.items():
+        if c > 1:
+            yield "duplicate", (t, c)
+
+def collect(findings) -> dict:
+    result = {"bad_rows": [], "restoration_rows": [], "dups": [], "summaries": []}
+    buckets = {
+        "bad_token": result["bad_rows"],
+        "restoration": result["restoration_rows"],
+        "duplicate": result["dups"],
+        "combos": result["summaries"],
+    }
+    for kind, row in findings:
+        buckets[kind].append(row)
+    return result
+
+def audit_data(data: dict, combos: bool = True) -> dict:
+    return collect(iter_findings(data, combos=combos))
+
+def audit_bytes(raw: bytes, combos: bool = True) -> list:
+    with section("parse"):
+        data = json.loads(raw.decode("utf-8"))
+    with section("findings", combos=combos):
+        return list(iter_findings(data, combos=combos))
+
+def _audit_pending(item, combos: bool = True) -> list:
+    path, raw = item
+    with section("file", file=path.name):
+        return audit_bytes(raw, combos=combos)
+
+def finding_record(name: str, kind: str, row) -> dict:
+    if kind == "bad_token":
+        qid, dim, tier, sig = row
+        return {"file": name, "kind": kind, "question": qid, "dimension": dim, "signalTier": tier, "outcomeSignal": sig}
+    if kind == "restoration":
+        qid, dim, sig, text = row
+        return {"file": name, "kind": kind, "question": qid, "dimension": dim, "outcomeSignal": sig, "optionText": text}
+    if kind == "duplicate":
+        sig, count = row
+        return {"file": name, "kind": kind, "outcomeSignal": sig, "count": count}
+    qid, dim, title, combos = row
+    return {
+        "file": name,
+        "kind": kind,
+        "question": qid,
+        "dimension": dim,
+        "title": title,
+        "combos": [
+            {"signalTier": tier, "outcomeSignal": sig, "outcomeLabel": lbl, "count": c}
+            for (tier, sig, lbl), c in combos
+        ],
+    }
+
+def emit(record: dict):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def emit_findings(name: str, findings) -> Counter:
+    counts = Counter()
+    for kind, row in findings:
+        emit(finding_record(name, kind, row))
+        counts[kind] += 1
+    emit({
+        "file": name,
+        "kind": "file_summary",
+        "bad": counts["bad_token"],
+        "restoration": counts["restoration"],
+        "duplicates": counts["duplicate"],
+    })
+    return counts
+
+def stream_ndjson(files, manifest, key, combos: bool = True) -> Counter:
+    """Serial ndjson run holding one file's bytes and no finding lists.
+
+    Each file is read, checked against the manifest, audited and released
+    before the next one. Only the finding counts are recorded, so later runs
+    audit these files again instead of replaying rows that were never kept.
+    """
+    totals = Counter()
+    for path in files:
+        with section("file", file=path.name):
+            raw = read_bytes(path)
+            entry = manifest.lookup("audit", path, raw, key)
+            if entry and isinstance(entry["result"], list):
+                counts = emit_findings(path.name, entry["result"])
+            else:
+                data = json.loads(raw.decode("utf-8"))
+                counts = emit_findings(path.name, iter_findings(data, combos=combos))
+                del data
+                manifest.record("audit", path, raw, key, result=dict(counts))
+            del raw
+        totals.update(counts)
+    return totals
+
+def print_report(name: str, result: dict):
+    print(f"\n==== {name} ====")
+
+    # Print bad outcomeSignal lines
+    if result["bad_rows"]:
+        print("BAD outcomeSignal (must be snake_case token):")
+        for (qid, dim, tier, sig) in result["bad_rows"][:80]:
+            print(f" - {qid} [{dim}] tier={tier} outcomeSignal={sig}")
+    else:
+        print("✅ No bad outcomeSignal tokens found.")
+
+    # Print restoration tiers
+    if result["restoration_rows"]:
+        print("⚠️ Found RESTORATION tiers (should map to DEVELOPING):")
+        for (qid, dim, sig, text) in result["restoration_rows"][:80]:
+            print(f" - {qid} [{dim}] outcomeSignal={sig} optionText={text}")
+    else:
+        print("✅ No RESTORATION tiers found.")
 
-            print(f"\n[{qid}] {dim} :: {title[:80]}")
-            for (tier, sig, lbl), c in combos.items():
-                show_lbl = f" | label='{lbl[:60]}'" if lbl else ""
-                print(f"  - {tier:12} {sig}{show_lbl}  (x{c})")
+    if result["dups"]:
+        print("⚠️ Duplicate outcomeSignal tokens within file:")
+        for t, c in result["dups"][:80]:
+            print(f" - {t} (x{c})")
+    else:
+        print("✅ No duplicate outcomeSignal tokens within file.")
 
-        overall_bad += len(bad_rows)
-        overall_restoration += len(restoration_rows)
+    if not result["summaries"]:
+        return
 
+    print("\n-- Question summaries --")
+    for qid, dim, title, combos in result["summaries"]:
+        print(f"\n[{qid}] {dim} :: {title[:80]}")
+        for (tier, sig, lbl), c in combos:
+            show_lbl = f" | label='{lbl[:60]}'" if lbl else ""
+            print(f"  - {tier:12} {sig}{show_lbl}  (x{c})")
+
+def print_global(overall_bad: int, overall_restoration: int):
     print("\n========================")
     if overall_bad == 0:
         print("✅ GLOBAL: No bad outcomeSignal tokens across all files.")
@@ -106,5 +192,74 @@ def main():
     else:
         print(f"⚠️ GLOBAL: Found {overall_restoration} RESTORATION tier entries.")
 
+def main():
+    parser = argparse.ArgumentParser(description="Audit outcomeSignal tokens in assessment configs.")
+    parser.add_argument("--no-cache", action="store_true", help="ignore the content manifest and re-audit every file")
+    parser.add_argument("--format", choices=["text", "ndjson"], default="text", help="report format (default: text)")
+    parser.add_argument("--summary-only", action="store_true", help="skip the per-question combo summaries")
+    add_jobs_arg(parser)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not ASSESS_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {ASSESS_DIR} (run from repo root)")
+
+    files = sorted(ASSESS_DIR.glob("*.json"))
+    if not files:
+        raise SystemExit(f"❌ No JSON files in {ASSESS_DIR}")
+
+    combos = not args.summary_only
+    ndjson = args.format == "ndjson"
+    manifest = Manifest(enabled=not args.no_cache)
+    key = fingerprint(sys.modules[__name__], params={"combos": combos})
+
+    if ndjson and args.jobs == 1:
+        totals = stream_ndjson(files, manifest, key, combos=combos)
+        emit({"kind": "global", "overall_bad": totals["bad_token"], "overall_restoration": totals["restoration"]})
+        manifest.save()
+        return
+
+    # Otherwise per-file findings are computed first (in parallel with --jobs).
+    # Count-only entries from a streaming run cannot be replayed.
+    cached = {}
+    pending = []
+    for path in files:
+        with section("read", file=path.name):
+            raw = read_bytes(path)
+        entry = manifest.lookup("audit", path, raw, key)
+        if entry and isinstance(entry["result"], list):
+            cached[path] = entry["result"]
+        else:
+            pending.append((path, raw))
+
+    audited = map_jobs(partial(_audit_pending, combos=combos), pending, args.jobs)
+    for (path, raw), findings in zip(pending, audited):
+        cached[path] = findings
+        manifest.record("audit", path, raw, key, result=findings)
+    pending.clear()
+
+    overall_bad = 0
+    overall_restoration = 0
+
+    for path in files:
+        findings = cached[path]
+        if ndjson:
+            counts = emit_findings(path.name, findings)
+            overall_bad += counts["bad_token"]
+            overall_restoration += counts["restoration"]
+            continue
+        with section("report", file=path.name):
+            result = collect(findings)
+            print_report(path.name, result)
+        overall_bad += len(result["bad_rows"])
+        overall_restoration += len(result["restoration_rows"])
+
+    if ndjson:
+        emit({"kind": "global", "overall_bad": overall_bad, "overall_restoration": overall_restoration})
+    else:
+        print_global(overall_bad, overall_restoration)
+    manifest.save()
+
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -0,0 +1,309 @@
+"""Benchmark the tools/ scripts against synthetic content of growing size.
+
+Generates assessments with Q questions x O options and journey catalogs with
+P products x S sessions in the same shapes as assets/config, runs every tool
+in a fresh scratch tree per size, and records wall time, CPU time and peak
+RSS. Each tool runs --repeat times on its own copy of the tree and the
+median of every metric is kept, so one slow sample does not move the result.
+--check compares median CPU time and peak RSS; wall time is reported but
+depends too much on what else the machine is doing to gate on.
+
+    python3 tools/bench_tools.py                      # run, print, write JSON
+    python3 tools/bench_tools.py --save-baseline      # store as the baseline
+    python3 tools/bench_tools.py --check              # fail on regressions
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pass3_normalize_steps
+import rename_assessment_dimensions
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+TOOLS_DIR = Path(__file__).resolve().parent
+OUTPUT = Path("build/bench/tools_bench.json")
+BASELINE = TOOLS_DIR / "bench_baseline.json"
+
+# (questions, options) per assessment and (products, sessions) per catalog.
+SIZES = {
+    "small": {"assessment": (20, 4), "catalog": (15, 12)},
+    "medium": {"assessment": (200, 5), "catalog": (150, 12)},
+    "large": {"assessment": (2000, 6), "catalog": (600, 24)},
+}
+
+TOOLS = {
+    "audit": ["audit_assessments_outcome_signals.py"],
+    "normalize": ["normalize_assessment_outcome_signals.py"],
+    "rename": ["rename_assessment_dimensions.py"],
+    "steps": ["pass3_normalize_steps.py"],
+    "pipeline": ["content_pipeline.py"],
+    "bundles": ["build_catalog_bundles.py", "--out", "build/config_bundles"],
+}
+
+METRICS = ("wallMs", "cpuMs", "peakRssBytes")
+CHECKED = ("cpuMs", "peakRssBytes")
+
+# Absolute headroom on top of --tolerance, so millisecond-scale runs on the
+# small sizes do not fail --check on scheduler noise alone.
+CHECK_SLACK = {"cpuMs": 50, "peakRssBytes": 4 * 2**20}
+
+TIERS = [("STRONG", 3), ("DEVELOPING", 2), ("GUARDED", 1), ("AT_RISK", 0), ("RESTORATION", 1)]
+RESPONSE_TYPES = [
+    ("scale_3", "3-point pulse check (tap)", "Low | Neutral | High"),
+    ("single_select", "Tap-to-select (single choice chips)", "Option A | Option B | Option C | Option D"),
+    ("multi_select", "Multi-select chips", "Prayer | Scripture | Journaling | Worship"),
+    ("text", "Short reflection (text)", None),
+]
+
+# Runs a tool in-process and reports its own wall/CPU time and peak RSS, so the
+# numbers exclude the parent and include only one interpreter. Peak RSS is
+# VmHWM: ru_maxrss keeps the parent's high-water mark across fork/exec.
+RUNNER = r"""
+import json, os, resource, runpy, sys, time
+
+def peak_rss():
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+report, script = sys.argv[1], sys.argv[2]
+sys.argv = sys.argv[2:]
+sys.path.insert(0, os.path.dirname(script))
+start, cpu = time.perf_counter(), time.process_time()
+code = 0
+try:
+    runpy.run_path(script, run_name="__main__")
+except SystemExit as e:
+    code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+wall, cpu = time.perf_counter() - start, time.process_time() - cpu
+with open(report, "w") as f:
+    json.dump({"wallMs": wall * 1000, "cpuMs": cpu * 1000, "peakRssBytes": peak_rss(), "exitCode": code}, f)
+"""
+
+
+def make_assessment(name, questions, options, rng):
+    dims = [f"dimension_{i}" for i in range(max(1, questions // 4))]
+    dims += list(rename_assessment_dimensions.RENAMES)
+    qs = []
+    for qi in range(questions):
+        dim = dims[qi % len(dims)]
+        opts = []
+        for oi in range(options):
+            tier, weight = TIERS[oi] if oi < len(TIERS) else rng.choice(TIERS)
+            label = f"{tier.title()}: synthetic outcome {qi}-{oi} for {dim.replace('_', ' ')}"
+            opts.append({
+                "id": chr(ord("A") + oi % 26) + ("" if oi < 26 else str(oi // 26)),
+                "text": f"Synthetic answer {oi + 1} to question {qi + 1}",
+                "signalTier": tier,
+                "weight": weight,
+                "outcomeSignal": label if rng.random() < 0.8 else f"{dim}_{tier.lower()}_{oi}",
+            })
+        qs.append({
+            "number": qi + 1,
+            "dimension": dim.replace("_", " ").title(),
+            "text": f"Synthetic question {qi + 1}: when things get hard, I usually:",
+            "options": opts,
+        })
+    return {
+        "assessmentId": name,
+        "audience": "synthetic",
+        "title": f"Synthetic {name}",
+        "version": "v1",
+        "questionCount": questions,
+        "dimensions": [{"id": d, "name": d.replace("_", " ").title(), "insights": {}} for d in dims],
+        "questions": qs,
+    }
+
+
+def make_catalog(products, sessions, rng):
+    out = []
+    for pi in range(products):
+        pid = f"synthetic_product_{pi:04d}"
+        sess = []
+        for si in range(sessions):
+            rtype, ux, options = RESPONSE_TYPES[(pi + si) % len(RESPONSE_TYPES)]
+            sess.append({
+                "sessionNumber": si + 1,
+                "timingLabel": f"Week {si // 3 + 1}",
+                "tier": rng.choice(["Starter", "Growth", "Deep"]),
+                "title": f"Session {si + 1} of {pid}",
+                "prompt": "Synthetic prompt. " * rng.randint(3, 12),
+                "responseUX": ux,
+                "responseType": rtype,
+                "options": options,
+                "inputNotes": "Store selected option enum only.",
+                "lockRule": "Free" if si == 0 else "Locked",
+                "gamificationHook": "Session completion advances journey progress.",
+                "monetizationRationale": "Premium depth after a free preview session.",
+                "storeInferLogic": "Store: completion_status, session_number | Infer: trend_over_time",
+                "recommendationRules": "If session completed → recommend next session.",
+                "postSessionCheckinUX": "Ask: How confident do you feel? Low / Neutral / High.",
+            })
+        out.append({
+            "productId": pid,
+            "productName": f"Synthetic Product {pi}",
+            "audience": "Synthetic",
+            "suggestedWindow": "21",
+            "priceNGN": 4000,
+            "preview": "Day 1",
+            "sessions": sess,
+        })
+    return {"audienceKey": "synthetic", "version": "v1", "products": out}
+
+
+def write_tree(root: Path, size, seed=0):
+    rng = random.Random(seed)
+    q, o = size["assessment"]
+    p, s = size["catalog"]
+    for path in rename_assessment_dimensions.FILES:
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = make_assessment(path.stem, q, o, rng)
+        target.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    journeys = set(pass3_normalize_steps.FILES) | {
+        pass3_normalize_steps.BASE / "journeys_single_never_married_v2.json",
+        pass3_normalize_steps.BASE / "journeys_divorced_widowed_v2.json",
+        pass3_normalize_steps.BASE / "journeys_married_v2_parenting.json",
+    }
+    for path in sorted(journeys):
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        data = make_catalog(p, s, rng)
+        target.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def run_tool(argv, cwd: Path):
+    report = cwd / ".bench_report.json"
+    cmd = [sys.executable, "-c", RUNNER, str(report), str(TOOLS_DIR / argv[0]), *argv[1:]]
+    subprocess.run(cmd, cwd=cwd, stdout=subprocess.DEVNULL, check=False)
+    if not report.exists():
+        return {"wallMs": None, "cpuMs": None, "peakRssBytes": None, "exitCode": -1}
+    result = json.loads(report.read_text())
+    report.unlink()
+    return result
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+def median_run(runs):
+    """Median of each metric over `runs`; any failed run fails the whole set."""
+    failed = [r["exitCode"] for r in runs if r["exitCode"] != 0 or r["wallMs"] is None]
+    if failed:
+        return {**{m: None for m in METRICS}, "exitCode": failed[0], "repeat": len(runs)}
+    out = {m: statistics.median(r[m] for r in runs) for m in METRICS}
+    return {**out, "exitCode": 0, "repeat": len(runs)}
+
+
+def run_benchmarks(sizes, tools, repeat):
+    results = []
+    for size_name in sizes:
+        with tempfile.TemporaryDirectory(prefix="nexus-bench-") as tmp:
+            template = Path(tmp) / "template"
+            write_tree(template, SIZES[size_name])
+            for tool in tools:
+                runs = []
+                with section("bench", tool=tool, size=size_name, repeat=repeat):
+                    for i in range(repeat):
+                        # A fresh copy per run: the tools rewrite their inputs
+                        # and cache results, so a reused tree would get faster.
+                        root = Path(tmp) / f"run-{tool}-{i}"
+                        shutil.copytree(template, root)
+                        runs.append(run_tool(TOOLS[tool], root))
+                        shutil.rmtree(root)
+                r = median_run(runs)
+                r.update({"tool": tool, "size": size_name})
+                results.append(r)
+                wall, cpu, rss = (r[m] if r[m] is not None else float("nan") for m in METRICS)
+                print(f"  {size_name:8} {tool:10} {wall:10.1f} ms  {cpu:10.1f} ms cpu  "
+                      f"{rss / 2**20:8.1f} MiB  exit={r['exitCode']}")
+    return results
+
+
+def check_regressions(results, baseline, tolerance):
+    base = {(r["tool"], r["size"]): r for r in baseline.get("results", [])}
+    failures = []
+    for r in results:
+        if r["cpuMs"] is None or r["exitCode"] != 0:
+            failures.append(f"{r['tool']}@{r['size']}: exited with {r['exitCode']}")
+            continue
+        b = base.get((r["tool"], r["size"]))
+        if not b:
+            continue
+        for metric in CHECKED:
+            if b.get(metric) and r[metric] > b[metric] * (1 + tolerance) + CHECK_SLACK[metric]:
+                failures.append(
+                    f"{r['tool']}@{r['size']} {metric}: {r[metric]:.0f} > baseline {b[metric]:.0f} (+{tolerance:.0%})"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tools/ scripts on synthetic content.")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"comma-separated sizes ({','.join(SIZES)})")
+    parser.add_argument("--tools", default=",".join(TOOLS), help=f"comma-separated tools ({','.join(TOOLS)})")
+    parser.add_argument("--output", type=Path, default=OUTPUT, help=f"results JSON (default: {OUTPUT})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any tool regresses past the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown over baseline (default: 0.5)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per tool and size; medians are kept (default: 5)")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    sizes = [s for s in args.sizes.split(",") if s]
+    tools = [t for t in args.tools.split(",") if t]
+    unknown = [s for s in sizes if s not in SIZES] + [t for t in tools if t not in TOOLS]
+    if unknown:
+        raise SystemExit(f"❌ Unknown size/tool: {', '.join(unknown)}")
+
+    if args.repeat < 1:
+        raise SystemExit("❌ --repeat must be at least 1")
+
+    print(f"Running benchmarks (median of {args.repeat} run(s))...")
+    results = run_benchmarks(sizes, tools, args.repeat)
+    doc = {"python": sys.version.split()[0], "platform": sys.platform, "cpus": available_cpus(), "results": results}
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+    print(f"\n✅ Wrote {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"✅ Saved baseline: {args.baseline}")
+
+    if args.check:
+        if not args.baseline.exists():
+            raise SystemExit(f"❌ No baseline at {args.baseline} (run with --save-baseline first)")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("cpus") != doc["cpus"]:
+            print(f"⚠️  Baseline was recorded on {baseline.get('cpus')} CPU(s), this run has {doc['cpus']}.")
+        failures = check_regressions(results, baseline, args.tolerance)
+        if failures:
+            print("\n❌ Regressions past baseline:")
+            for f in failures:
+                print(f" - {f}")
+            raise SystemExit(1)
+        print("✅ No regressions past baseline.")
+
+
+if __name__ == "__main__":
+    run_main(main)
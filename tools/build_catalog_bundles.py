@@ -0,0 +1,168 @@
+"""Compile the journey catalogs into a per-audience index plus product shards.
+
+For every audience this writes
+
+    <out>/<audience>/index.json            productId, productName, preview,
+                                           priceNGN, sessionCount, lockRule summary
+    <out>/<audience>/products/<id>.json    one minified product with its sessions
+
+so the app can render the catalog from the small index and decode a
+product's sessions only when it is opened. A byte and parse-time report is
+printed for every catalog.
+
+    python3 tools/build_catalog_bundles.py [--out build/config_bundles]
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+
+from content_io import read_text, write_bytes_if_changed
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+BASE = Path("assets/config/journeys")
+OUT_DIR = Path("build/config_bundles")
+
+# Mirrors ConfigLoaderService: the first catalog with products wins.
+AUDIENCES = {
+    "single_never_married": [BASE / "journeys_single_never_married_v2.json"],
+    "divorced_widowed": [BASE / "journeys_divorced_widowed_v2.json"],
+    "married": [BASE / "journeys_married_v2_parenting.json"],
+}
+
+PARSE_RUNS = 20
+
+
+def minify(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def shard_name(pid: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", pid) or "product"
+
+
+def lock_summary(sessions):
+    summary = {"free": 0, "locked": 0}
+    for s in sessions:
+        rule = (s.get("lockRule") or s.get("freeOrLocked") or "Locked").strip().lower()
+        summary["free" if rule == "free" else "locked"] += 1
+    return summary
+
+
+def index_entry(product, shard):
+    sessions = product.get("sessions", [])
+    return {
+        "productId": product.get("productId") or product.get("id") or "",
+        "productName": product.get("productName") or product.get("title"),
+        "preview": product.get("preview") or product.get("subtitle"),
+        "priceNGN": product.get("priceNGN"),
+        "sessionCount": len(sessions),
+        "lockRule": lock_summary(sessions),
+        "shard": shard,
+    }
+
+
+def parse_time(text: str) -> float:
+    best = float("inf")
+    for _ in range(PARSE_RUNS):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pick_source(paths):
+    for path in paths:
+        if not path.exists():
+            continue
+        text = read_text(path)
+        data = json.loads(text)
+        if data.get("products"):
+            return path, text, data
+    return None, None, None
+
+
+def build_audience(audience, paths, out_dir):
+    source, source_text, data = pick_source(paths)
+    if source is None:
+        print(f"⚠️ {audience}: no catalog with products in {', '.join(str(p) for p in paths)}")
+        return None
+
+    target = out_dir / audience
+    products_dir = target / "products"
+    products_dir.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    shards = {}
+    for product in data.get("products", []):
+        pid = product.get("productId") or product.get("id") or ""
+        rel = f"products/{shard_name(pid)}.json"
+        if rel in shards:
+            raise SystemExit(f"❌ {source}: duplicate productId {pid!r}")
+        shards[rel] = minify(product)
+        entries.append(index_entry(product, rel))
+
+    for stale in products_dir.glob("*.json"):
+        if f"products/{stale.name}" not in shards:
+            stale.unlink()
+    for rel, text in shards.items():
+        write_bytes_if_changed(target / rel, text.encode("utf-8"))
+
+    meta = {k: v for k, v in data.items() if k != "products"}
+    index = {"audience": audience, "source": source.name, **meta, "products": entries}
+    index_text = minify(index)
+    write_bytes_if_changed(target / "index.json", index_text.encode("utf-8"))
+
+    shard_bytes = [len(t.encode("utf-8")) for t in shards.values()]
+    return {
+        "audience": audience,
+        "source": str(source),
+        "products": len(entries),
+        "sourceBytes": len(source_text.encode("utf-8")),
+        "indexBytes": len(index_text.encode("utf-8")),
+        "shardBytes": sum(shard_bytes),
+        "largestShardBytes": max(shard_bytes, default=0),
+        "sourceParseMs": parse_time(source_text) * 1000,
+        "indexParseMs": parse_time(index_text) * 1000,
+        "largestShardParseMs": parse_time(max(shards.values(), key=len)) * 1000 if shards else 0.0,
+    }
+
+
+def print_report(r):
+    saved = r["sourceBytes"] - r["indexBytes"]
+    total_saved = r["sourceBytes"] - r["indexBytes"] - r["shardBytes"]
+    print(f"\n==== {r['audience']} ({r['source']}, {r['products']} products) ====")
+    print(f"  source          {r['sourceBytes']:>9,} B  parse {r['sourceParseMs']:7.2f} ms")
+    print(f"  index           {r['indexBytes']:>9,} B  parse {r['indexParseMs']:7.2f} ms")
+    print(f"  largest shard   {r['largestShardBytes']:>9,} B  parse {r['largestShardParseMs']:7.2f} ms")
+    print(f"  all shards      {r['shardBytes']:>9,} B")
+    print(f"  first-render savings: {saved:,} B ({saved / r['sourceBytes']:.0%}), "
+          f"{r['sourceParseMs'] - r['indexParseMs']:.2f} ms parse")
+    print(f"  minification savings (index + all shards): {total_saved:,} B "
+          f"({total_saved / r['sourceBytes']:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-audience journey catalog indexes and product shards.")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help=f"output folder (default: {OUT_DIR})")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not BASE.exists():
+        raise SystemExit(f"❌ Missing folder: {BASE} (run from repo root)")
+
+    reports = []
+    for audience, paths in AUDIENCES.items():
+        with section("audience", audience=audience):
+            report = build_audience(audience, paths, args.out)
+        if report:
+            print_report(report)
+            reports.append(report)
+
+    print(f"\n✅ Wrote {len(reports)} catalog bundle(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,182 @@
+"""Build a word-prefix search index for the churches picker.
+
+Names are normalized (NFKD, diacritics dropped, casefolded, punctuation to
+spaces) and every word start of every normalized name becomes a suffix in
+one sorted array, so "grace" finds both "Grace Baptist Church" and
+"Living Grace Chapel" with two binary searches instead of a scan.
+
+    <out> {
+      "version": 1,
+      "names": [display name, ...],
+      "normalized": [normalized name, ...],          # same order as names
+      "suffixes": [nameIndex, charOffset, ...],       # flat pairs, sorted by normalized[i][off:]
+      "prefixes": {"gr": [lo, hi], ...}              # pair range per 2-char prefix
+    }
+
+A lookup narrows to the `prefixes` range of the query's first two
+characters and bisects inside it. `--bench` compares that against the
+linear lowercase-contains filter at 300, 10k and 100k names.
+
+    python3 tools/build_churches_index.py [--out build/config_indexes/churches_index_v1.json]
+    python3 tools/build_churches_index.py --bench
+"""
+import argparse
+import json
+import random
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+
+from content_io import read_json, write_minified_json
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+SOURCE = Path("assets/config/onboarding/churches_v1.json")
+OUT_PATH = Path("build/config_indexes/churches_index_v1.json")
+INDEX_VERSION = 1
+PREFIX_LEN = 2
+BENCH_SIZES = (300, 10_000, 100_000)
+BENCH_QUERIES = 2_000
+
+
+def normalize(name: str) -> str:
+    s = unicodedata.normalize("NFKD", name)
+    s = "".join(c for c in s if not unicodedata.combining(c)).casefold()
+    s = re.sub(r"[\W_]+", " ", s)
+    return " ".join(s.split())
+
+
+def build_index(names):
+    names = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+    normalized = [normalize(n) for n in names]
+    pairs = []
+    for i, norm in enumerate(normalized):
+        offset = 0
+        for word in norm.split(" "):
+            pairs.append((i, offset))
+            offset += len(word) + 1
+    pairs.sort(key=lambda p: (normalized[p[0]][p[1]:], p[0]))
+
+    prefixes = {}
+    for k, (i, off) in enumerate(pairs):
+        head = normalized[i][off:off + PREFIX_LEN]
+        lo_hi = prefixes.setdefault(head, [k, k])
+        lo_hi[1] = k + 1
+
+    return {
+        "version": INDEX_VERSION,
+        "names": names,
+        "normalized": normalized,
+        "suffixes": [x for p in pairs for x in p],
+        "prefixes": prefixes,
+    }
+
+
+class ChurchIndex:
+    """In-memory view of the asset; the Dart loader would mirror this."""
+
+    def __init__(self, index):
+        self.names = index["names"]
+        self.normalized = index["normalized"]
+        flat = index["suffixes"]
+        self.pairs = list(zip(flat[0::2], flat[1::2]))
+        self.prefixes = index["prefixes"]
+        # Suffix strings are materialized once at load; lookups only bisect.
+        self.keys = [self.normalized[i][off:] for i, off in self.pairs]
+
+    def lookup(self, query, limit=20):
+        q = normalize(query)
+        if not q:
+            return []
+        if len(q) >= PREFIX_LEN:
+            lo, hi = self.prefixes.get(q[:PREFIX_LEN], (0, 0))
+        else:
+            lo, hi = 0, len(self.keys)
+        start = bisect_left(self.keys, q, lo, hi)
+        seen = {}
+        for k in range(start, hi):
+            if not self.keys[k].startswith(q):
+                break
+            seen.setdefault(self.pairs[k][0], None)
+            if len(seen) >= limit:
+                break
+        return [self.names[i] for i in seen]
+
+
+def linear_filter(names, query):
+    # What a picker does today: lowercase-contains over the whole list.
+    q = query.lower()
+    return [n for n in names if q in n.lower()]
+
+
+def synthetic_names(seed_names, size, rng):
+    words = sorted({w for n in seed_names for w in n.split() if len(w) > 2})
+    places = ["Lagos", "Abuja", "Accra", "Nairobi", "Kumasi", "Ibadan", "Enugu", "Kampala", "Jos", "Zaria",
+              "Onitsha", "Kaduna", "Benin", "Calabar", "Warri", "Owerri", "São Tomé", "Douala", "Lomé", "Cotonou"]
+    out = list(seed_names)
+    seen = set(out)
+    while len(out) < size:
+        name = " ".join(rng.sample(words, rng.randint(2, 4))) + f" {rng.choice(places)} {rng.randint(1, 999)}"
+        if name not in seen:
+            seen.add(name)
+            out.append(name)
+    return out[:size]
+
+
+def bench(seed_names):
+    rng = random.Random(0)
+    print(f"{'names':>8} {'linear µs':>10} {'index µs':>10} {'speedup':>8} {'asset KiB':>10}")
+    for size in BENCH_SIZES:
+        names = synthetic_names(seed_names, size, rng)
+        with section("build", names=size):
+            asset = build_index(names)
+            index = ChurchIndex(asset)
+        queries = []
+        for n in rng.choices(names, k=BENCH_QUERIES):
+            words = n.split()
+            word = words[rng.randrange(len(words))]
+            queries.append(word[:rng.randint(1, max(1, min(6, len(word))))])
+
+        with section("linear", names=size):
+            start = time.perf_counter()
+            for q in queries:
+                linear_filter(names, q)
+            linear = (time.perf_counter() - start) / len(queries) * 1e6
+
+        with section("lookup", names=size):
+            start = time.perf_counter()
+            for q in queries:
+                index.lookup(q)
+            indexed = (time.perf_counter() - start) / len(queries) * 1e6
+
+        size_kib = len(json.dumps(asset, ensure_ascii=False, separators=(",", ":")).encode("utf-8")) / 1024
+        print(f"{size:>8,} {linear:>10.1f} {indexed:>10.1f} {linear / indexed:>7.0f}x {size_kib:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the churches prefix-search index asset.")
+    parser.add_argument("--out", type=Path, default=OUT_PATH, help=f"index JSON (default: {OUT_PATH})")
+    parser.add_argument("--bench", action="store_true", help="benchmark index lookups against the linear filter")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not SOURCE.exists():
+        raise SystemExit(f"❌ Missing file: {SOURCE} (run from repo root)")
+    names = read_json(SOURCE).get("churches", [])
+
+    if args.bench:
+        bench(names)
+        return
+
+    with section("build", names=len(names)):
+        index = build_index(names)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    state = "Wrote" if write_minified_json(args.out, index) else "Unchanged"
+    print(f"✅ {state} {args.out}: {len(index['names'])} names, "
+          f"{len(index['suffixes']) // 2} word suffixes, {len(index['prefixes'])} prefix buckets")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,143 @@
+"""Emit minified and precompressed variants of every assets/config file.
+
+For each assets/config/**/*.json this writes
+
+    <out>/<rel>.min.json       minified JSON
+    <out>/<rel>.min.json.gz    gzip (level 9, mtime 0 so builds are reproducible)
+    <out>/<rel>.min.json.zz    zlib stream (dart:io ZLibCodec)
+
+prints raw / minified / compressed bytes and decode time (inflate + parse)
+per file, and checks them against tools/config_budgets.json:
+
+    {"file":  {"minBytes": ..., "gzipBytes": ..., "decodeMs": ...},   # every file
+     "total": {"minBytes": ..., "gzipBytes": ...},                    # summed
+     "files": {"journeys/married_v1.json": {"gzipBytes": ...}}}       # per-file overrides
+
+Any budget exceeded fails the build (exit 1).
+
+    python3 tools/build_compressed_configs.py [--out build/compressed_configs] [--budgets FILE]
+"""
+import argparse
+import gzip
+import json
+import time
+import zlib
+from pathlib import Path
+
+from content_io import read_bytes, write_bytes_if_changed
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+CONFIG_DIR = Path("assets/config")
+OUT_DIR = Path("build/compressed_configs")
+BUDGETS = Path(__file__).resolve().parent / "config_budgets.json"
+DECODE_RUNS = 20
+
+
+def minify(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def best_of(fn, runs=DECODE_RUNS) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def compress_file(path: Path, out_dir: Path):
+    rel = path.relative_to(CONFIG_DIR)
+    raw = read_bytes(path)
+    data = json.loads(raw.decode("utf-8"))
+    mini = minify(data)
+    gz = gzip.compress(mini, compresslevel=9, mtime=0)
+    zz = zlib.compress(mini, 9)
+
+    target = out_dir / rel.with_suffix(".min.json")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    outputs = {target: mini, Path(f"{target}.gz"): gz, Path(f"{target}.zz"): zz}
+    for p, b in outputs.items():
+        write_bytes_if_changed(p, b)
+
+    return {
+        "file": rel.as_posix(),
+        "rawBytes": len(raw),
+        "minBytes": len(mini),
+        "gzipBytes": len(gz),
+        "zlibBytes": len(zz),
+        "rawParseMs": best_of(lambda: json.loads(raw.decode("utf-8"))),
+        "decodeMs": best_of(lambda: json.loads(gzip.decompress(gz).decode("utf-8"))),
+    }, set(outputs)
+
+
+def check_budgets(reports, budgets):
+    failures = []
+    default = budgets.get("file", {})
+    overrides = budgets.get("files", {})
+    for r in reports:
+        limits = {**default, **overrides.get(r["file"], {})}
+        for metric, limit in limits.items():
+            if limit is not None and metric in r and r[metric] > limit:
+                failures.append(f"{r['file']} {metric}: {r[metric]:,.6g} > budget {limit:,}")
+    for metric, limit in budgets.get("total", {}).items():
+        total = sum(r.get(metric, 0) for r in reports)
+        if limit is not None and total > limit:
+            failures.append(f"total {metric}: {total:,} > budget {limit:,}")
+    return failures
+
+
+def print_report(reports):
+    print(f"{'file':48} {'raw':>9} {'min':>9} {'gzip':>8} {'zlib':>8} {'parse ms':>9} {'decode ms':>10}")
+    for r in reports:
+        print(f"{r['file']:48} {r['rawBytes']:>9,} {r['minBytes']:>9,} {r['gzipBytes']:>8,} {r['zlibBytes']:>8,} "
+              f"{r['rawParseMs']:>9.2f} {r['decodeMs']:>10.2f}")
+    totals = {k: sum(r[k] for r in reports) for k in ("rawBytes", "minBytes", "gzipBytes", "zlibBytes")}
+    print(f"{'TOTAL':48} {totals['rawBytes']:>9,} {totals['minBytes']:>9,} {totals['gzipBytes']:>8,} "
+          f"{totals['zlibBytes']:>8,}")
+    if totals["rawBytes"]:
+        print(f"  minified saves {1 - totals['minBytes'] / totals['rawBytes']:.0%}, "
+              f"gzip saves {1 - totals['gzipBytes'] / totals['rawBytes']:.0%} of the raw bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify and precompress assets/config with size/decode budgets.")
+    parser.add_argument("--out", type=Path, default=OUT_DIR, help=f"output folder (default: {OUT_DIR})")
+    parser.add_argument("--budgets", type=Path, default=BUDGETS, help="budgets JSON (default: tools/config_budgets.json)")
+    parser.add_argument("--no-budgets", action="store_true", help="report only; do not enforce budgets")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not CONFIG_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {CONFIG_DIR} (run from repo root)")
+
+    reports = []
+    written = set()
+    for path in sorted(CONFIG_DIR.rglob("*.json")):
+        with section("file", file=path.relative_to(CONFIG_DIR).as_posix()):
+            report, outputs = compress_file(path, args.out)
+        reports.append(report)
+        written |= outputs
+    for stale in args.out.rglob("*.min.json*"):
+        if stale.is_file() and stale not in written:
+            stale.unlink()
+
+    print_report(reports)
+    print(f"\n✅ Wrote {len(written)} file(s) to {args.out}")
+
+    if args.no_budgets:
+        return
+    if not args.budgets.exists():
+        raise SystemExit(f"❌ Missing budgets file: {args.budgets}")
+    failures = check_budgets(reports, json.loads(args.budgets.read_text(encoding="utf-8")))
+    if failures:
+        print("\n❌ Over budget:")
+        for f in failures:
+            print(f" - {f}")
+        raise SystemExit(1)
+    print("✅ All configs within budget.")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,143 @@
+"""Resolve every recommendation reference against the journey catalogs.
+
+Builds one productId -> catalogs index across assets/config/journeys, then
+checks the references the app follows at runtime:
+
+    assessments   dimensions[].insights.recommendedJourney  (productId or productName)
+    polls         options[].recommendedProductIds, defaultRecommendedProductIds
+    stories       recommendedProductIds
+
+and writes a precomputed lookup the app can load instead of scanning
+catalogs:
+
+    <out>   {"products": {productId: {productName, catalogs}},
+             "dimensions": {assessmentId: {dimensionId: productId}}}
+
+Any reference that matches no product fails the build (exit 1) and nothing
+is written.
+
+    python3 tools/build_recommendation_index.py [--out build/recommendations/index.json]
+"""
+import argparse
+from pathlib import Path
+
+from content_io import read_json, write_minified_json
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+JOURNEYS_DIR = Path("assets/config/journeys")
+ASSESS_DIR = Path("assets/config/assessments")
+ENGAGEMENT_DIR = Path("assets/config/engagement")
+OUT_PATH = Path("build/recommendations/index.json")
+
+
+def build_product_index(paths):
+    """productId -> entry, plus lowercased productName -> set of productIds."""
+    products = {}
+    names = {}
+    for path in paths:
+        data = read_json(path)
+        for p in data.get("products", []):
+            pid = p.get("productId") or p.get("id")
+            if not pid:
+                continue
+            name = p.get("productName") or p.get("title")
+            entry = products.setdefault(pid, {"productName": name, "catalogs": []})
+            entry["catalogs"].append(path.name)
+            if name:
+                names.setdefault(name.strip().lower(), set()).add(pid)
+    return products, names
+
+
+def assessment_refs(data):
+    for i, d in enumerate(data.get("dimensions", [])):
+        ref = ((d.get("insights") or {}).get("recommendedJourney") or "").strip()
+        if ref:
+            yield f"/dimensions/{i}/insights/recommendedJourney", ref, d.get("id")
+
+
+def poll_refs(data):
+    for i, poll in enumerate(data.get("polls", [])):
+        for j, opt in enumerate(poll.get("options", [])):
+            for k, ref in enumerate(opt.get("recommendedProductIds") or []):
+                yield f"/polls/{i}/options/{j}/recommendedProductIds/{k}", ref, None
+        for k, ref in enumerate(poll.get("defaultRecommendedProductIds") or []):
+            yield f"/polls/{i}/defaultRecommendedProductIds/{k}", ref, None
+
+
+def story_refs(data):
+    for i, story in enumerate(data.get("stories", [])):
+        for k, ref in enumerate(story.get("recommendedProductIds") or []):
+            yield f"/stories/{i}/recommendedProductIds/{k}", ref, None
+
+
+SOURCES = [
+    (ASSESS_DIR, "*.json", assessment_refs, True),
+    (ENGAGEMENT_DIR, "polls_v1.json", poll_refs, False),
+    (ENGAGEMENT_DIR, "stories_v1.json", story_refs, False),
+]
+
+
+def resolve(ref, products, names, by_name):
+    """Return (productId, None) or (None, reason)."""
+    if ref in products:
+        return ref, None
+    if by_name:
+        # recommendedJourney is authored as a product title in the assessments.
+        ids = names.get(ref.strip().lower(), set())
+        if len(ids) == 1:
+            return next(iter(ids)), None
+        if ids:
+            return None, f"productName matches several products: {', '.join(sorted(ids))}"
+    return None, "no product with this id" + (" or name" if by_name else "")
+
+
+def build(out_path):
+    catalogs = sorted(JOURNEYS_DIR.glob("*.json"))
+    with section("products", catalogs=len(catalogs)):
+        products, names = build_product_index(catalogs)
+
+    dimensions = {}
+    dangling = []
+    refs = 0
+    for folder, pattern, refs_of, by_name in SOURCES:
+        for path in sorted(folder.glob(pattern)):
+            with section("file", file=str(path)):
+                data = read_json(path)
+                for ptr, ref, dim_id in refs_of(data):
+                    refs += 1
+                    pid, reason = resolve(ref, products, names, by_name)
+                    if pid is None:
+                        dangling.append((path, ptr, ref, reason))
+                    elif dim_id:
+                        aid = data.get("assessmentId") or path.stem
+                        dimensions.setdefault(aid, {})[dim_id] = pid
+
+    print(f"Indexed {len(products)} product id(s) across {len(catalogs)} catalog(s); checked {refs} reference(s).")
+    if dangling:
+        print(f"\n❌ {len(dangling)} dangling recommendation reference(s):")
+        for path, ptr, ref, reason in dangling:
+            print(f" - {path}#{ptr}: {ref!r} ({reason})")
+        return False
+
+    index = {"products": dict(sorted(products.items())), "dimensions": dimensions}
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    state = "Wrote" if write_minified_json(out_path, index) else "Unchanged"
+    print(f"\n✅ {state}: {out_path} ({sum(len(d) for d in dimensions.values())} dimension mapping(s))")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check recommendation references and build the product lookup.")
+    parser.add_argument("--out", type=Path, default=OUT_PATH, help=f"lookup JSON (default: {OUT_PATH})")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not JOURNEYS_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {JOURNEYS_DIR} (run from repo root)")
+    if not build(args.out):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_main(main)
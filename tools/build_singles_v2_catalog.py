@@ -0,0 +1,120 @@
+"""Generate the v2 singles journey catalog from singles_v1.json.
+
+Each v1 product gets title/subtitle from productName/preview and every
+session gets structured `steps`, both via pass3_normalize_steps, so the
+app loads one finished catalog instead of falling back to v1:
+
+    assets/data/journeys/singles_v1.json
+        -> assets/config/journeys/journeys_single_never_married_v2.json
+
+The v1 fields those replace (SUPERSEDED) are dropped, so the bundled
+catalog does not carry every prompt and option list twice; the other v1
+keys are kept as they are. The source lives outside assets/config so it
+is not bundled with the app. The run is skipped when neither the source, the target nor the
+converter changed since the last run (content manifest), and the target is
+only rewritten when its bytes would differ.
+
+    python3 tools/build_singles_v2_catalog.py [--no-cache] [--check]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pass3_normalize_steps as steps
+from content_io import read_bytes, write_json
+from content_manifest import Manifest, fingerprint, sha256_bytes
+from json_stream import iter_canonical
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+SOURCE = Path("assets/data/journeys/singles_v1.json")
+TARGET = steps.BASE / "journeys_single_never_married_v2.json"
+SCHEMA_VERSION = 1
+PRODUCT_LEAD = ("productId", "title", "subtitle")
+
+# v1 field -> where v2 carries it. Session fields are only dropped when the
+# steps were built from them here, not when the source already had steps.
+SUPERSEDED = {
+    "product": {"productName": "title", "preview": "subtitle"},
+    "session": {
+        "prompt": "steps[0].content",
+        "responseUX": "steps[0].ui",
+        "responseType": "steps[0].responseType",
+        "options": "steps[0].options",
+        "inputNotes": "steps[0].storeKey",
+    },
+}
+
+
+def convert_session(product_id, session):
+    built = session.get("steps") in (None, [])
+    s = steps.normalize_session_steps(product_id, dict(session))
+    if built:
+        s = {k: v for k, v in s.items() if k not in SUPERSEDED["session"]}
+    return s
+
+
+def convert_product(product):
+    p = steps.normalize_product(dict(product))
+    p["sessions"] = [convert_session(p["productId"], s) for s in p.get("sessions", [])]
+    lead = {k: p[k] for k in PRODUCT_LEAD if k in p}
+    rest = {k: v for k, v in p.items() if k not in lead and k not in SUPERSEDED["product"]}
+    return {**lead, **rest}
+
+
+def convert(v1):
+    products = [convert_product(p) for p in v1.get("products", [])]
+    ids = [p["productId"] for p in products]
+    dupes = sorted({i for i in ids if ids.count(i) > 1})
+    if dupes or "" in ids:
+        raise SystemExit(f"❌ {SOURCE}: missing or duplicate productId: {', '.join(dupes) or '(empty)'}")
+    return {
+        "audienceKey": v1.get("audienceKey", "singles"),
+        "schemaVersion": SCHEMA_VERSION,
+        "version": "v2",
+        "products": products,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the v2 singles journey catalog from singles_v1.json.")
+    parser.add_argument("--no-cache", action="store_true", help="ignore the content manifest and regenerate")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the committed v2 catalog is out of date")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not SOURCE.exists():
+        raise SystemExit(f"❌ Missing file: {SOURCE} (run from repo root)")
+
+    manifest = Manifest(enabled=not args.no_cache)
+    key = fingerprint(sys.modules[__name__], steps)
+    with section("read", file=SOURCE.name):
+        raw = read_bytes(SOURCE)
+    entry = manifest.lookup("singles_v2", SOURCE, raw, key)
+    if entry and TARGET.exists() and sha256_bytes(read_bytes(TARGET)) == (entry["result"] or {}).get("target"):
+        print(f"✅ Unchanged (cached): {TARGET}")
+        return
+
+    with section("convert", file=SOURCE.name):
+        catalog = convert(json.loads(raw.decode("utf-8")))
+
+    if args.check:
+        expected = "".join(iter_canonical(catalog)).encode("utf-8")
+        if not TARGET.exists() or read_bytes(TARGET) != expected:
+            raise SystemExit(f"❌ {TARGET} is out of date; run python3 tools/build_singles_v2_catalog.py")
+        print(f"✅ Up to date: {TARGET}")
+        return
+
+    with section("write", file=TARGET.name):
+        replaced, digest = write_json(TARGET, catalog)
+    manifest.record("singles_v2", SOURCE, raw, key, result={"target": digest})
+    manifest.save()
+
+    sessions = sum(len(p["sessions"]) for p in catalog["products"])
+    state = "Wrote" if replaced else "Unchanged"
+    print(f"✅ {state}: {TARGET} ({len(catalog['products'])} products, {sessions} sessions)")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,311 @@
+"""SQLite index over every journey catalog and assessment config.
+
+Each file is ingested into products / sessions / steps and dimensions /
+questions / options tables, and remembered by sha256 so an update only
+re-ingests files whose bytes changed. Queries then run against indexed
+tables instead of reparsing the JSON.
+
+    python3 tools/content_index.py update
+    python3 tools/content_index.py report                    # list canned reports
+    python3 tools/content_index.py report free-multi-select
+    python3 tools/content_index.py query "SELECT audience, COUNT(*) FROM products GROUP BY 1"
+    python3 tools/content_index.py query "SELECT * FROM options WHERE outcome_signal = ?" some_token
+"""
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from content_io import read_bytes
+from content_manifest import sha256_bytes
+from pass3_normalize_steps import infer_ui
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+JOURNEYS_DIR = Path("assets/config/journeys")
+ASSESS_DIR = Path("assets/config/assessments")
+INDEX_PATH = Path(".tool_cache/content_index.sqlite")
+INDEX_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE TABLE products (
+    file TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    name TEXT,
+    audience TEXT,
+    preview TEXT,
+    price_ngn INTEGER,
+    session_count INTEGER
+);
+CREATE TABLE sessions (
+    file TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    audience TEXT,
+    session_number INTEGER,
+    title TEXT,
+    tier TEXT,
+    timing TEXT,
+    response_type TEXT,
+    response_ux TEXT,
+    ui TEXT,
+    lock_rule TEXT,
+    options TEXT,
+    prompt TEXT
+);
+CREATE TABLE steps (
+    file TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    session_number INTEGER,
+    step_id TEXT,
+    content_type TEXT,
+    response_type TEXT,
+    ui TEXT,
+    store_key TEXT
+);
+CREATE TABLE dimensions (
+    file TEXT NOT NULL,
+    assessment_id TEXT,
+    dimension_id TEXT,
+    name TEXT
+);
+CREATE TABLE questions (
+    file TEXT NOT NULL,
+    assessment_id TEXT,
+    question_id TEXT,
+    number INTEGER,
+    dimension TEXT,
+    text TEXT
+);
+CREATE TABLE options (
+    file TEXT NOT NULL,
+    assessment_id TEXT,
+    question_id TEXT,
+    option_id TEXT,
+    text TEXT,
+    signal_tier TEXT,
+    weight REAL,
+    outcome_signal TEXT
+);
+CREATE INDEX products_id ON products (product_id);
+CREATE INDEX sessions_lock_ui ON sessions (lock_rule, ui);
+CREATE INDEX sessions_product ON sessions (product_id, session_number);
+CREATE INDEX steps_product ON steps (product_id, session_number);
+CREATE INDEX questions_dimension ON questions (dimension);
+CREATE INDEX options_signal ON options (outcome_signal);
+CREATE INDEX options_tier ON options (signal_tier);
+"""
+
+CONTENT_TABLES = ("products", "sessions", "steps", "dimensions", "questions", "options")
+
+REPORTS = {
+    "free-multi-select": (
+        "Free sessions answered with multi_select, across all audiences",
+        """SELECT audience, product_id, session_number, title, response_type
+           FROM sessions WHERE lock_rule LIKE 'free%' AND ui = 'multi_select'
+           ORDER BY audience, product_id, session_number""",
+    ),
+    "lock-summary": (
+        "Free vs locked sessions per audience",
+        """SELECT audience, lock_rule, COUNT(*) AS sessions
+           FROM sessions GROUP BY audience, lock_rule ORDER BY audience, lock_rule""",
+    ),
+    "response-types": (
+        "Session UI kinds (as pass3 infers them) per audience",
+        """SELECT audience, ui, COUNT(*) AS sessions
+           FROM sessions GROUP BY audience, ui ORDER BY audience, sessions DESC""",
+    ),
+    "products": (
+        "Products with price and session count",
+        """SELECT file, product_id, name, price_ngn, session_count
+           FROM products ORDER BY file, product_id""",
+    ),
+    "sessions-without-steps": (
+        "Sessions that pass3 has not expanded into steps yet",
+        """SELECT s.file, s.product_id, s.session_number
+           FROM sessions s LEFT JOIN steps t
+             ON t.file = s.file AND t.product_id = s.product_id AND t.session_number = s.session_number
+           WHERE t.step_id IS NULL ORDER BY s.file, s.product_id, s.session_number""",
+    ),
+    "signal-tiers": (
+        "Option signalTier counts per assessment",
+        """SELECT assessment_id, signal_tier, COUNT(*) AS options
+           FROM options GROUP BY assessment_id, signal_tier ORDER BY assessment_id, signal_tier""",
+    ),
+    "questions-per-dimension": (
+        "Question count per assessment dimension",
+        """SELECT assessment_id, dimension, COUNT(*) AS questions
+           FROM questions GROUP BY assessment_id, dimension ORDER BY assessment_id, questions DESC""",
+    ),
+}
+
+
+def _text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def journey_rows(name, data):
+    catalog_audience = data.get("audienceKey")
+    for p in data.get("products", []):
+        pid = p.get("productId") or p.get("id") or ""
+        audience = p.get("audience") or catalog_audience
+        sessions = p.get("sessions", [])
+        yield "products", (name, pid, p.get("productName") or p.get("title"), audience,
+                           p.get("preview") or p.get("subtitle"), p.get("priceNGN"), len(sessions))
+        for s in sessions:
+            number = s.get("sessionNumber")
+            lock = (s.get("lockRule") or s.get("freeOrLocked") or "").strip().lower() or None
+            # Generated v2 sessions keep the prompt and response fields only in their first step.
+            step = (s.get("steps") or [{}])[0] if "prompt" not in s else {}
+            yield "sessions", (name, pid, audience, number, s.get("title"), s.get("tier"),
+                               s.get("timingLabel") or s.get("suggestedTiming"),
+                               s.get("responseType") or step.get("responseType"), s.get("responseUX"),
+                               step.get("ui") or infer_ui(s), lock, _text(s.get("options") or step.get("options")),
+                               s.get("prompt") or step.get("content"))
+            for st in s.get("steps") or []:
+                yield "steps", (name, pid, number, st.get("stepId"), st.get("contentType"),
+                                st.get("responseType"), st.get("ui"), st.get("storeKey"))
+
+
+def assessment_rows(name, data):
+    aid = data.get("assessmentId") or Path(name).stem
+    for d in data.get("dimensions", []):
+        yield "dimensions", (name, aid, d.get("id"), d.get("name"))
+    for qi, q in enumerate(data.get("questions", [])):
+        qid = (q.get("id") or "").strip() or f"q{qi+1}"
+        yield "questions", (name, aid, qid, q.get("number"), q.get("dimension"), q.get("text"))
+        for oi, opt in enumerate(q.get("options", [])):
+            oid = (opt.get("id") or "").strip() or f"o{oi+1}"
+            yield "options", (name, aid, qid, oid, opt.get("text"), opt.get("signalTier"),
+                              opt.get("weight"), opt.get("outcomeSignal"))
+
+
+SOURCES = [
+    ("journey", JOURNEYS_DIR, journey_rows),
+    ("assessment", ASSESS_DIR, assessment_rows),
+]
+
+
+def connect(path=INDEX_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    if db.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+        for (table,) in db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+            db.execute(f"DROP TABLE {table}")
+        db.executescript(SCHEMA)
+        db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+        db.commit()
+    return db
+
+
+def _forget(db, name):
+    for table in CONTENT_TABLES:
+        db.execute(f"DELETE FROM {table} WHERE file = ?", (name,))
+    db.execute("DELETE FROM files WHERE path = ?", (name,))
+
+
+def update(db):
+    """Re-ingest changed files and drop vanished ones; returns changed names."""
+    known = dict(db.execute("SELECT path, sha256 FROM files"))
+    seen = set()
+    changed = []
+    with db:
+        for kind, folder, rows in SOURCES:
+            for path in sorted(folder.glob("*.json")):
+                name = path.as_posix()
+                seen.add(name)
+                with section("read", file=name):
+                    raw = read_bytes(path)
+                digest = sha256_bytes(raw)
+                if known.get(name) == digest:
+                    continue
+                with section("file", file=name):
+                    _forget(db, name)
+                    by_table = {}
+                    for table, row in rows(name, json.loads(raw.decode("utf-8"))):
+                        by_table.setdefault(table, []).append(row)
+                    for table, values in by_table.items():
+                        marks = ", ".join("?" * len(values[0]))
+                        db.executemany(f"INSERT INTO {table} VALUES ({marks})", values)
+                db.execute("INSERT INTO files VALUES (?, ?, ?)", (name, digest, kind))
+                changed.append(name)
+        for name in sorted(set(known) - seen):
+            _forget(db, name)
+            changed.append(name)
+    return changed
+
+
+def print_rows(cursor, as_json=False):
+    cols = [c[0] for c in cursor.description or []]
+    rows = cursor.fetchall()
+    if as_json:
+        print(json.dumps([dict(zip(cols, r)) for r in rows], indent=2, ensure_ascii=False))
+        return
+    if not cols:
+        return
+    cells = [[("" if v is None else str(v)).replace("\n", " ") for v in r] for r in rows]
+    widths = [min(60, max([len(c)] + [len(r[i]) for r in cells])) for i, c in enumerate(cols)]
+    print("  ".join(c.ljust(w) for c, w in zip(cols, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  ".join(v[:w].ljust(w) for v, w in zip(r, widths)))
+    print(f"({len(rows)} row(s))")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the SQLite content index.")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH, help=f"index file (default: {INDEX_PATH})")
+    parser.add_argument("--json", action="store_true", help="print query results as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="re-ingest changed journey and assessment files")
+    report = sub.add_parser("report", help="run a canned report (omit the name to list them)")
+    report.add_argument("name", nargs="?", choices=sorted(REPORTS))
+    query = sub.add_parser("query", help="run an SQL query against the index")
+    query.add_argument("sql")
+    query.add_argument("params", nargs="*", help="values for ? placeholders")
+    add_profile_args(*sub.choices.values())
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not (JOURNEYS_DIR.exists() and ASSESS_DIR.exists()):
+        raise SystemExit(f"❌ Missing folders: {JOURNEYS_DIR}, {ASSESS_DIR} (run from repo root)")
+
+    db = connect(args.index)
+    with section("update"):
+        changed = update(db)
+
+    if args.command == "update":
+        counts = {t: db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in CONTENT_TABLES}
+        print(f"✅ Indexed {', '.join(f'{n} {t}' for t, n in counts.items())}; {len(changed)} file(s) re-ingested.")
+        for name in changed:
+            print(f" - {name}")
+        return
+
+    if args.command == "report":
+        if not args.name:
+            for name, (title, _) in sorted(REPORTS.items()):
+                print(f"{name:26} {title}")
+            return
+        title, sql = REPORTS[args.name]
+        if not args.json:
+            print(f"==== {title} ====")
+        with section("report", report=args.name):
+            print_rows(db.execute(sql), args.json)
+        return
+
+    with section("query"):
+        try:
+            cursor = db.execute(args.sql, args.params)
+        except sqlite3.Error as e:
+            raise SystemExit(f"❌ {e}")
+        print_rows(cursor, args.json)
+
+
+if __name__ == "__main__":
+    run_main(main)
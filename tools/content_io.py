@@ -0,0 +1,80 @@
+"""File input/output helpers shared by the tools/ scripts.
+
+Reads and writes through here are counted in the --profile record.
+"""
+import filecmp
+import json
+import os
+import shutil
+from pathlib import Path
+
+from json_stream import write_canonical
+from tool_profile import count_io
+
+
+def read_bytes(path: Path) -> bytes:
+    data = Path(path).read_bytes()
+    count_io(read=len(data))
+    return data
+
+
+def read_text(path: Path) -> str:
+    return read_bytes(path).decode("utf-8")
+
+
+def read_json(path: Path):
+    return json.loads(read_bytes(path).decode("utf-8"))
+
+
+def temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def commit_temp(tmp: Path, path: Path, backup: bool = False) -> bool:
+    """Move a fully written `tmp` over `path` unless the bytes are identical.
+
+    Identical output leaves `path` (and its mtime) untouched and skips the
+    backup. Otherwise the old file is optionally copied to `<path>.bak` and
+    `tmp` is fsynced and renamed over `path`, so an interrupted run leaves
+    either the old file or the new one, never a partial write.
+    Returns True when `path` was replaced.
+    """
+    count_io(written=tmp.stat().st_size)
+    if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+        tmp.unlink()
+        return False
+
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    if backup and path.exists():
+        shutil.copy2(path, path.with_suffix(path.suffix + ".bak"))
+    os.replace(tmp, path)
+    return True
+
+
+def write_bytes_if_changed(path: Path, data: bytes, backup: bool = False) -> bool:
+    tmp = temp_path(path)
+    tmp.write_bytes(data)
+    return commit_temp(tmp, path, backup=backup)
+
+
+def write_minified_json(path: Path, data, backup: bool = False) -> bool:
+    """Write `data` as whitespace-free JSON, for lookups bundled with the app."""
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return write_bytes_if_changed(path, text.encode("utf-8"), backup=backup)
+
+
+def write_json(path: Path, data, kind=None, backup: bool = False):
+    """Stream `data` as canonical JSON over `path`.
+
+    Returns (replaced, sha256 of the canonical bytes); the digest lets
+    callers record the output in the manifest without holding a copy.
+    """
+    tmp = temp_path(path)
+    try:
+        with open(tmp, "wb") as f:
+            digest = write_canonical(f, data, kind)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return commit_temp(tmp, path, backup=backup), digest
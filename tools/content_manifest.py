@@ -0,0 +1,98 @@
+"""Persistent content-hash manifest shared by the tools/ scripts.
+
+An entry records, per (tool, file), the sha256 of the input bytes, a key
+derived from the tool source and its pass options, the sha256 of the bytes
+the tool left on disk, and an optional JSON-serializable result (the audit
+report, for example). A rerun whose file bytes match that output and whose
+key matches can skip the parse entirely and reuse the stored result.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import content_io
+import json_stream
+
+MANIFEST_PATH = Path(".tool_cache/content_manifest.json")
+MANIFEST_VERSION = 1
+WRITER_MODULES = (content_io, json_stream)
+
+
+def sha256_bytes(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+
+def fingerprint(*modules, params=None) -> str:
+    """Hash of the tool source files plus their pass options.
+
+    Editing any listed module (for example the RENAMES table in
+    rename_assessment_dimensions.py) or passing different options produces
+    a new key, which invalidates every entry recorded under the old one.
+    The shared writers (content_io, json_stream) are always included, since
+    they decide the output bytes of every tool.
+    """
+    h = hashlib.sha256()
+    for m in dict.fromkeys((*modules, *WRITER_MODULES)):
+        h.update(Path(m.__file__).read_bytes())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+class Manifest:
+    def __init__(self, path=MANIFEST_PATH, enabled=True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.entries = {}
+        self.dirty = False
+        if enabled and self.path.exists():
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            if raw.get("version") == MANIFEST_VERSION:
+                self.entries = raw.get("entries", {})
+
+    @staticmethod
+    def _id(tool, path):
+        return f"{tool}:{Path(path).as_posix()}"
+
+    def lookup(self, tool, path, data: bytes, key: str):
+        """Return the stored entry if `data` is what the tool last left on disk.
+
+        Only the output digest counts: a file restored to the bytes the tool
+        read before rewriting it has to be processed again.
+        """
+        if not self.enabled:
+            return None
+        entry = self.entries.get(self._id(tool, path))
+        if not entry or entry.get("key") != key:
+            return None
+        if sha256_bytes(data) == entry.get("output"):
+            return entry
+        return None
+
+    def record(self, tool, path, data: bytes, key: str, output: bytes = None, result=None, output_digest=None):
+        if not self.enabled:
+            return
+        if output_digest is None:
+            output_digest = sha256_bytes(output if output is not None else data)
+        self.entries[self._id(tool, path)] = {
+            "key": key,
+            "input": sha256_bytes(data),
+            "output": output_digest,
+            "result": result,
+        }
+        self.dirty = True
+
+    def save(self):
+        if not (self.enabled and self.dirty):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "entries": self.entries}, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self.dirty = False
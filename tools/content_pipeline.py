@@ -0,0 +1,281 @@
+"""Run the assets/config content passes over one parsed tree per file.
+
+Each file is read and parsed once, every selected pass runs against the
+in-memory data in registry order, and the file is written at most once.
+
+    python3 tools/content_pipeline.py                       # all passes
+    python3 tools/content_pipeline.py --passes normalize,audit
+    python3 tools/content_pipeline.py --passes steps assets/config/journeys/journeys_married.v3.json
+    python3 tools/content_pipeline.py --watch               # rerun on every save
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import audit_assessments_outcome_signals as audit
+import normalize_assessment_outcome_signals as normalize
+import pass3_normalize_steps as steps
+import rename_assessment_dimensions as rename
+from content_io import read_bytes, write_json
+from content_manifest import Manifest, fingerprint
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+
+class Pass:
+    def __init__(self, name, run, targets, applies, module, params=None, writes=True):
+        self.name = name
+        self.run = run
+        self.targets = targets
+        self.applies = applies
+        self.module = module
+        self.params = params
+        self.writes = writes
+
+
+def _in_dir(folder):
+    return lambda path: path.parent == folder
+
+
+def _audit_pass(path, data, state):
+    state["audit_result"] = audit.audit_data(data)
+    return False
+
+
+def _report_audit(path, result, state):
+    audit.print_report(path.name, result)
+    state["audit"][path] = (len(result["bad_rows"]), len(result["restoration_rows"]))
+
+
+def _print_audit_totals(state):
+    totals = state["audit"].values()
+    audit.print_global(sum(t[0] for t in totals), sum(t[1] for t in totals))
+
+
+# Registry order is execution order.
+PASSES = [
+    Pass(
+        "normalize",
+        lambda path, data, state: normalize.normalize_data(data),
+        lambda: sorted(normalize.ASSESS_DIR.glob("*.json")),
+        _in_dir(normalize.ASSESS_DIR),
+        normalize,
+    ),
+    Pass(
+        "rename",
+        lambda path, data, state: rename.rename_dimensions(data),
+        lambda: list(rename.FILES),
+        lambda path: path in rename.FILES,
+        rename,
+        params=rename.RENAMES,
+    ),
+    Pass(
+        "steps",
+        lambda path, data, state: steps.normalize_catalog(data),
+        lambda: list(steps.FILES),
+        lambda path: path in steps.FILES,
+        steps,
+    ),
+    Pass(
+        "audit",
+        _audit_pass,
+        lambda: sorted(audit.ASSESS_DIR.glob("*.json")),
+        _in_dir(audit.ASSESS_DIR),
+        audit,
+        writes=False,
+    ),
+]
+PASS_NAMES = [p.name for p in PASSES]
+
+
+def select_passes(names):
+    unknown = [n for n in names if n not in PASS_NAMES]
+    if unknown:
+        raise SystemExit(f"❌ Unknown pass(es): {', '.join(unknown)} (known: {', '.join(PASS_NAMES)})")
+    return [p for p in PASSES if p.name in names]
+
+
+def plan_files(passes, paths=None):
+    """Map each file to the passes that apply to it, in a stable order."""
+    if paths:
+        candidates = [Path(p) for p in paths]
+    else:
+        candidates = []
+        for p in passes:
+            candidates.extend(p.targets())
+
+    plan = {}
+    for path in candidates:
+        applicable = [p for p in passes if p.applies(path)]
+        if applicable and path not in plan:
+            plan[path] = applicable
+    return plan
+
+
+def pipeline_key(passes):
+    modules = [sys.modules[__name__]] + [p.module for p in passes]
+    return fingerprint(*modules, params={p.name: p.params for p in passes})
+
+
+def run_file(path, passes, state, manifest):
+    tool = "pipeline:" + ",".join(p.name for p in passes)
+    key = pipeline_key(passes)
+    raw = read_bytes(path)
+
+    entry = manifest.lookup(tool, path, raw, key)
+    if entry:
+        if entry["result"] is not None:
+            _report_audit(path, entry["result"], state)
+        return []
+
+    with section("parse", file=path.name):
+        data = json.loads(raw.decode("utf-8"))
+    state["audit_result"] = None
+    changed = []
+    for p in passes:
+        with section("pass", file=path.name, stage=p.name):
+            if p.run(path, data, state) and p.writes:
+                changed.append(p.name)
+
+    digest = None
+    if changed:
+        with section("write", file=path.name):
+            _, digest = write_json(path, data)
+
+    result = state.pop("audit_result")
+    if result is not None:
+        _report_audit(path, result, state)
+    manifest.record(tool, path, raw, key, result=result, output_digest=digest)
+    return changed
+
+
+def new_state():
+    # Per-file audit counts, so a watch rerun of one file updates the totals.
+    return {"audit": {}}
+
+
+def run(passes, paths=None, manifest=None, state=None):
+    state = state if state is not None else new_state()
+    plan = plan_files(passes, paths)
+    manifest = manifest or Manifest(enabled=False)
+
+    touched = []
+    for path, applicable in plan.items():
+        if not path.exists():
+            print(f"❌ Missing file: {path}")
+            continue
+        with section("file", file=path.name):
+            changed = run_file(path, applicable, state, manifest)
+        if changed:
+            touched.append((path, changed))
+    manifest.save()
+
+    if any(p.name == "audit" for p in passes):
+        _print_audit_totals(state)
+
+    print("\n✅ Done.")
+    if touched:
+        print("Updated files:")
+        for path, changed in touched:
+            print(f" - {path} ({', '.join(changed)})")
+    else:
+        print("No changes needed.")
+    return state
+
+
+def _scan(folders, files):
+    stats = {}
+    for folder in folders:
+        if not folder.exists():
+            continue
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    stats[folder / entry.name] = (st.st_mtime_ns, st.st_size)
+    for path in files:
+        if path.exists():
+            st = path.stat()
+            stats[path] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def watch(passes, paths=None, manifest=None, interval=0.5):
+    """Poll the pass folders and rerun only the passes for changed files.
+
+    Passes work per file, so only the per-file audit counts are kept
+    between rounds; a change re-reads and re-parses just that file.
+    """
+    manifest = manifest or Manifest(enabled=False)
+    state = new_state()
+    run(passes, paths, manifest, state)
+
+    files = [Path(p) for p in paths] if paths else []
+    folders = [] if paths else sorted({t.parent for p in passes for t in p.targets()})
+    seen = _scan(folders, files)
+    where = ", ".join(str(f) for f in (folders or files))
+    print(f"\n👀 Watching {where} (Ctrl-C to stop)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = _scan(folders, files)
+            changed = [p for p, stamp in current.items() if seen.get(p) != stamp]
+            for path in set(seen) - set(current):
+                state["audit"].pop(path, None)
+            seen = current
+            if not changed:
+                continue
+
+            for path in sorted(changed):
+                applicable = [p for p in passes if p.applies(path)]
+                if not applicable:
+                    continue
+                start = time.perf_counter()
+                try:
+                    updated = run_file(path, applicable, state, manifest)
+                except ValueError as e:
+                    # Editors often save half-typed JSON; wait for the next save.
+                    print(f"❌ {path}: {e}")
+                    continue
+                ms = (time.perf_counter() - start) * 1000
+                names = ", ".join(p.name for p in applicable)
+                note = f", updated by {', '.join(updated)}" if updated else ""
+                print(f"\n↻ {path} [{names}] {ms:.0f} ms{note}")
+            manifest.save()
+            if any(p.name == "audit" for p in passes):
+                _print_audit_totals(state)
+            # Our own writes must not trigger another round.
+            seen = _scan(folders, files)
+    except KeyboardInterrupt:
+        manifest.save()
+        print("\n👋 Stopped watching.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--passes",
+        default=",".join(PASS_NAMES),
+        help=f"comma-separated passes to run (default: {','.join(PASS_NAMES)})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="ignore the content manifest and reprocess every file")
+    parser.add_argument("--watch", action="store_true", help="keep running and rerun passes for files as they change")
+    parser.add_argument("--interval", type=float, default=0.5, help="watch polling interval in seconds (default: 0.5)")
+    parser.add_argument("paths", nargs="*", help="restrict the run to these files")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    passes = select_passes([n.strip() for n in args.passes.split(",") if n.strip()])
+    manifest = Manifest(enabled=not args.no_cache)
+    if args.watch:
+        watch(passes, args.paths, manifest, args.interval)
+    else:
+        run(passes, args.paths, manifest)
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,366 @@
+"""Lightweight declaration index for Dart sources.
+
+One lexing pass per file skips comments and string literals (including
+nested ${...} interpolation), matches brackets, and records the byte spans
+of classes, their constructors/methods/fields, and top-level variables
+such as `final fooProvider = ...;`. Patchers can then ask for "end of class
+X" or "does X.fromFirestore exist" without rescanning the source.
+
+    idx = index_source(content)
+    idx.has_member("UserModel", "UserModel.fromFirestore")
+    content[:idx.classes["UserModel"].close] + methods + content[idx.classes["UserModel"].close:]
+"""
+import os
+from functools import lru_cache
+
+from content_io import read_text
+
+_IDENT_START = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$")
+_IDENT = _IDENT_START | set("0123456789")
+_OPEN = {"{": "}", "(": ")", "[": "]"}
+_CLOSE = {"}", ")", "]"}
+_TYPE_KEYWORDS = {"class", "mixin", "enum", "extension"}
+
+# Token text every string literal is reduced to.
+STRING_LITERAL = "<str>"
+
+
+class Token:
+    __slots__ = ("text", "start", "end")
+
+    def __init__(self, text, start, end):
+        self.text = text
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Token({self.text!r}, {self.start}, {self.end})"
+
+
+class Member:
+    def __init__(self, name, kind, start, end):
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Member({self.name!r}, {self.kind!r}, {self.start}, {self.end})"
+
+
+class ClassDecl:
+    def __init__(self, name, kind, start, open_, close):
+        self.name = name
+        self.kind = kind
+        self.start = start
+        # Offsets of the body's "{" and "}"; insert before `close` to append
+        # to the class body.
+        self.open = open_
+        self.close = close
+        self.end = close + 1
+        self.members = {}
+
+    def __repr__(self):
+        return f"ClassDecl({self.name!r}, {self.kind!r}, {self.start}, {self.end})"
+
+
+class DartIndex:
+    def __init__(self, classes, variables):
+        self.classes = classes
+        self.variables = variables
+
+    @property
+    def providers(self):
+        return {name: span for name, span in self.variables.items() if name.endswith("Provider")}
+
+    def has_class(self, name):
+        return name in self.classes
+
+    def has_member(self, class_name, *members):
+        """True if the class declares any of `members` (e.g. both the
+        `Foo.fromJson` constructor and a static `fromJson` method)."""
+        cls = self.classes.get(class_name)
+        return bool(cls and any(m in cls.members for m in members))
+
+    def member(self, class_name, member):
+        cls = self.classes.get(class_name)
+        spans = cls.members.get(member) if cls else None
+        return spans[0] if spans else None
+
+    def class_end(self, class_name):
+        cls = self.classes.get(class_name)
+        return cls.close if cls else -1
+
+
+def _skip_string(src, i, raw):
+    """Return the offset just past the string literal starting at src[i]."""
+    quote = src[i]
+    triple = src.startswith(quote * 3, i)
+    delim = quote * 3 if triple else quote
+    i += len(delim)
+    n = len(src)
+    while i < n:
+        c = src[i]
+        if not raw and c == "\\":
+            i += 2
+            continue
+        if src.startswith(delim, i):
+            return i + len(delim)
+        if not triple and c == "\n":
+            return i  # unterminated single-line string
+        if not raw and c == "$" and i + 1 < n and src[i + 1] == "{":
+            i = _skip_code(src, i + 2, stop="}") + 1
+            continue
+        i += 1
+    return n
+
+
+def _skip_comment(src, i):
+    if src.startswith("//", i):
+        j = src.find("\n", i)
+        return len(src) if j == -1 else j
+    depth = 0
+    n = len(src)
+    while i < n:
+        if src.startswith("/*", i):
+            depth += 1
+            i += 2
+        elif src.startswith("*/", i):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    return n
+
+
+def _string_start(src, i):
+    """Return (is_string, is_raw) for a literal beginning at src[i]."""
+    c = src[i]
+    if c in "'\"":
+        return True, False
+    if c == "r" and i + 1 < len(src) and src[i + 1] in "'\"" and (i == 0 or src[i - 1] not in _IDENT):
+        return True, True
+    return False, False
+
+
+def _skip_code(src, i, stop):
+    """Skip interpolated code up to its unmatched `stop` brace."""
+    depth = 0
+    n = len(src)
+    while i < n:
+        c = src[i]
+        is_str, raw = _string_start(src, i)
+        if is_str:
+            i = _skip_string(src, i + 1 if raw else i, raw)
+        elif src.startswith("//", i) or src.startswith("/*", i):
+            i = _skip_comment(src, i)
+        elif c == "{":
+            depth += 1
+            i += 1
+        elif c == stop and depth == 0:
+            return i
+        elif c == "}":
+            depth -= 1
+            i += 1
+        else:
+            i += 1
+    return n
+
+
+def tokenize(src):
+    tokens = []
+    i = 0
+    n = len(src)
+    while i < n:
+        c = src[i]
+        if c in " \t\r\n":
+            i += 1
+            continue
+        is_str, raw = _string_start(src, i)
+        if is_str:
+            end = _skip_string(src, i + 1 if raw else i, raw)
+            tokens.append(Token(STRING_LITERAL, i, end))
+            i = end
+        elif src.startswith("//", i) or src.startswith("/*", i):
+            i = _skip_comment(src, i)
+        elif c in _IDENT_START:
+            j = i + 1
+            while j < n and src[j] in _IDENT:
+                j += 1
+            tokens.append(Token(src[i:j], i, j))
+            i = j
+        elif src.startswith("=>", i):
+            tokens.append(Token("=>", i, i + 2))
+            i += 2
+        else:
+            tokens.append(Token(c, i, i + 1))
+            i += 1
+    return tokens
+
+
+def _match_brackets(tokens):
+    match = {}
+    stack = []
+    for k, tok in enumerate(tokens):
+        if tok.text in _OPEN:
+            stack.append(k)
+        elif tok.text in _CLOSE and stack:
+            j = stack.pop()
+            match[j] = k
+            match[k] = j
+    return match
+
+
+def _signature(tokens, match, lo, hi):
+    """Member-level tokens up to the body, one token per bracket group."""
+    sig = []
+    k = lo
+    while k < hi:
+        tok = tokens[k]
+        if tok.text in ("{", "=>"):
+            break
+        sig.append(tok)
+        k = match[k] + 1 if tok.text in _OPEN and k in match else k + 1
+    return sig
+
+
+def _member(tokens, match, lo, hi, class_name):
+    """Classify the member spanning tokens[lo:hi] by its signature."""
+    sig = _signature(tokens, match, lo, hi)
+    texts = [t.text for t in sig]
+    paren = texts.index("(") if "(" in texts else -1
+    assign = texts.index("=") if "=" in texts else -1
+
+    if "operator" in texts:
+        return "operator", "method"
+    if "get" in texts and paren == -1:
+        k = texts.index("get")
+        if k + 1 < len(texts):
+            return texts[k + 1], "getter"
+    if paren > 0 and (assign == -1 or paren < assign):
+        k = paren - 1
+        if texts[k] == ">":
+            # Generic method: skip back over its <...> type parameters.
+            depth = 0
+            while k >= 0:
+                depth += {">": 1, "<": -1}.get(texts[k], 0)
+                k -= 1
+                if depth == 0:
+                    break
+        name = texts[k]
+        if k >= 2 and texts[k - 1] == ".":
+            name = f"{texts[k - 2]}.{name}"
+        base = name.split(".")[0]
+        kind = "constructor" if base == class_name else "method"
+        return name, kind
+
+    end = assign if assign != -1 else len(texts)
+    for k in range(end - 1, -1, -1):
+        if sig[k].text[0] in _IDENT_START:
+            return sig[k].text, "field"
+    return None, None
+
+
+def _parse_members(tokens, match, cls, lo, hi):
+    k = lo
+    start = lo
+    while k < hi:
+        text = tokens[k].text
+        if text in _OPEN:
+            close = match.get(k, hi - 1)
+            if text == "{" and (close + 1 >= hi or tokens[close + 1].text not in (";", ",", ".", ")")):
+                # A block body (method/constructor/getter) ends the member.
+                _add_member(tokens, match, cls, start, close + 1)
+                k = start = close + 1
+                continue
+            k = close + 1
+            continue
+        if text == ";":
+            _add_member(tokens, match, cls, start, k + 1)
+            k = start = k + 1
+            continue
+        k += 1
+    if start < hi:
+        _add_member(tokens, match, cls, start, hi)
+
+
+def _add_member(tokens, match, cls, lo, hi):
+    if lo >= hi:
+        return
+    name, kind = _member(tokens, match, lo, hi, cls.name)
+    if name:
+        cls.members.setdefault(name, []).append(Member(name, kind, tokens[lo].start, tokens[hi - 1].end))
+
+
+def build_index(src):
+    tokens = tokenize(src)
+    match = _match_brackets(tokens)
+    classes = {}
+    variables = {}
+    n = len(tokens)
+    k = 0
+    decl_start = 0
+    while k < n:
+        text = tokens[k].text
+        prev = tokens[k - 1].text if k else ""
+        if text in _TYPE_KEYWORDS and prev != ".":
+            j = k + 1
+            while j < n and tokens[j].text != "{" and tokens[j].text != ";":
+                j += 1
+            if j < n and tokens[j].text == "{" and j in match:
+                name = tokens[k + 1].text if k + 1 < j else ""
+                if text == "extension" and name == "on":
+                    name = ""
+                close = match[j]
+                cls = ClassDecl(name, text, tokens[decl_start].start, tokens[j].start, tokens[close].start)
+                if text != "enum":
+                    _parse_members(tokens, match, cls, j + 1, close)
+                if name:
+                    classes.setdefault(name, cls)
+                k = decl_start = close + 1
+                continue
+        elif text in ("final", "const", "var", "late") and prev not in ("final", "const", "late", "static"):
+            j = k + 1
+            eq = -1
+            while j < n and tokens[j].text != ";":
+                if tokens[j].text == "=" and eq == -1:
+                    eq = j
+                if tokens[j].text in _OPEN and j in match:
+                    j = match[j]
+                j += 1
+            if eq > k + 1:
+                variables[tokens[eq - 1].text] = (tokens[decl_start].start, tokens[min(j, n - 1)].end)
+            k = decl_start = j + 1
+            continue
+        elif text in _OPEN and k in match:
+            k = match[k] + 1
+            if text == "{":
+                decl_start = k
+            continue
+        elif text == ";":
+            k = decl_start = k + 1
+            continue
+        k += 1
+    return DartIndex(classes, variables)
+
+
+@lru_cache(maxsize=64)
+def index_source(src):
+    return build_index(src)
+
+
+_FILE_CACHE = {}
+
+
+def index_file(path):
+    """Index `path`, reusing the previous result while its mtime and size hold."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _FILE_CACHE.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    idx = build_index(read_text(path))
+    _FILE_CACHE[path] = (stamp, idx)
+    return idx
@@ -0,0 +1,240 @@
+"""Incremental reader/writer for large top-level JSON objects.
+
+The journey catalogs are one object whose bulk lives in a single array
+(`products`). `iter_object` yields the top-level members in file order and
+hands that array back as a lazy iterator, decoding one element at a time
+from a sliding buffer. `ObjectWriter` emits the canonical layout below one
+member or array item at a time, so a read-transform-write loop only ever
+holds one product.
+
+Canonical layout for every config the tools write: indent=2, UTF-8 with
+no ASCII escaping, a trailing newline, and the top-level keys of each document
+type in KEY_ORDERS order (other keys, and all nested objects, keep their
+authored order). `write_canonical` streams it from
+`JSONEncoder.iterencode` instead of building the whole string.
+"""
+import hashlib
+import json
+
+CHUNK_SIZE = 64 * 1024
+_WS = " \t\n\r"
+
+
+class _Reader:
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, want):
+        if self.eof:
+            return False
+        # Drop what has been consumed before growing the buffer.
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        chunk = self.fp.read(max(want, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Expected {ch!r} at offset {self.pos}, got {got!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        want = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(want):
+                    raise
+                want *= 2
+                continue
+            # A number or literal that ends exactly at the buffer edge may
+            # continue in the next chunk.
+            if end == len(self.buf) and not self.eof:
+                if self._fill(want):
+                    want *= 2
+                    continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("]")
+        return
+
+
+def iter_object(fp, stream_key):
+    """Yield (key, value) for each member of the top-level object in `fp`.
+
+    The member named `stream_key` is yielded as a generator over its array
+    items; it must be exhausted before the next member is requested.
+    """
+    reader = _Reader(fp)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == stream_key and reader.peek() == "[":
+            items = _iter_array(reader)
+            yield key, items
+            for _ in items:
+                pass
+        else:
+            yield key, reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+
+# Leading top-level keys per document type.
+KEY_ORDERS = {
+    "assessment": ("assessmentId", "audience", "title", "version", "questionCount", "dimensions", "questions"),
+    "journey_catalog": ("audienceKey", "schemaVersion", "version", "products"),
+    "engagement": ("version", "polls", "stories"),
+}
+
+_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def doc_type(data):
+    if not isinstance(data, dict):
+        return None
+    if "questions" in data:
+        return "assessment"
+    if "products" in data:
+        return "journey_catalog"
+    if "polls" in data or "stories" in data:
+        return "engagement"
+    return None
+
+
+def canonical_order(data, kind=None):
+    """Shallow reorder of the top-level keys; values are shared, not copied."""
+    lead = KEY_ORDERS.get(kind or doc_type(data))
+    if not lead:
+        return data
+    head = {k: data[k] for k in lead if k in data}
+    return {**head, **{k: v for k, v in data.items() if k not in head}}
+
+
+def iter_canonical(data, kind=None):
+    yield from _ENCODER.iterencode(canonical_order(data, kind))
+    yield "\n"
+
+
+def write_canonical(fp, data, kind=None) -> str:
+    """Stream `data` to the binary file `fp`; returns the sha256 of the bytes."""
+    h = hashlib.sha256()
+    for chunk in iter_canonical(data, kind):
+        b = chunk.encode("utf-8")
+        fp.write(b)
+        h.update(b)
+    return h.hexdigest()
+
+
+def _dumps(value, level):
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace("\n", "\n" + "  " * level)
+
+
+class OutOfOrder(ValueError):
+    """A member arrived after a streamed array it canonically precedes."""
+
+
+class ObjectWriter:
+    """Write a top-level object member by member in the canonical layout.
+
+    With `kind`, plain members are held back and placed in KEY_ORDERS order,
+    so the bytes match `write_canonical` for the same document. A streamed
+    array is written as it arrives; a lead key that turns up after an array
+    it should precede raises OutOfOrder, and the caller falls back to
+    `write_canonical`.
+    """
+
+    def __init__(self, fp, kind=None):
+        self.fp = fp
+        self.lead = {k: i for i, k in enumerate(KEY_ORDERS.get(kind, ()))}
+        self.pending = {}
+        self.members = 0
+        self.items = None
+        self.barrier = None
+
+    def _rank(self, key):
+        return self.lead.get(key, len(self.lead))
+
+    def _key(self, key):
+        self.fp.write("{\n  " if self.members == 0 else ",\n  ")
+        self.fp.write(json.dumps(key, ensure_ascii=False) + ": ")
+        self.members += 1
+
+    def _write(self, key, value):
+        self._key(key)
+        self.fp.write(_dumps(value, 1))
+
+    def _flush(self, before):
+        ready = [k for k in self.pending if self._rank(k) < before]
+        for k in sorted(ready, key=self._rank):
+            self._write(k, self.pending.pop(k))
+
+    def member(self, key, value):
+        if not self.lead:
+            self._write(key, value)
+            return
+        if self.barrier is not None and key in self.lead and self._rank(key) < self.barrier:
+            raise OutOfOrder(key)
+        self.pending[key] = value
+
+    def begin_array(self, key):
+        rank = self._rank(key)
+        if self.lead:
+            self._flush(rank if key in self.lead else len(self.lead) + 1)
+            self.barrier = max(self.barrier or 0, rank if key in self.lead else len(self.lead))
+        self._key(key)
+        self.fp.write("[")
+        self.items = 0
+
+    def item(self, value):
+        self.fp.write("\n    " if self.items == 0 else ",\n    ")
+        self.fp.write(_dumps(value, 2))
+        self.items += 1
+
+    def end_array(self):
+        self.fp.write("\n  ]" if self.items else "]")
+        self.items = None
+
+    def close(self):
+        self._flush(len(self.lead) + 1)
+        self.fp.write("\n}\n" if self.members else "{}\n")
@@ -1,7 +1,14 @@
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 
+from content_io import read_bytes, write_json
+from content_manifest import Manifest, fingerprint
+from tool_jobs import add_jobs_arg, map_jobs
+from tool_profile import add_profile_args, run_main, section, start_profile
+
 ASSESS_DIR = Path("assets/config/assessments")
 
 def slugify(s: str) -> str:
@@ -45,8 +52,7 @@ def normalize_option(option: dict, qid: str, dim: str):
 
     option["outcomeSignal"] = token
 
-def normalize_file(path: Path) -> bool:
-    data = json.loads(path.read_text(encoding="utf-8"))
+def normalize_data(data: dict) -> bool:
     changed = False
 
     for q in data.get("questions", []):
@@ -60,11 +66,26 @@ def normalize_file(path: Path) -> bool:
             if before != after:
                 changed = True
 
-    if changed:
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
     return changed
 
+def _normalize_pending(item):
+    """Normalize one already-read (path, raw bytes) pair in place; returns the output sha256 or None."""
+    path, raw = item
+    with section("file", file=path.name):
+        data = json.loads(raw.decode("utf-8"))
+        if not normalize_data(data):
+            return None
+        _, digest = write_json(path, data)
+        return digest
+
 def main():
+    parser = argparse.ArgumentParser(description="Normalize outcomeSignal tokens in assessment configs.")
+    parser.add_argument("--no-cache", action="store_true", help="ignore the content manifest and reprocess every file")
+    add_jobs_arg(parser)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
     if not ASSESS_DIR.exists():
         raise SystemExit(f"❌ Missing folder: {ASSESS_DIR}")
 
@@ -72,10 +93,22 @@ def main():
     if not files:
         raise SystemExit(f"❌ No json files found in {ASSESS_DIR}")
 
-    touched = []
+    manifest = Manifest(enabled=not args.no_cache)
+    key = fingerprint(sys.modules[__name__])
+
+    pending = []
     for f in files:
-        if normalize_file(f):
+        with section("read", file=f.name):
+            raw = read_bytes(f)
+        if not manifest.lookup("normalize", f, raw, key):
+            pending.append((f, raw))
+
+    touched = []
+    for (f, raw), digest in zip(pending, map_jobs(_normalize_pending, pending, args.jobs)):
+        manifest.record("normalize", f, raw, key, output_digest=digest)
+        if digest is not None:
             touched.append(f.name)
+    manifest.save()
 
     print("✅ Done.")
     if touched:
@@ -86,4 +119,4 @@ def main():
         print("No changes needed.")
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
@@ -0,0 +1,192 @@
+"""Cross-file inverted index of outcomeSignal tokens.
+
+The recommendation layer treats outcomeSignal tokens as global keys across
+every assessment, so a token reused in two assessments is a collision even
+when each file is clean on its own. This keeps a persistent
+token -> [(file, question, option, dimension)] index in .tool_cache/, plus
+the token -> files map of current collisions, and re-reads only files whose
+size or mtime changed since the last update (then skips them again if the
+sha256 is the same). Queries answer from the stored maps.
+
+    python3 tools/outcome_signal_index.py update
+    python3 tools/outcome_signal_index.py where <token> [<token> ...]
+    python3 tools/outcome_signal_index.py collisions [--fail]
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+from content_io import read_bytes
+from content_manifest import sha256_bytes
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+ASSESS_DIR = Path("assets/config/assessments")
+INDEX_PATH = Path(".tool_cache/outcome_signal_index.json")
+INDEX_VERSION = 2
+
+
+def file_postings(data: dict) -> dict:
+    """token -> [[question, option, dimension], ...] for one assessment."""
+    postings = {}
+    for qi, q in enumerate(data.get("questions", [])):
+        qid = (q.get("id") or "").strip() or f"q{qi+1}"
+        dim = (q.get("dimension") or "").strip()
+        for oi, opt in enumerate(q.get("options", [])):
+            sig = (opt.get("outcomeSignal") or "").strip()
+            if sig:
+                oid = (opt.get("id") or "").strip() or f"o{oi+1}"
+                postings.setdefault(sig, []).append([qid, oid, dim])
+    return postings
+
+
+class SignalIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.files = {}
+        self.tokens = {}
+        self.shared = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            if raw.get("version") == INDEX_VERSION:
+                self.files = raw.get("files", {})
+                self.tokens = raw.get("tokens", {})
+                self.shared = raw.get("shared", {})
+
+    def _reshare(self, token):
+        files = sorted({loc[0] for loc in self.tokens.get(token, [])})
+        if len(files) > 1:
+            self.shared[token] = files
+        else:
+            self.shared.pop(token, None)
+
+    def _remove(self, name):
+        entry = self.files.pop(name, None)
+        if not entry:
+            return
+        for token in entry["tokens"]:
+            kept = [loc for loc in self.tokens.get(token, []) if loc[0] != name]
+            if kept:
+                self.tokens[token] = kept
+            else:
+                self.tokens.pop(token, None)
+            self._reshare(token)
+        self.dirty = True
+
+    def _add(self, name, stat, digest, postings):
+        self.files[name] = {"sha256": digest, "stat": stat, "tokens": sorted(postings)}
+        for token, locs in postings.items():
+            self.tokens.setdefault(token, []).extend([name, *loc] for loc in locs)
+            self._reshare(token)
+        self.dirty = True
+
+    def update(self, paths):
+        """Re-index changed files and drop vanished ones; returns changed names."""
+        seen = set()
+        changed = []
+        for path in paths:
+            name = Path(path).as_posix()
+            seen.add(name)
+            st = Path(path).stat()
+            stat = [st.st_size, st.st_mtime_ns]
+            entry = self.files.get(name, {})
+            if entry.get("stat") == stat:
+                continue
+            raw = read_bytes(path)
+            digest = sha256_bytes(raw)
+            if entry.get("sha256") == digest:
+                entry["stat"] = stat
+                self.dirty = True
+                continue
+            with section("file", file=name):
+                self._remove(name)
+                self._add(name, stat, digest, file_postings(json.loads(raw.decode("utf-8"))))
+            changed.append(name)
+        for name in [n for n in self.files if n not in seen]:
+            self._remove(name)
+            changed.append(name)
+        return changed
+
+    def where(self, token):
+        return self.tokens.get(token, [])
+
+    def collisions(self):
+        """token -> sorted files, for tokens used by more than one file."""
+        return dict(sorted(self.shared.items()))
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps(
+                {"version": INDEX_VERSION, "files": self.files, "tokens": self.tokens, "shared": self.shared},
+                ensure_ascii=False,
+            ) + "\n",
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the cross-assessment outcomeSignal index.")
+    parser.add_argument("--index", type=Path, default=INDEX_PATH, help=f"index file (default: {INDEX_PATH})")
+    parser.add_argument("--json", action="store_true", help="print query results as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="re-index changed assessment files")
+    where = sub.add_parser("where", help="list every location that uses a token")
+    where.add_argument("tokens", nargs="+")
+    coll = sub.add_parser("collisions", help="list tokens used by more than one assessment")
+    coll.add_argument("--fail", action="store_true", help="exit 1 when any collision exists")
+    add_profile_args(*sub.choices.values())
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not ASSESS_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {ASSESS_DIR} (run from repo root)")
+
+    index = SignalIndex(args.index)
+    changed = index.update(sorted(ASSESS_DIR.glob("*.json")))
+    index.save()
+
+    if args.command == "update":
+        print(f"✅ Indexed {len(index.tokens)} token(s) across {len(index.files)} file(s); {len(changed)} re-indexed.")
+        for name in changed:
+            print(f" - {name}")
+        return
+
+    if args.command == "where":
+        results = {t: index.where(t) for t in args.tokens}
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+        for token, locs in results.items():
+            if not locs:
+                print(f"❌ {token}: not used")
+                continue
+            print(f"{token}: {len(locs)} use(s)")
+            for name, qid, oid, dim in locs:
+                print(f" - {name} {qid}/{oid} [{dim}]")
+        return
+
+    collisions = index.collisions()
+    if args.json:
+        print(json.dumps(collisions, indent=2, ensure_ascii=False))
+    elif collisions:
+        print(f"⚠️ {len(collisions)} outcomeSignal token(s) used in more than one assessment:")
+        for token, files in collisions.items():
+            print(f" - {token}: {', '.join(files)}")
+    else:
+        print("✅ No outcomeSignal tokens shared across assessments.")
+    if collisions and args.fail:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_main(main)
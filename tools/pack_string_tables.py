@@ -0,0 +1,209 @@
+"""Pack configs into a shared string table plus index references.
+
+String values that repeat (tiers, lockRule values, responseUX labels,
+gamification and monetization copy) are stored once in `strings`, most
+frequent first, and replaced in the tree by the negative integer
+-(index + 1). Only strings whose references are smaller than their repeats
+are interned. Object keys are left as they are.
+
+    {"version": 1, "strings": [...], "data": <tree with references>}
+
+The encoding is loss-free: non-negative numbers pass through unchanged,
+original negative numbers become {"$num": n}, and an original object whose
+only key is "$num" or "$obj" is wrapped as {"$obj": {...}}. Every pack is
+round-tripped through `unpack` and compared byte for byte before it is
+written.
+
+    python3 tools/pack_string_tables.py pack [paths...] [--out build/packed_configs]
+    python3 tools/pack_string_tables.py unpack build/packed_configs/married_v1.packed.json [--out file.json]
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from content_io import read_json, write_bytes_if_changed, write_json
+from json_stream import iter_canonical
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+PACK_VERSION = 1
+OUT_DIR = Path("build/packed_configs")
+DEFAULT_FILES = [
+    Path("assets/config/onboarding/nexus1_onboarding_lists_v1.json"),
+    Path("assets/config/onboarding/churches_v1.json"),
+    *sorted(Path("assets/config/journeys").glob("*.json")),
+]
+PARSE_RUNS = 20
+_ESCAPED = ({"$num"}, {"$obj"})
+
+
+def _strings(node, counts):
+    if isinstance(node, str):
+        counts[node] += 1
+    elif isinstance(node, dict):
+        for v in node.values():
+            _strings(v, counts)
+    elif isinstance(node, list):
+        for v in node:
+            _strings(v, counts)
+
+
+def _dumped_len(s: str) -> int:
+    return len(json.dumps(s, ensure_ascii=False).encode("utf-8"))
+
+
+def string_table(data):
+    """Repeated strings worth interning, most frequent first."""
+    counts = Counter()
+    _strings(data, counts)
+    table = []
+    for s, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+        if n < 2:
+            break
+        ref = len(str(-(len(table) + 1)))
+        size = _dumped_len(s)
+        # n inline copies vs. n references plus one table entry and a comma.
+        if n * size > n * ref + size + 1:
+            table.append(s)
+    return table
+
+
+def _encode(node, refs):
+    if isinstance(node, str):
+        return refs.get(node, node)
+    if isinstance(node, bool) or node is None:
+        return node
+    if isinstance(node, (int, float)):
+        return {"$num": node} if node < 0 else node
+    if isinstance(node, list):
+        return [_encode(v, refs) for v in node]
+    out = {k: _encode(v, refs) for k, v in node.items()}
+    return {"$obj": out} if set(node) in _ESCAPED else out
+
+
+def pack(data):
+    table = string_table(data)
+    refs = {s: -(i + 1) for i, s in enumerate(table)}
+    return {"version": PACK_VERSION, "strings": table, "data": _encode(data, refs)}
+
+
+def _decode(node, strings):
+    if isinstance(node, bool) or node is None or isinstance(node, (str, float)):
+        return node
+    if isinstance(node, int):
+        return strings[-node - 1] if node < 0 else node
+    if isinstance(node, list):
+        return [_decode(v, strings) for v in node]
+    if len(node) == 1:
+        if "$num" in node:
+            return node["$num"]
+        if "$obj" in node:
+            return {k: _decode(v, strings) for k, v in node["$obj"].items()}
+    return {k: _decode(v, strings) for k, v in node.items()}
+
+
+def unpack(packed):
+    if packed.get("version") != PACK_VERSION:
+        raise ValueError(f"unsupported pack version {packed.get('version')!r}")
+    return _decode(packed["data"], packed["strings"])
+
+
+def minify(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_time(text: str) -> float:
+    best = float("inf")
+    for _ in range(PARSE_RUNS):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pack_file(path: Path, out_dir: Path):
+    data = read_json(path)
+    packed = pack(data)
+    source_text = minify(data)
+    if minify(unpack(packed)) != source_text:
+        raise SystemExit(f"❌ {path}: round trip does not reproduce the source")
+
+    packed_text = minify(packed)
+    target = out_dir / f"{path.stem}.packed.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_bytes_if_changed(target, packed_text.encode("utf-8"))
+
+    counts = Counter()
+    _strings(data, counts)
+    interned = set(packed["strings"])
+    start = time.perf_counter()
+    unpack(json.loads(packed_text))
+    decode_ms = (time.perf_counter() - start) * 1000
+    return {
+        "file": str(path),
+        "out": str(target),
+        "sourceBytes": len(source_text.encode("utf-8")),
+        "packedBytes": len(packed_text.encode("utf-8")),
+        "stringValues": sum(counts.values()),
+        "uniqueStrings": len(counts),
+        "interned": len(packed["strings"]),
+        "stringsAfter": len(interned) + sum(n for s, n in counts.items() if s not in interned),
+        "sourceParseMs": parse_time(source_text) * 1000,
+        "packedParseMs": parse_time(packed_text) * 1000,
+        "unpackMs": decode_ms,
+    }
+
+
+def print_report(r):
+    saved = r["sourceBytes"] - r["packedBytes"]
+    print(f"\n==== {r['file']} -> {r['out']} ====")
+    print(f"  minified source {r['sourceBytes']:>9,} B  parse {r['sourceParseMs']:7.2f} ms")
+    print(f"  packed          {r['packedBytes']:>9,} B  parse {r['packedParseMs']:7.2f} ms"
+          f"  (+ {r['unpackMs']:.2f} ms full unpack)")
+    print(f"  saved {saved:,} B ({saved / max(r['sourceBytes'], 1):.0%}); "
+          f"{r['interned']} of {r['uniqueStrings']} distinct strings interned; "
+          f"string values decoded {r['stringValues']:,} -> {r['stringsAfter']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack configs into a shared string table, or unpack them.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("pack", help="pack configs and print a size/parse-time report")
+    p.add_argument("paths", nargs="*", type=Path, help="configs to pack (default: onboarding lists, churches, journeys)")
+    p.add_argument("--out", type=Path, default=OUT_DIR, help=f"output folder (default: {OUT_DIR})")
+    u = sub.add_parser("unpack", help="restore a packed file to plain JSON")
+    u.add_argument("packed", type=Path)
+    u.add_argument("--out", type=Path, help="write here instead of stdout")
+    add_profile_args(*sub.choices.values())
+    args = parser.parse_args()
+    start_profile(args)
+
+    if args.command == "unpack":
+        data = unpack(read_json(args.packed))
+        if args.out:
+            write_json(args.out, data)
+            print(f"✅ Wrote {args.out}")
+        else:
+            sys.stdout.writelines(iter_canonical(data))
+        return
+
+    paths = args.paths or DEFAULT_FILES
+    reports = []
+    for path in paths:
+        if not path.exists():
+            print(f"❌ Missing file: {path}")
+            continue
+        with section("file", file=str(path)):
+            r = pack_file(path, args.out)
+        print_report(r)
+        reports.append(r)
+
+    total_src = sum(r["sourceBytes"] for r in reports)
+    total_packed = sum(r["packedBytes"] for r in reports)
+    print(f"\n✅ Packed {len(reports)} file(s): {total_src:,} B -> {total_packed:,} B")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -1,6 +1,11 @@
-import json, re, glob, shutil
+import argparse, json, re, glob
 from datetime import datetime
 from pathlib import Path
+from types import GeneratorType
+
+from content_io import commit_temp, read_bytes, read_text, temp_path
+from json_stream import ObjectWriter, OutOfOrder, iter_canonical, iter_object, write_canonical
+from tool_profile import add_profile_args, count_io, run_main, section, start_profile
 
 BASE = Path("assets/config/journeys")
 
@@ -85,26 +90,93 @@ def normalize_product(p):
     p["subtitle"] = p.get("subtitle") or p.get("preview")
     return p
 
-def run():
+def normalize_product_steps(p):
+    before = (p.get("productId"), p.get("title"), p.get("subtitle"))
+    had_keys = all(k in p for k in ("productId", "title", "subtitle"))
+    p = normalize_product(p)
+    changed = not had_keys or before != (p["productId"], p["title"], p["subtitle"])
+    for s in p.get("sessions", []):
+        steps = s.get("steps")
+        if steps in (None, []) or any(st.get("inferTags") is None for st in steps):
+            changed = True
+        normalize_session_steps(p["productId"], s)
+    return changed
+
+def normalize_catalog(data):
+    changed = False
+    for p in data.get("products", []):
+        if normalize_product_steps(p):
+            changed = True
+    return changed
+
+def normalize_stream(src, dst):
+    # Walks products[] one product at a time; peak memory is bounded by the
+    # largest single product rather than the whole catalog.
+    out = ObjectWriter(dst, kind="journey_catalog")
+    for key, value in iter_object(src, "products"):
+        if not isinstance(value, GeneratorType):
+            out.member(key, value)
+            continue
+        out.begin_array(key)
+        for p in value:
+            normalize_product_steps(p)
+            out.item(p)
+        out.end_array()
+    out.close()
+
+def normalize_whole(f, tmp):
+    # Same bytes as the content_pipeline steps pass, which writes the whole tree.
+    data = json.loads(read_text(f))
+    normalize_catalog(data)
+    with tmp.open("wb") as dst:
+        write_canonical(dst, data, "journey_catalog")
+
+def verify(f, tmp):
+    data = json.loads(read_text(f))
+    normalize_catalog(data)
+    expected = "".join(iter_canonical(data, "journey_catalog")).encode("utf-8")
+    if read_bytes(tmp) != expected:
+        raise SystemExit(f"❌ {f}: streamed output differs from the whole-document write")
+
+def run(backup=True, check=False):
     for f in FILES:
         if not f.exists():
             print(f"❌ Missing file: {f}")
             continue
 
-        bak = f.with_suffix(f.suffix + ".bak")
-        shutil.copy2(f, bak)
-
-        data = json.loads(f.read_text())
-
-        products = data.get("products", [])
-        for p in products:
-            p = normalize_product(p)
-            sessions = p.get("sessions", [])
-            for s in sessions:
-                normalize_session_steps(p["productId"], s)
-
-        f.write_text(json.dumps(data, indent=2, ensure_ascii=False))
-        print(f"✅ Normalized: {f} (backup: {bak})")
+        tmp = temp_path(f)
+        with section("file", file=f.name):
+            try:
+                try:
+                    count_io(read=f.stat().st_size)
+                    with f.open(encoding="utf-8") as src, tmp.open("w", encoding="utf-8") as dst:
+                        normalize_stream(src, dst)
+                except OutOfOrder:
+                    normalize_whole(f, tmp)
+                if check:
+                    verify(f, tmp)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+
+            # Unchanged catalogs keep their bytes and mtime and get no backup.
+            replaced = commit_temp(tmp, f, backup=backup)
+        if not replaced:
+            print(f"✅ Unchanged: {f}")
+        elif backup:
+            print(f"✅ Normalized: {f} (backup: {f.with_suffix(f.suffix + '.bak')})")
+        else:
+            print(f"✅ Normalized: {f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize journey sessions into structured steps.")
+    parser.add_argument("--no-backup", action="store_true", help="do not copy changed catalogs to .bak first")
+    parser.add_argument("--verify", action="store_true",
+                        help="also build each file in memory and fail unless the streamed bytes match")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+    run(backup=not args.no_backup, check=args.verify)
 
 if __name__ == "__main__":
-    run()
+    run_main(main)
@@ -1,6 +1,11 @@
 from pathlib import Path
+import argparse
 import re
 
+from content_io import read_text, write_bytes_if_changed
+from dart_index import index_file, index_source
+from tool_profile import add_profile_args, run_main, start_profile
+
 RESULT_FILE = Path("lib/features/assessment/presentation/screens/assessment_result_screen.dart")
 ROUTES_FILE = Path("lib/core/router/app_routes.dart")
 
@@ -11,26 +16,28 @@ LOCKED_COPY = (
 
 def detect_challenges_route() -> str:
     # Prefer AppRoutes.challenges if it exists; else fall back to '/challenges'
-    if ROUTES_FILE.exists():
-        s = ROUTES_FILE.read_text(encoding="utf-8")
-        if re.search(r"\bstatic\s+const\s+String\s+challenges\b", s):
-            return "AppRoutes.challenges"
+    if ROUTES_FILE.exists() and index_file(str(ROUTES_FILE)).has_member("AppRoutes", "challenges"):
+        return "AppRoutes.challenges"
     return "'/challenges'"
 
 def main():
+    parser = argparse.ArgumentParser(description="Replace the assessment result microStep NextSteps with the challenges CTA.")
+    add_profile_args(parser)
+    start_profile(parser.parse_args())
+
     if not RESULT_FILE.exists():
         raise SystemExit(f"❌ Not found: {RESULT_FILE}")
 
-    s = RESULT_FILE.read_text(encoding="utf-8")
+    s = read_text(RESULT_FILE)
 
     route_expr = detect_challenges_route()
 
     # 1) Inject a CTA card widget if missing
-    if "_ExploreChallengesCtaCard" not in s:
-        insert_after = "class _TopBar extends StatelessWidget {"
-        idx = s.find(insert_after)
-        if idx == -1:
+    decls = index_source(s)
+    if not decls.has_class("_ExploreChallengesCtaCard"):
+        if not decls.has_class("_TopBar"):
             raise SystemExit("❌ Could not find insertion point (class _TopBar).")
+        idx = decls.classes["_TopBar"].start
 
         cta_widget = f"""
 class _ExploreChallengesCtaCard extends StatelessWidget {{
@@ -133,8 +140,8 @@ class _ExploreChallengesCtaCard extends StatelessWidget {{
             else:
                 raise SystemExit("❌ Could not locate nextSteps block or fallback anchors to insert CTA.")
 
-    RESULT_FILE.write_text(s, encoding="utf-8")
+    write_bytes_if_changed(RESULT_FILE, s.encode("utf-8"))
     print("✅ Patched AssessmentResultScreen: replaced microStep NextSteps with Explore Challenges CTA")
 
 if __name__ == "__main__":
-    main()
+    run_main(main)
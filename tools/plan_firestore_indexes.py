@@ -0,0 +1,490 @@
+"""Plan Firestore composite indexes from the app's query chains.
+
+Extracts every collection(...)/where/orderBy/limit chain in lib/**/*.dart
+(lib/_ignored is skipped), following reference helpers such as `_chatsRef`
+or `_assessmentResultsRef(uid)` and `query = query.where(...)`
+reassignments, and normalizes each executed query (.get()/.snapshots()/
+.count()) into a shape. The shapes are then checked against
+firestore.indexes.json:
+
+    missing     a query needs a composite index that is not declared, or a
+                single-field index that fieldOverrides switched off
+    unused      a declared composite index that no query uses
+    over-wide   an unused index whose fields extend the ones a query needs
+    redundant   duplicate declarations and one-field composites (Firestore
+                builds single-field indexes automatically)
+
+Equality and array-contains filters without orderBy or range filters are
+served by merging single-field indexes and need no composite. The
+proposed indexes file keeps the declared indexes (minus redundant ones;
+minus unused and over-wide ones with --prune) and adds the missing ones.
+Missing indexes fail the run (exit 1).
+
+    python3 tools/plan_firestore_indexes.py [--out build/firestore/firestore.indexes.json] [--prune]
+"""
+import argparse
+import copy
+import json
+import re
+from bisect import bisect_right
+from pathlib import Path
+
+from content_io import read_text, write_json
+from dart_index import STRING_LITERAL, index_source, tokenize
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+LIB_DIR = Path("lib")
+INDEXES_PATH = Path("firestore.indexes.json")
+OUT_PATH = Path("build/firestore/firestore.indexes.json")
+
+# where() named argument -> (symbol for reports, kind)
+OPS = {
+    "isEqualTo": ("==", "eq"),
+    "whereIn": ("in", "eq"),
+    "isNull": ("== null", "eq"),
+    "arrayContains": ("array-contains", "array"),
+    "arrayContainsAny": ("array-contains-any", "array"),
+    "isLessThan": ("<", "range"),
+    "isLessThanOrEqualTo": ("<=", "range"),
+    "isGreaterThan": (">", "range"),
+    "isGreaterThanOrEqualTo": (">=", "range"),
+    "isNotEqualTo": ("!=", "range"),
+    "whereNotIn": ("not-in", "range"),
+}
+EXECUTE = {"get", "snapshots", "count", "aggregate"}
+PASSTHROUGH = {
+    "withConverter", "startAt", "startAfter", "startAtDocument", "startAfterDocument",
+    "endAt", "endBefore", "endAtDocument", "endBeforeDocument",
+}
+NOT_FUNCTIONS = {"if", "for", "while", "switch", "catch"}
+CONST_RE = re.compile(r"""static\s+const\s+(?:String\s+)?(\w+)\s*=\s*['"]([^'"$]*)['"]""")
+
+
+class Shape:
+    """A collection reference or query as the chain has built it so far."""
+
+    def __init__(self, collection, scope="COLLECTION"):
+        self.collection = collection
+        self.scope = scope
+        self.doc = False
+        self.filters = []  # (field, where() operator)
+        self.orders = []   # (field, "ASCENDING" | "DESCENDING")
+        self.limit = False
+
+    def copy(self):
+        return copy.deepcopy(self)
+
+    def key(self):
+        return (self.collection, self.scope, tuple(self.filters), tuple(self.orders), self.limit)
+
+    def describe(self):
+        parts = [f"{f} {OPS[op][0]}" for f, op in self.filters]
+        parts += [f"order by {f}{' desc' if d == 'DESCENDING' else ''}" for f, d in self.orders]
+        if self.limit:
+            parts.append("limit")
+        group = " (group)" if self.scope == "COLLECTION_GROUP" else ""
+        return f"{self.collection}{group}: {' · '.join(parts) or 'all documents'}"
+
+
+def _brackets(tokens):
+    match = {}
+    stack = []
+    for k, tok in enumerate(tokens):
+        if tok.text in "([{":
+            stack.append(k)
+        elif tok.text in ")]}" and stack:
+            o = stack.pop()
+            match[o] = k
+            match[k] = o
+    return match
+
+
+def _is_ident(tok):
+    return tok.text != STRING_LITERAL and tok.text.replace("$", "_").isidentifier()
+
+
+def _literal(src, tok):
+    text = src[tok.start:tok.end].lstrip("r")
+    q = 3 if text[:3] in ("'''", '"""') else 1
+    value = text[q:-q]
+    return None if "$" in value else value
+
+
+def _args(tokens, match, lo, hi):
+    """Top-level arguments in tokens[lo:hi] as (name or None, lo, hi)."""
+    out = []
+    k = start = lo
+    while k <= hi:
+        if k == hi or tokens[k].text == ",":
+            if k > start:
+                named = _is_ident(tokens[start]) and start + 1 < k and tokens[start + 1].text == ":"
+                out.append((tokens[start].text, start + 2, k) if named else (None, start, k))
+            start = k + 1
+        elif tokens[k].text in "([{" and k in match:
+            k = match[k]
+        k += 1
+    return out
+
+
+class DartFile:
+    def __init__(self, path, src, consts):
+        self.path = path
+        self.src = src
+        self.tokens = tokenize(self.src)
+        self.match = _brackets(self.tokens)
+        self.consts = consts
+        self.lines = [m.end() for m in re.finditer("\n", self.src)]
+        self.helpers = {}
+
+    def line(self, k):
+        return bisect_right(self.lines, self.tokens[k].start) + 1
+
+    def value(self, lo, hi):
+        """String value of an argument: a literal, Class.CONST or FieldPath.documentId."""
+        toks = self.tokens[lo:hi]
+        if len(toks) == 1 and toks[0].text == STRING_LITERAL:
+            return _literal(self.src, toks[0])
+        text = "".join(t.text for t in toks)
+        if text == "FieldPath.documentId":
+            return "__name__"
+        return self.consts.get(text)
+
+    def chain(self, k):
+        """Parse `a.b(...).c<T>(...)` from tokens[k]; returns [(name, args span or None)]."""
+        tokens, n = self.tokens, len(self.tokens)
+        calls = []
+        while True:
+            name = tokens[k].text
+            k += 1
+            if k < n and tokens[k].text == "<" and name == "withConverter":
+                depth = 0
+                while k < n:
+                    depth += {"<": 1, ">": -1}.get(tokens[k].text, 0)
+                    k += 1
+                    if depth == 0:
+                        break
+            args = None
+            if k < n and tokens[k].text == "(" and k in self.match:
+                args = (k + 1, self.match[k])
+                k = self.match[k] + 1
+            calls.append((name, args))
+            if k < n and tokens[k].text in ("!", "?") and k + 1 < n and tokens[k + 1].text == ".":
+                k += 1
+            if k + 1 < n and tokens[k].text == "." and _is_ident(tokens[k + 1]):
+                k += 1
+                continue
+            return calls
+
+    def interpret(self, calls, variables):
+        """Returns (shape or None, executed)."""
+        name, args = calls[0]
+        shape = None
+        if args is None and name in variables:
+            shape = variables[name].copy()
+        elif name in self.helpers:
+            shape = self.helpers[name].copy()
+        for name, args in calls[1:]:
+            if name in ("collection", "collectionGroup"):
+                arg = _args(self.tokens, self.match, *args) if args else []
+                coll = self.value(arg[0][1], arg[0][2]) if arg else None
+                if coll is None:
+                    return None, False
+                shape = Shape(coll, "COLLECTION_GROUP" if name == "collectionGroup" else "COLLECTION")
+            elif shape is None:
+                continue
+            elif name in EXECUTE:
+                return shape, True
+            elif name == "doc":
+                shape.doc = True
+            elif shape.doc:
+                return None, False
+            elif name == "where" and args:
+                arg = _args(self.tokens, self.match, *args)
+                field = self.value(arg[0][1], arg[0][2]) if arg and arg[0][0] is None else None
+                ops = [a[0] for a in arg if a[0] in OPS]
+                if field is None or not ops:
+                    return None, False
+                shape.filters.append((field, ops[0]))
+            elif name == "orderBy" and args:
+                arg = _args(self.tokens, self.match, *args)
+                field = self.value(arg[0][1], arg[0][2]) if arg and arg[0][0] is None else None
+                if field is None:
+                    return None, False
+                desc = any(a[0] == "descending" and self.tokens[a[1]].text == "true" for a in arg)
+                shape.orders.append((field, "DESCENDING" if desc else "ASCENDING"))
+            elif name in ("limit", "limitToLast"):
+                shape.limit = True
+            elif name not in PASSTHROUGH:
+                return None, False
+        return shape, False
+
+    def _before(self, k):
+        """Index of the token before the chain at k, skipping `await`."""
+        j = k - 1
+        if j >= 0 and self.tokens[j].text == "await":
+            j -= 1
+        return j
+
+    def _function_name(self, j):
+        """Name of the getter/function whose `=>` or body `{` is tokens[j]."""
+        tokens = self.tokens
+        j -= 1
+        if j >= 0 and tokens[j].text == "async":
+            j -= 1
+        if j >= 0 and tokens[j].text == ")" and j in self.match:
+            j = self.match[j] - 1
+        if j >= 0 and _is_ident(tokens[j]) and tokens[j].text not in NOT_FUNCTIONS:
+            return tokens[j].text
+        return None
+
+    def _helper_name(self, k):
+        tokens = self.tokens
+        j = self._before(k)
+        if j < 0:
+            return None
+        if tokens[j].text == "=>":
+            return self._function_name(j)
+        if tokens[j].text != "return":
+            return None
+        while j >= 0:
+            j -= 1
+            if tokens[j].text == "}" and j in self.match:
+                j = self.match[j]
+            elif tokens[j].text == "{":
+                return self._function_name(j)
+        return None
+
+    def _starts(self):
+        for k, tok in enumerate(self.tokens):
+            if _is_ident(tok) and (k == 0 or self.tokens[k - 1].text != "."):
+                yield k
+
+    def collect_helpers(self):
+        changed = True
+        while changed:
+            changed = False
+            for k in self._starts():
+                calls = self.chain(k)
+                if len(calls) < 2:
+                    continue
+                shape, executed = self.interpret(calls, {})
+                name = self._helper_name(k) if shape and not executed else None
+                if name and (name not in self.helpers or self.helpers[name].key() != shape.key()):
+                    self.helpers[name] = shape
+                    changed = True
+
+    def queries(self):
+        variables = {}
+        for k in self._starts():
+            calls = self.chain(k)
+            if len(calls) < 2 and calls[0][0] not in self.helpers:
+                continue
+            shape, executed = self.interpret(calls, variables)
+            j = self._before(k)
+            assigned = None
+            if j > 0 and self.tokens[j].text == "=" and _is_ident(self.tokens[j - 1]):
+                assigned = self.tokens[j - 1].text
+            if assigned:
+                if shape and not executed:
+                    variables[assigned] = shape
+                else:
+                    variables.pop(assigned, None)
+            if shape and executed and not shape.doc:
+                yield shape, self.line(k)
+
+
+def load_consts(paths):
+    consts = {}
+    for path in paths:
+        src = read_text(path)
+        if "static const" not in src:
+            continue
+        classes = index_source(src).classes
+        for m in CONST_RE.finditer(src):
+            owner = next((c for c, d in classes.items() if d.start <= m.start() < d.end), None)
+            if owner:
+                consts[f"{owner}.{m.group(1)}"] = m.group(2)
+    return consts
+
+
+def extract_queries(lib_dir):
+    """Distinct query shapes -> (shape, [file:line, ...])."""
+    paths = sorted(p for p in lib_dir.rglob("*.dart") if "_ignored" not in p.parts)
+    consts = load_consts(paths)
+    shapes = {}
+    for path in paths:
+        with section("file", file=path.as_posix()):
+            src = read_text(path)
+            if ".collection" not in src:
+                continue
+            f = DartFile(path, src, consts)
+            f.collect_helpers()
+            for shape, line in f.queries():
+                shapes.setdefault(shape.key(), (shape, []))[1].append(f"{path.as_posix()}:{line}")
+    return list(shapes.values())
+
+
+def requirement(shape):
+    """(prefix, order) of the composite index the query needs, or None.
+
+    prefix holds the equality (ASCENDING) and array-contains (CONTAINS)
+    fields in any order; order is the exact sort the index must provide.
+    """
+    eq, arr, rng = [], [], []
+    for field, op in shape.filters:
+        bucket = {"eq": eq, "array": arr, "range": rng}[OPS[op][1]]
+        if field not in bucket:
+            bucket.append(field)
+    order = [(f, d) for f, d in shape.orders if f not in eq]
+    order += [(f, "ASCENDING") for f in rng if f not in {o[0] for o in order}]
+    if not order or (not eq and not arr and len(order) == 1):
+        return None
+    return [(f, "CONTAINS") for f in arr] + [(f, "ASCENDING") for f in eq if f not in arr], order
+
+
+def single_fields(shape):
+    """Single-field index modes a query without a composite relies on."""
+    out = [(f, "CONTAINS" if OPS[op][1] == "array" else "ANY") for f, op in shape.filters]
+    return out + list(shape.orders)
+
+
+def index_fields(index):
+    return tuple((f["fieldPath"], f.get("order") or f.get("arrayConfig")) for f in index.get("fields", []))
+
+
+def serves(fields, prefix, order):
+    if len(fields) != len(prefix) + len(order) or list(fields[len(prefix):]) != order:
+        return False
+    head = dict(fields[:len(prefix)])
+    want = dict(prefix)
+    if len(head) != len(prefix) or set(head) != set(want):
+        return False
+    return all((head[f] == "CONTAINS") == (want[f] == "CONTAINS") for f in want)
+
+
+def to_index(collection, scope, prefix, order):
+    fields = [{"fieldPath": f, "arrayConfig": m} if m == "CONTAINS" else {"fieldPath": f, "order": m}
+              for f, m in [*prefix, *order]]
+    return {"collectionGroup": collection, "queryScope": scope, "fields": fields}
+
+
+def override_blocks(overrides, collection, scope, field, mode):
+    for o in overrides:
+        if o.get("collectionGroup") != collection or o.get("fieldPath") != field:
+            continue
+        modes = {i.get("order") or i.get("arrayConfig") for i in o.get("indexes", [])
+                 if i.get("queryScope", "COLLECTION") == scope}
+        if mode == "ANY":
+            return not modes & {"ASCENDING", "DESCENDING"}, o
+        return mode not in modes, o
+    return False, None
+
+
+def plan(queries, declared, prune=False):
+    indexes = declared.get("indexes", [])
+    overrides = copy.deepcopy(declared.get("fieldOverrides", []))
+    keys = [(i.get("collectionGroup"), i.get("queryScope", "COLLECTION"), index_fields(i)) for i in indexes]
+
+    redundant = {}
+    for n, key in enumerate(keys):
+        if key in keys[:n]:
+            redundant[n] = f"duplicate of index #{keys.index(key)}"
+        elif len(key[2]) < 2:
+            redundant[n] = "one field; covered by the automatic single-field index"
+
+    used = set()
+    rows = []
+    missing = []
+    for shape, where in queries:
+        req = requirement(shape)
+        if req is None:
+            blocked = [(f, m, o) for f, m in single_fields(shape)
+                       for b, o in [override_blocks(overrides, shape.collection, shape.scope, f, m)] if b]
+            for f, m, o in blocked:
+                o.setdefault("indexes", []).append(
+                    {"order": "ASCENDING" if m == "ANY" else m, "queryScope": shape.scope}
+                    if m != "CONTAINS" else {"arrayConfig": m, "queryScope": shape.scope})
+            status = ("❌", "single-field index disabled by fieldOverrides: "
+                      + ", ".join(f"{f} {m}" for f, m, _ in blocked)) if blocked else ("✅", "single-field indexes")
+            rows.append((shape, where, *status))
+            continue
+        hits = [n for n, (c, s, fields) in enumerate(keys)
+                if c == shape.collection and s == shape.scope and n not in redundant and serves(fields, *req)]
+        if hits:
+            used.update(hits)
+            rows.append((shape, where, "✅", f"composite index #{hits[0]}"))
+            continue
+        proposed = to_index(shape.collection, shape.scope, *req)
+        if proposed not in missing:
+            missing.append(proposed)
+        fields = ", ".join(f"{f} {m}" for f, m in [*req[0], *req[1]])
+        rows.append((shape, where, "❌", f"missing composite index ({fields})"))
+
+    unused = {}
+    for n, (c, s, fields) in enumerate(keys):
+        if n in used or n in redundant:
+            continue
+        names = {f for f, _ in fields}
+        needs = [(shape, {f for f, _ in [*req[0], *req[1]]}) for shape, _ in queries
+                 if shape.collection == c and shape.scope == s for req in [requirement(shape)] if req]
+        wider = [shape for shape, need in needs if need < names]
+        narrower = [shape for shape, need in needs if names < need]
+        if wider:
+            unused[n] = f"over-wide; {wider[0].describe()} needs fewer fields"
+        elif narrower:
+            unused[n] = f"no query uses it; too narrow for {narrower[0].describe()}"
+        else:
+            unused[n] = "no query uses it"
+
+    kept = [i for n, i in enumerate(indexes) if n not in redundant and not (prune and n in unused)]
+    proposal = {"indexes": kept + missing, "fieldOverrides": overrides}
+    return rows, redundant, unused, proposal
+
+
+def print_report(rows, redundant, unused, indexes):
+    print("==== Queries ====")
+    for shape, where, mark, status in sorted(rows, key=lambda r: r[0].describe()):
+        print(f"{mark} {shape.describe()}")
+        print(f"    {status}")
+        for w in where:
+            print(f"    - {w}")
+
+    if redundant or unused:
+        print("\n==== Declared indexes ====")
+    for n, index in enumerate(indexes):
+        reason = redundant.get(n) or unused.get(n)
+        if reason:
+            fields = ", ".join(f"{f} {m}" for f, m in index_fields(index))
+            label = "redundant" if n in redundant else "unused"
+            print(f"⚠️ #{n} {index.get('collectionGroup')} ({fields}): {label}, {reason}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check firestore.indexes.json against the app's Firestore queries.")
+    parser.add_argument("--indexes", type=Path, default=INDEXES_PATH, help=f"declared indexes (default: {INDEXES_PATH})")
+    parser.add_argument("--out", type=Path, default=OUT_PATH, help=f"proposed indexes file (default: {OUT_PATH})")
+    parser.add_argument("--prune", action="store_true", help="leave unused and over-wide indexes out of the proposal")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not LIB_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {LIB_DIR} (run from repo root)")
+    declared = json.loads(args.indexes.read_text(encoding="utf-8")) if args.indexes.exists() else {}
+
+    queries = extract_queries(LIB_DIR)
+    rows, redundant, unused, proposal = plan(queries, declared, prune=args.prune)
+    missing = sum(1 for r in rows if r[2] == "❌")
+    print_report(rows, redundant, unused, declared.get("indexes", []))
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    write_json(args.out, proposal)
+    print(f"\n✅ Wrote {args.out}: {len(proposal['indexes'])} composite index(es) "
+          f"for {len(queries)} distinct query shape(s)")
+    if missing:
+        print(f"❌ {missing} query shape(s) have no usable index; deploy {args.out} before shipping them.")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -1,6 +1,12 @@
+import argparse
 import json
+import sys
 from pathlib import Path
 
+from content_io import read_bytes, write_json
+from content_manifest import Manifest, fingerprint
+from tool_profile import add_profile_args, run_main, section, start_profile
+
 # Update ONLY display names. Do NOT touch ids.
 RENAMES = {
   "hard_season_coping": "Handling Stress",
@@ -15,31 +21,51 @@ FILES = [
   Path("assets/config/assessments/marriage_health_check_v1.json"),
 ]
 
+def rename_dimensions(data):
+  changed = False
+  for d in data.get("dimensions", []):
+    did = d.get("id")
+    if did in RENAMES and d.get("name") != RENAMES[did]:
+      d["name"] = RENAMES[did]
+      changed = True
+  return changed
+
 def main():
+  parser = argparse.ArgumentParser(description="Apply display-name RENAMES to assessment dimensions.")
+  parser.add_argument("--no-cache", action="store_true", help="ignore the content manifest and reprocess every file")
+  add_profile_args(parser)
+  args = parser.parse_args()
+  start_profile(args)
+
+  manifest = Manifest(enabled=not args.no_cache)
+  key = fingerprint(sys.modules[__name__], params=RENAMES)
+
   changed = 0
   for fp in FILES:
     if not fp.exists():
       print(f"SKIP (missing): {fp}")
       continue
 
-    data = json.loads(fp.read_text(encoding="utf-8"))
-    dims = data.get("dimensions", [])
-    before = json.dumps(dims, sort_keys=True)
+    with section("read", file=fp.name):
+      raw = read_bytes(fp)
+    if manifest.lookup("rename", fp, raw, key):
+      print(f"NOCHANGE (cached): {fp}")
+      continue
 
-    for d in dims:
-      did = d.get("id")
-      if did in RENAMES:
-        d["name"] = RENAMES[did]
+    with section("file", file=fp.name):
+      data = json.loads(raw.decode("utf-8"))
+      digest = None
+      if rename_dimensions(data):
+        _, digest = write_json(fp, data)
+        print(f"UPDATED: {fp}")
+        changed += 1
+      else:
+        print(f"NOCHANGE: {fp}")
+    manifest.record("rename", fp, raw, key, output_digest=digest)
 
-    after = json.dumps(dims, sort_keys=True)
-    if before != after:
-      fp.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-      print(f"UPDATED: {fp}")
-      changed += 1
-    else:
-      print(f"NOCHANGE: {fp}")
+  manifest.save()
 
   print(f"\nDone. Updated {changed} file(s).")
 
 if __name__ == "__main__":
-  main()
+  run_main(main)
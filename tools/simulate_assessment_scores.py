@@ -0,0 +1,254 @@
+"""Simulate per-dimension assessment scores for threshold tuning.
+
+Scores follow AssessmentResult in lib/core/models/assessment_model.dart: a
+dimension's percentage is the sum of the chosen option weights over
+questions * AppConfig.maxScorePerQuestion, with questions matched to
+dimensions by name. AssessmentRecommendationService flags the three lowest
+dimensions as growth areas.
+
+For every dimension this prints the exact score distribution (per-question
+option probabilities convolved together), the share of respondents below
+each candidate cutoff, and how often the dimension lands among the three
+growth areas. A vectorized Monte Carlo run cross-checks the exact
+distribution: it reports the largest gap between the two CDFs, which should
+stay under the DKW bound for the sample size (MC_ALPHA). Sampled percentiles
+are not compared directly, since a CDF sitting exactly on 0.5 or 0.75 makes
+them jump a whole score bucket on sampling noise alone.
+
+    python3 tools/simulate_assessment_scores.py assets/config/assessments/singles_readiness_v1.json
+    python3 tools/simulate_assessment_scores.py FILE --respondents 5000000 --skew 0.5
+    python3 tools/simulate_assessment_scores.py FILE --tier-prior STRONG=4,DEVELOPING=3,GUARDED=2,AT_RISK=1
+
+Requires numpy (pip install numpy).
+"""
+import argparse
+import json
+import math
+from pathlib import Path
+
+from content_io import read_json
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_SCORE_PER_QUESTION = 3  # AppConfig.maxScorePerQuestion
+GROWTH_AREAS = 3  # AssessmentRecommendationService takes the lowest three
+PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_CUTOFFS = "0.25,0.50,0.75"  # AppConfig guarded/developing/strong thresholds
+CHUNK = 200_000
+MC_ALPHA = 1e-3  # chance that an exact-vs-sampled CDF gap exceeds the tolerance by noise alone
+
+
+def parse_tier_prior(spec):
+    prior = {}
+    for part in filter(None, (p.strip() for p in (spec or "").split(","))):
+        tier, _, value = part.partition("=")
+        try:
+            prior[tier.strip().upper()] = float(value)
+        except ValueError:
+            raise SystemExit(f"❌ Bad --tier-prior entry: {part!r} (expected TIER=number)")
+    return prior
+
+
+def option_probs(options, skew=0.0, tier_prior=None):
+    """Answer probabilities for one question: exp(skew * weight) * tier prior."""
+    raw = []
+    for opt in options:
+        p = math.exp(skew * opt["weight"])
+        if tier_prior:
+            p *= tier_prior.get((opt.get("signalTier") or "").upper(), 0.0)
+        raw.append(p)
+    total = sum(raw)
+    if total <= 0:
+        return [1 / len(options)] * len(options)
+    return [p / total for p in raw]
+
+
+def build_model(data, skew=0.0, tier_prior=None):
+    """Weight and probability matrices padded to the widest question.
+
+    Returns (dims, W, P, member) where W/P are questions x options, member
+    is questions x dimensions (one-hot), and dims lists (id, name, count).
+    """
+    by_name = {(d.get("name") or "").strip().lower(): d for d in data.get("dimensions", [])}
+    questions = []
+    for q in data.get("questions", []):
+        dim = by_name.get((q.get("dimension") or "").strip().lower())
+        options = [o for o in q.get("options", []) if isinstance(o.get("weight"), (int, float))]
+        if dim is not None and options:
+            questions.append((dim["id"], options))
+
+    dim_ids = list(dict.fromkeys(d["id"] for d in data.get("dimensions", [])))
+    dim_ids = [d for d in dim_ids if any(qd == d for qd, _ in questions)]
+    col = {d: i for i, d in enumerate(dim_ids)}
+    width = max((len(opts) for _, opts in questions), default=1)
+
+    W = np.zeros((len(questions), width), dtype=np.int64)
+    P = np.zeros((len(questions), width))
+    member = np.zeros((len(questions), len(dim_ids)), dtype=np.int64)
+    for qi, (dim_id, options) in enumerate(questions):
+        W[qi, :len(options)] = [o["weight"] for o in options]
+        P[qi, :len(options)] = option_probs(options, skew, tier_prior)
+        member[qi, col[dim_id]] = 1
+
+    names = {d["id"]: d.get("name") or d["id"] for d in data.get("dimensions", [])}
+    dims = [(d, names[d], int(member[:, i].sum())) for i, d in enumerate(dim_ids)]
+    return dims, W, P, member
+
+
+def exact_pmfs(W, P, member):
+    """Per-dimension pmf over total score, one convolution per question."""
+    pmfs = []
+    for d in range(member.shape[1]):
+        pmf = np.ones(1)
+        for qi in np.flatnonzero(member[:, d]):
+            q = np.zeros(int(W[qi].max()) + 1)
+            np.add.at(q, W[qi], P[qi])
+            pmf = np.convolve(pmf, q)
+        pmfs.append(pmf)
+    return pmfs
+
+
+def monte_carlo(W, P, member, respondents, seed=0):
+    """Score histograms per dimension and growth-area counts.
+
+    Respondents are drawn in chunks: answers come from one uniform draw per
+    question against the cumulative option probabilities, so each chunk is a
+    handful of array operations regardless of its size.
+    """
+    rng = np.random.default_rng(seed)
+    n_q, n_d = member.shape
+    max_totals = member.T @ np.full(n_q, MAX_SCORE_PER_QUESTION)
+    hists = [np.zeros(int(W[member[:, d] == 1].max(axis=1).sum()) + 1, dtype=np.int64) for d in range(n_d)]
+    flagged = np.zeros(n_d, dtype=np.int64)
+    cdf = np.cumsum(P, axis=1)
+    # Padding after a question's last option must never be drawn, even when
+    # the cumulative sum falls a rounding error short of 1.
+    last = np.array([np.flatnonzero(row).max() if row.any() else 0 for row in P])
+    cdf[np.arange(cdf.shape[1])[None, :] >= last[:, None]] = 1.0
+    rows = np.arange(n_q)
+
+    done = 0
+    while done < respondents:
+        n = min(CHUNK, respondents - done)
+        u = rng.random((n, n_q))
+        choice = (u[:, :, None] > cdf[None, :, :]).sum(axis=2)
+        totals = W[rows, choice] @ member
+        for d in range(n_d):
+            hists[d] += np.bincount(totals[:, d], minlength=len(hists[d]))[:len(hists[d])]
+        pct = totals / np.maximum(max_totals, 1)
+        lowest = np.argsort(pct, axis=1, kind="stable")[:, :GROWTH_AREAS]
+        flagged += np.bincount(lowest.ravel(), minlength=n_d)
+        done += n
+    return [h / respondents for h in hists], flagged / respondents
+
+
+def percentile(pmf, q):
+    return int(np.searchsorted(np.cumsum(pmf), q / 100 - 1e-12))
+
+
+def cdf_distance(a, b):
+    """Largest absolute gap between the CDFs of two PMFs over the same scores."""
+    return float(np.abs(np.cumsum(a) - np.cumsum(b)).max())
+
+
+def cdf_tolerance(respondents):
+    """DKW bound: P(max CDF gap > eps) <= 2 exp(-2 n eps^2) = MC_ALPHA."""
+    return math.sqrt(math.log(2 / MC_ALPHA) / (2 * respondents))
+
+
+def share_below(pmf, max_total, cutoff):
+    scores = np.arange(len(pmf))
+    return float(pmf[scores / max(max_total, 1) < cutoff].sum())
+
+
+def simulate(data, respondents, cutoffs, skew=0.0, tier_prior=None, seed=0):
+    dims, W, P, member = build_model(data, skew, tier_prior)
+    exact = exact_pmfs(W, P, member)
+    sampled, flagged = monte_carlo(W, P, member, respondents, seed) if respondents else (exact, None)
+    out = []
+    for d, (dim_id, name, count) in enumerate(dims):
+        max_total = count * MAX_SCORE_PER_QUESTION
+        out.append({
+            "dimension": dim_id,
+            "name": name,
+            "questions": count,
+            "maxScore": max_total,
+            "mean": float(np.arange(len(exact[d])) @ exact[d]) / max_total,
+            "exactPercentiles": {p: percentile(exact[d], p) / max_total for p in PERCENTILES},
+            "sampledCdfDistance": None if flagged is None else cdf_distance(sampled[d], exact[d]),
+            "belowCutoff": {c: share_below(exact[d], max_total, c) for c in cutoffs},
+            "growthAreaShare": None if flagged is None else float(flagged[d]),
+        })
+    return out
+
+
+def print_report(path, rows, cutoffs, respondents):
+    """Print the table; returns the dimensions whose sample strays past the tolerance."""
+    print(f"\n==== {path} ({respondents:,} simulated respondents) ====")
+    tolerance = cdf_tolerance(respondents) if respondents else None
+    off = []
+    head = "  ".join(f"p{p:<4}" for p in PERCENTILES)
+    cuts = "  ".join(f"<{c:<5.2f}" for c in cutoffs)
+    print(f"{'dimension':38} {'q':>2}  {head}   {cuts}  growth")
+    for r in rows:
+        exact = "  ".join(f"{r['exactPercentiles'][p]:5.2f}" for p in PERCENTILES)
+        below = "  ".join(f"{r['belowCutoff'][c]:6.1%}" for c in cutoffs)
+        growth = "-" if r["growthAreaShare"] is None else f"{r['growthAreaShare']:6.1%}"
+        print(f"{r['name'][:38]:38} {r['questions']:>2}  {exact}   {below}  {growth}")
+        if tolerance is None:
+            continue
+        gap = r["sampledCdfDistance"]
+        if gap > tolerance:
+            off.append(r["name"])
+        mark = "✅" if gap <= tolerance else "⚠️"
+        print(f"{'  (monte carlo)':38} {'':>2}  max |CDF gap| {gap:.4f} (tolerance {tolerance:.4f}) {mark}")
+    return off
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate assessment dimension scores for threshold tuning.")
+    parser.add_argument("paths", nargs="+", type=Path, help="assessment JSON files")
+    parser.add_argument("--respondents", type=int, default=1_000_000, help="Monte Carlo respondents (0 = exact only)")
+    parser.add_argument("--cutoffs", default=DEFAULT_CUTOFFS, help=f"growth-area cutoffs (default: {DEFAULT_CUTOFFS})")
+    parser.add_argument("--skew", type=float, default=0.0,
+                        help="answer prior exp(skew * weight); 0 = uniform, >0 favours high weights")
+    parser.add_argument("--tier-prior", help="relative answer odds per signalTier, e.g. STRONG=4,AT_RISK=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the results to this JSON file")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if np is None:
+        raise SystemExit("❌ numpy is required for the simulator: pip install numpy")
+    try:
+        cutoffs = [float(c) for c in args.cutoffs.split(",") if c.strip()]
+    except ValueError:
+        raise SystemExit(f"❌ Bad --cutoffs: {args.cutoffs!r}")
+    tier_prior = parse_tier_prior(args.tier_prior)
+
+    results = {}
+    for path in args.paths:
+        if not path.exists():
+            print(f"❌ Missing file: {path}")
+            continue
+        with section("file", file=str(path), respondents=args.respondents):
+            data = read_json(path)
+            rows = simulate(data, args.respondents, cutoffs, args.skew, tier_prior, args.seed)
+        off = print_report(path, rows, cutoffs, args.respondents)
+        if off:
+            print(f"⚠️  Monte Carlo disagrees with the exact distribution for: {', '.join(off)}")
+        results[str(path)] = rows
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\n✅ Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    run_main(main)
@@ -0,0 +1,411 @@
+"""Replay the app's Firestore queries against synthetic data and count reads.
+
+Generates seeded users, chats and messages, then runs every users/chats/
+messages query the app issues through a small in-memory engine with
+Firestore's semantics:
+
+    - equality / array-contains / range filters, orderBy, limit, startAfter
+      paging (modelled as an offset into the index range)
+    - a query needs an index from firestore.indexes.json (same rules as
+      tools/plan_firestore_indexes.py); without one it fails, and queries
+      the app retries without orderBy (searchUsers) replay their fallback
+    - documents missing an orderBy/filter field are not in the index and
+      never returned
+    - one billed read per returned document (minimum one per query)
+
+For each query it reports documents read and documents the app keeps
+after its client-side `.where((user) {...})` filtering, per page, and for
+the search queries how many reads it takes to show --target profiles.
+
+    python3 tools/simulate_firestore_reads.py [--sizes 10k,100k,1M] [--viewers 200] [--target 20]
+                                              [--indexes firestore.indexes.json] [--json out.json]
+
+APP_QUERIES mirrors the Dart call sites; shapes found in lib/ that it
+does not model are listed so the two stay in step.
+"""
+import argparse
+import json
+import random
+import statistics
+from pathlib import Path
+
+import plan_firestore_indexes as planner
+from content_io import read_json, write_json
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+CHURCHES = Path("assets/config/onboarding/churches_v1.json")
+LISTS = Path("assets/config/onboarding/nexus1_onboarding_lists_v1.json")
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+MESSAGE_CHATS = 2_000
+NOW_MS = 1_790_000_000_000
+DAY_MS = 86_400_000
+
+COUNTRIES = ["Nigeria", "United Kingdom", "United States", "Canada", "Ghana", "South Africa", "Germany", "Ireland"]
+COUNTRY_WEIGHTS = [70, 9, 8, 4, 4, 2, 2, 1]
+EDUCATION = ["Primary School", "Secondary / High School", "Undergraduate Degree", "Postgraduate Degree",
+             "Doctorate Degree (Phd.)"]
+EDUCATION_WEIGHTS = [2, 18, 50, 25, 5]
+LEGACY_GENDER_SHARE = 0.1    # Nexus 1.0 profiles store "Male"/"Female"
+PHOTO_SHARE = 0.7
+COMPLETION_SHARE = 0.85      # profiles with profileCompletionDate set
+AGE_MISSING_SHARE = 0.05
+ACTIVE_CHAT_SHARE = 0.9
+
+
+class Collection:
+    """Column store: field -> list of values (None = field not set)."""
+
+    def __init__(self, name, n, columns, parent=None):
+        self.name = name
+        self.n = n
+        self.columns = columns
+        self.parent = parent
+        self.indexes = {}
+
+
+def generate(n_users, seed=0):
+    rng = random.Random(seed)
+    churches = read_json(CHURCHES).get("churches", []) if CHURCHES.exists() else []
+    churches = churches or [f"Church {i}" for i in range(300)]
+    lists = read_json(LISTS).get("lists", {}) if LISTS.exists() else {}
+    education = lists.get("educationalLevels") or EDUCATION
+    weights = EDUCATION_WEIGHTS if len(education) == len(EDUCATION_WEIGHTS) else None
+
+    def maybe(values, share):
+        return [v if rng.random() < share else None for v in values]
+
+    gender = [g.capitalize() if rng.random() < LEGACY_GENDER_SHARE else g
+              for g in rng.choices(["male", "female"], k=n_users)]
+    users = Collection("users", n_users, {
+        "gender": gender,
+        "age": maybe([21 + int(rng.betavariate(2, 5) * 50) for _ in range(n_users)], 1 - AGE_MISSING_SHARE),
+        "profileCompletionDate": maybe([NOW_MS - int(rng.expovariate(1 / 200) * DAY_MS) for _ in range(n_users)],
+                                       COMPLETION_SHARE),
+        "hasPhoto": [rng.random() < PHOTO_SHARE for _ in range(n_users)],
+        "country": rng.choices(COUNTRIES, COUNTRY_WEIGHTS, k=n_users),
+        "educationLevel": rng.choices(education, weights, k=n_users),
+        "churchName": rng.choices(churches, k=n_users),
+    })
+
+    n_chats = n_users // 2
+    pairs = []
+    while len(pairs) < n_chats:
+        a, b = rng.randrange(n_users), rng.randrange(n_users)
+        if a != b:
+            pairs.append((a, b) if a < b else (b, a))
+    chats = Collection("chats", n_chats, {
+        "participantIds": pairs,
+        "participants": [None] * n_chats,        # legacy field name used by chat_provider.dart
+        "isActive": [rng.random() < ACTIVE_CHAT_SHARE for _ in range(n_chats)],
+        "lastMessageAt": [NOW_MS - int(rng.expovariate(1 / 30) * DAY_MS) for _ in range(n_chats)],
+        "lastMessageTime": [None] * n_chats,
+    })
+
+    parent, sent, receiver, is_read = [], [], [], []
+    for chat in range(min(MESSAGE_CHATS, n_chats)):
+        count = min(2_000, int(rng.expovariate(1 / 40)) + 1)
+        unread = int(rng.expovariate(1 / 3))
+        for m in range(count):
+            parent.append(chat)
+            sent.append(chats.columns["lastMessageAt"][chat] - (count - m) * 60_000)
+            receiver.append(pairs[chat][m % 2])
+            is_read.append(m < count - unread)
+    messages = Collection("messages", len(parent), {
+        "sentAt": sent,
+        "receiverId": receiver,
+        "isRead": is_read,
+    }, parent=parent)
+    return {"users": users, "chats": chats, "messages": messages}
+
+
+def _build_index(coll, eq_fields, array_field, orders):
+    """(eq values...) -> doc ids in index order; docs missing a field are left out."""
+    cols = coll.columns
+    eq_cols = [coll.parent if f == "__parent__" else cols[f] for f in eq_fields]
+    arr_col = cols[array_field] if array_field else None
+    order_cols = [cols[f] for f, _ in orders]
+    groups = {}
+    for i in range(coll.n):
+        key = tuple(c[i] for c in eq_cols)
+        if None in key or any(c[i] is None for c in order_cols):
+            continue
+        if arr_col is None:
+            groups.setdefault(key, []).append(i)
+        elif arr_col[i] is not None:
+            for v in dict.fromkeys(arr_col[i]):
+                groups.setdefault((*key, v), []).append(i)
+    for ids in groups.values():
+        for col, (_, direction) in zip(reversed(order_cols), reversed(orders)):
+            ids.sort(key=col.__getitem__, reverse=direction == "DESCENDING")
+    return groups
+
+
+class Query:
+    """One app query: filters are (field, where() operator, binder(ctx))."""
+
+    def __init__(self, name, collection, filters=(), orders=(), limit=None, keep=None, take=None,
+                 fallback=None, viewer="user", sub=False):
+        self.name = name
+        self.collection = collection
+        self.filters = list(filters)
+        self.orders = list(orders)
+        self.limit = limit
+        self.keep = keep
+        self.take = take
+        self.fallback = fallback
+        self.viewer = viewer
+        self.sub = sub
+
+    def shape(self):
+        shape = planner.Shape(self.collection)
+        shape.filters = [(f, op) for f, op, _ in self.filters]
+        shape.orders = list(self.orders)
+        shape.limit = self.limit is not None
+        return shape
+
+    def run(self, coll, ctx, offset=0):
+        """Returns (doc ids of one page, index entries scanned)."""
+        eq = [(f, b(ctx)) for f, op, b in self.filters if planner.OPS[op][1] == "eq"]
+        arr = [(f, b(ctx)) for f, op, b in self.filters if planner.OPS[op][1] == "array"]
+        rng = [(f, op, b(ctx)) for f, op, b in self.filters if planner.OPS[op][1] == "range"]
+        if self.sub:
+            eq.insert(0, ("__parent__", ctx["chat"]))
+        array_field = arr[0][0] if arr else None
+        key = (tuple(f for f, _ in eq), array_field, tuple(self.orders))
+        if key not in coll.indexes:
+            coll.indexes[key] = _build_index(coll, list(key[0]), array_field, self.orders)
+        group = coll.indexes[key].get(tuple(v for _, v in eq) + tuple(v for _, v in arr[:1]), [])
+
+        page, scanned = [], 0
+        skipped = 0
+        for i in group:
+            scanned += 1
+            if any(not _compare(coll.columns[f][i], op, v) for f, op, v in rng):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            page.append(i)
+            if self.limit is not None and len(page) >= self.limit:
+                break
+        return page, scanned
+
+
+def _compare(value, op, bound):
+    if value is None:
+        return False
+    return {
+        "isLessThan": value < bound,
+        "isLessThanOrEqualTo": value <= bound,
+        "isGreaterThan": value > bound,
+        "isGreaterThanOrEqualTo": value >= bound,
+        "isNotEqualTo": value != bound,
+        "whereNotIn": value not in bound,
+    }[op]
+
+
+def index_problem(shape, declared):
+    """None if Firestore can serve `shape` with `declared`, else the reason."""
+    overrides = declared.get("fieldOverrides", [])
+    req = planner.requirement(shape)
+    if req is None:
+        blocked = [f for f, m in planner.single_fields(shape)
+                   if planner.override_blocks(overrides, shape.collection, shape.scope, f, m)[0]]
+        return f"single-field index disabled for {', '.join(blocked)}" if blocked else None
+    for index in declared.get("indexes", []):
+        if (index.get("collectionGroup") == shape.collection
+                and index.get("queryScope", "COLLECTION") == shape.scope
+                and planner.serves(planner.index_fields(index), *req)):
+            return None
+    return "missing composite index"
+
+
+def _opposite_gender(ctx):
+    # search_provider.dart _getOppositeGender keeps the viewer's casing.
+    g = ctx["gender"]
+    return {"male": "female", "female": "male", "Male": "Female", "Female": "Male"}[g]
+
+
+def _search_keep(min_age=21, max_age=60, same_country=False):
+    def keep(users, ctx):
+        cols = users.columns
+        viewer = ctx["user"]
+        country = cols["country"][viewer] if same_country else None
+
+        def ok(i):
+            if i == viewer or not cols["hasPhoto"][i]:
+                return False
+            age = cols["age"][i]
+            if age is not None and not min_age <= age <= max_age:
+                return False
+            return country is None or cols["country"][i] == country
+        return ok
+    return keep
+
+
+def _recommended_keep(users, ctx):
+    return lambda i: i != ctx["user"] and users.columns["hasPhoto"][i]
+
+
+_GENDER = ("gender", "isEqualTo", _opposite_gender)
+_NEWEST = [("profileCompletionDate", "DESCENDING")]
+
+APP_QUERIES = [
+    # lib/core/providers/search_provider.dart
+    Query("searchUsers", "users", [_GENDER], _NEWEST, limit=100, keep=_search_keep(), fallback="searchUsers fallback"),
+    Query("searchUsers +country", "users", [_GENDER], _NEWEST, limit=100, keep=_search_keep(same_country=True),
+          fallback="searchUsers fallback +country"),
+    Query("searchUsers fallback", "users", [_GENDER], limit=100, keep=_search_keep()),
+    Query("searchUsers fallback +country", "users", [_GENDER], limit=100, keep=_search_keep(same_country=True)),
+    Query("getRecommendedProfiles", "users", [_GENDER], _NEWEST, limit=20, keep=_recommended_keep, take=10),
+    # lib/core/services/chat_service.dart
+    Query("getConversationBetween", "chats", [("participantIds", "isEqualTo", lambda c: c["pair"])], limit=1,
+          viewer="chat"),
+    Query("getUserConversations", "chats",
+          [("participantIds", "arrayContains", lambda c: c["user"]), ("isActive", "isEqualTo", lambda c: True)],
+          [("lastMessageAt", "DESCENDING")], viewer="chat"),
+    Query("getMessages", "messages", orders=[("sentAt", "DESCENDING")], limit=50, viewer="chat", sub=True),
+    Query("markMessagesAsRead", "messages",
+          [("receiverId", "isEqualTo", lambda c: c["user"]), ("isRead", "isEqualTo", lambda c: False)],
+          viewer="chat", sub=True),
+    # lib/core/services/subscription_service.dart
+    Query("subscription chats", "chats", [("participantIds", "arrayContains", lambda c: c["user"])], viewer="chat"),
+    # lib/core/providers/chat_provider.dart (legacy participants/lastMessageTime fields)
+    Query("chat_provider chats", "chats", [("participants", "arrayContains", lambda c: c["user"])],
+          [("lastMessageTime", "DESCENDING")], viewer="chat"),
+    Query("chat_provider chat ids", "chats", [("participants", "arrayContains", lambda c: c["user"])], viewer="chat"),
+    Query("chat_provider unread", "messages", [("isRead", "isEqualTo", lambda c: False)], viewer="chat", sub=True),
+]
+BY_NAME = {q.name: q for q in APP_QUERIES}
+
+
+def coverage(lib_dir, collections):
+    """Shapes in lib/ on the simulated collections that APP_QUERIES does not model."""
+    def sig(shape):
+        return shape.collection, tuple(shape.filters), tuple(shape.orders), shape.limit
+    modelled = {sig(q.shape()) for q in APP_QUERIES}
+    return [(shape, where) for shape, where in planner.extract_queries(lib_dir)
+            if shape.collection in collections and sig(shape) not in modelled]
+
+
+def viewers(data, kind, count, rng):
+    users, chats = data["users"], data["chats"]
+    out = []
+    for _ in range(count):
+        if kind == "user":
+            u = rng.randrange(users.n)
+            out.append({"user": u, "gender": users.columns["gender"][u]})
+        else:
+            chat = rng.randrange(min(MESSAGE_CHATS, chats.n))
+            pair = chats.columns["participantIds"][chat]
+            u = pair[rng.randrange(2)]
+            out.append({"user": u, "gender": users.columns["gender"][u], "chat": chat, "pair": pair})
+    return out
+
+
+def replay(query, data, ctxs, declared, target):
+    problem = index_problem(query.shape(), declared)
+    if problem:
+        fallback = BY_NAME.get(query.fallback)
+        return {"query": query.name, "fails": problem, "fallback": fallback.name if fallback else None}
+
+    coll = data[query.collection]
+    reads, kept, scanned, fill = [], [], [], []
+    for ctx in ctxs:
+        page, n_scanned = query.run(coll, ctx)
+        keep = query.keep(data["users"], ctx) if query.keep else None
+        n_kept = sum(1 for i in page if keep(i)) if keep else len(page)
+        if query.take is not None:
+            n_kept = min(n_kept, query.take)
+        reads.append(max(1, len(page)))
+        kept.append(n_kept)
+        scanned.append(n_scanned)
+        if keep and query.limit and query.take is None:
+            # Page with startAfter until `target` profiles survive the client filter.
+            total_read, total_kept, offset = 0, 0, 0
+            while total_kept < target:
+                page, _ = query.run(coll, ctx, offset)
+                total_read += max(1, len(page))
+                total_kept += sum(1 for i in page if keep(i))
+                offset += len(page)
+                if len(page) < query.limit:
+                    break
+            fill.append(total_read if total_kept >= target else None)
+
+    row = {
+        "query": query.name,
+        "readsPerPage": statistics.fmean(reads),
+        "p95Reads": sorted(reads)[int(0.95 * (len(reads) - 1))],
+        "keptPerPage": statistics.fmean(kept),
+        "keptShare": sum(kept) / max(sum(reads), 1),
+        "indexEntriesScanned": statistics.fmean(scanned),
+    }
+    if fill:
+        done = [f for f in fill if f is not None]
+        row["readsToFillTarget"] = statistics.fmean(done) if done else None
+        row["targetUnreachable"] = len(fill) - len(done)
+    return row
+
+
+def print_rows(label, rows, target):
+    print(f"\n==== {label} ====")
+    print(f"{'query':32} {'reads/page':>10} {'p95':>6} {'kept/page':>9} {'kept %':>7} {f'reads for {target}':>13}")
+    for r in rows:
+        if "fails" in r:
+            then = f"; app falls back to {r['fallback']}" if r["fallback"] else "; the app gets an error"
+            print(f"{r['query']:32} ❌ fails: {r['fails']}{then}")
+            continue
+        fill = r.get("readsToFillTarget")
+        fill_text = "" if "readsToFillTarget" not in r else ("never" if fill is None else f"{fill:,.0f}")
+        if r.get("targetUnreachable"):
+            fill_text += f" ({r['targetUnreachable']} never)"
+        print(f"{r['query']:32} {r['readsPerPage']:>10,.1f} {r['p95Reads']:>6,} {r['keptPerPage']:>9,.1f} "
+              f"{r['keptShare']:>7.0%} {fill_text:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count Firestore reads per app query shape on synthetic data.")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"comma-separated user counts ({','.join(SIZES)})")
+    parser.add_argument("--viewers", type=int, default=200, help="sampled viewers per query (default: 200)")
+    parser.add_argument("--target", type=int, default=20, help="profiles a search screen wants to show (default: 20)")
+    parser.add_argument("--indexes", type=Path, default=planner.INDEXES_PATH,
+                        help=f"indexes file to serve queries with (default: {planner.INDEXES_PATH})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the results to this JSON file")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        raise SystemExit(f"❌ Unknown size(s): {', '.join(unknown)} (known: {', '.join(SIZES)})")
+    declared = json.loads(args.indexes.read_text(encoding="utf-8")) if args.indexes.exists() else {}
+
+    if planner.LIB_DIR.exists():
+        for shape, where in coverage(planner.LIB_DIR, {"users", "chats", "messages"}):
+            print(f"⚠️ Not modelled: {shape.describe()} ({', '.join(where)})")
+
+    results = {}
+    for size in sizes:
+        with section("generate", size=size):
+            data = generate(SIZES[size], args.seed)
+        rng = random.Random(args.seed)
+        rows = []
+        for query in APP_QUERIES:
+            with section("replay", size=size, query=query.name):
+                ctxs = viewers(data, query.viewer, args.viewers, rng)
+                rows.append(replay(query, data, ctxs, declared, args.target))
+        label = (f"{data['users'].n:,} users, {data['chats'].n:,} chats, "
+                 f"{data['messages'].n:,} messages in {min(MESSAGE_CHATS, data['chats'].n):,} chats")
+        print_rows(label, rows, args.target)
+        results[size] = rows
+
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        replaced, _ = write_json(args.json, results)
+        print(f"\n✅ {'Wrote' if replaced else 'Unchanged'}: {args.json}")
+
+
+if __name__ == "__main__":
+    run_main(main)
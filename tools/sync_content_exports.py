@@ -0,0 +1,350 @@
+"""Detect and sync drift between the full exports in assets/data and assets/config.
+
+Every export under EXPORT_DIR is paired with the assets/config file of the
+same name with dots folded to underscores
+(journeys_married.v2.parenting.json -> journeys_married_v2_parenting.json,
+assessments/singles_readiness.v1.json -> singles_readiness_v1.json).
+
+Each document is reduced to a hash tree: one hash per field, and one node
+per product, session, question and dimension (matched by id, not position),
+so two copies compare root-first and only differing subtrees are descended.
+Key order does not count as drift. Trees are cached in the content manifest
+by file digest, so an unchanged pair costs two sha256s and no parse.
+
+    python3 tools/sync_content_exports.py status
+    python3 tools/sync_content_exports.py sync --from config [--path 'questions[3]'] [--dry-run] [names...]
+
+`status` exits 1 on drift and lists the export copies that are identical to
+the config the app loads, which should be dropped from the asset bundle.
+`sync` copies only the differing subtrees from one side to the other;
+--path limits it to paths starting with the given prefixes.
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from content_io import read_bytes, read_json, write_json
+from content_manifest import Manifest, fingerprint
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+EXPORT_DIR = Path("assets/data/Nexus_2_0_JSON_Config_Full_Exports 2")
+CONFIG_DIR = Path("assets/config")
+# pubspec.yaml is the minimal simulator build; the app's assets are declared in pubspec.full.yaml.
+PUBSPECS = (Path("pubspec.yaml"), Path("pubspec.full.yaml"))
+HASH_LEN = 16
+
+# Lists of objects that are matched by id instead of by position.
+ITEM_KEYS = {
+    "products": ("productId", "id"),
+    "sessions": ("sessionId", "sessionNumber"),
+    "questions": ("id", "number"),
+    "dimensions": ("id",),
+}
+
+DIFFERS = "differs"
+EXPORT_ONLY = "only in export"
+CONFIG_ONLY = "only in config"
+ORDER = "order differs"
+
+
+def _digest(value) -> str:
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_LEN]
+
+
+def _is_items(key, value):
+    return key in ITEM_KEYS and isinstance(value, list) and all(isinstance(v, dict) for v in value)
+
+
+def item_keys(key, items):
+    """Stable identity for each item: its id field, else its position."""
+    seen = Counter()
+    out = []
+    for i, item in enumerate(items):
+        ident = next((str(item[f]) for f in ITEM_KEYS[key] if item.get(f) not in (None, "")), f"#{i}")
+        seen[ident] += 1
+        out.append(ident if seen[ident] == 1 else f"{ident}~{seen[ident]}")
+    return out
+
+
+def tree(node):
+    fields, lists = {}, {}
+    for k, v in node.items():
+        if _is_items(k, v):
+            lists[k] = [[ident, tree(item)] for ident, item in zip(item_keys(k, v), v)]
+        else:
+            fields[k] = _digest(v)
+    shape = {"f": fields, "l": {k: [[ident, child["h"]] for ident, child in v] for k, v in lists.items()}}
+    return {"h": _digest(shape), "f": fields, "l": lists}
+
+
+def _diff_items(export_items, config_items, path):
+    ex, cf = dict(export_items), dict(config_items)
+    for ident, child in export_items:
+        step = path + ((path[-1], ident),)
+        if ident in cf:
+            yield from diff(child, cf[ident], step)
+        else:
+            yield step, EXPORT_ONLY
+    for ident, _ in config_items:
+        if ident not in ex:
+            yield path + ((path[-1], ident),), CONFIG_ONLY
+    if [i for i, _ in export_items if i in cf] != [i for i, _ in config_items if i in ex]:
+        yield path, ORDER
+
+
+def diff(export_tree, config_tree, path=()):
+    """Yield (path, what) for every subtree where the two hash trees differ."""
+    if export_tree["h"] == config_tree["h"]:
+        return
+    ef, cf = export_tree["f"], config_tree["f"]
+    el, cl = export_tree["l"], config_tree["l"]
+    for k in sorted(set(ef) | set(cf) | set(el) | set(cl)):
+        step = path + (k,)
+        if k not in ef and k not in el:
+            yield step, CONFIG_ONLY
+        elif k not in cf and k not in cl:
+            yield step, EXPORT_ONLY
+        elif k in el and k in cl:
+            yield from _diff_items(el[k], cl[k], step)
+        elif ef.get(k) is None or ef.get(k) != cf.get(k):
+            yield step, DIFFERS
+
+
+def format_path(path):
+    out = ""
+    for seg in path:
+        out += f"[{seg[1]}]" if isinstance(seg, tuple) else (f".{seg}" if out else seg)
+    return out
+
+
+def _child(node, seg):
+    if isinstance(seg, tuple):
+        keys = item_keys(seg[0], node) if isinstance(node, list) else []
+        return node[keys.index(seg[1])] if seg[1] in keys else None
+    return node.get(seg) if isinstance(node, dict) else None
+
+
+def _parent(doc, path):
+    node = doc
+    for seg in path[:-1]:
+        node = _child(node, seg)
+        if node is None:
+            return None
+    return node
+
+
+def apply(src, dst, path, what):
+    """Make `dst` match `src` at `path`; returns False if an enclosing subtree is missing."""
+    seg = path[-1]
+    sp, dp = _parent(src, path), _parent(dst, path)
+    if dp is None:
+        return False
+    if what == ORDER:
+        if sp is None:
+            return False
+        src_keys = item_keys(seg, sp[seg])
+        rank = {ident: n for n, ident in enumerate(src_keys)}
+        pairs = zip(item_keys(seg, dp[seg]), dp[seg])
+        dp[seg] = [item for _, item in sorted(pairs, key=lambda p: rank.get(p[0], len(rank)))]
+        return True
+    if not isinstance(seg, tuple):
+        if sp is not None and seg in sp:
+            dp[seg] = sp[seg]
+        else:
+            dp.pop(seg, None)
+        return True
+
+    listkey, ident = seg
+    dst_keys = item_keys(listkey, dp)
+    item = _child(sp, seg) if sp is not None else None
+    if item is None:
+        if ident in dst_keys:
+            del dp[dst_keys.index(ident)]
+        return True
+    if ident in dst_keys:
+        dp[dst_keys.index(ident)] = item
+        return True
+    src_keys = item_keys(listkey, sp)
+    before = [k for k in src_keys[:src_keys.index(ident)] if k in dst_keys]
+    dp.insert(dst_keys.index(before[-1]) + 1 if before else 0, item)
+    return True
+
+
+def config_name(export_path: Path) -> str:
+    return export_path.stem.replace(".", "_") + ".json"
+
+
+def pairs(names=None):
+    configs = {}
+    for path in sorted(CONFIG_DIR.rglob("*.json")):
+        configs.setdefault(path.name, path)
+    out = []
+    for export in sorted(EXPORT_DIR.rglob("*.json")):
+        config = configs.get(config_name(export))
+        if names and not ({export.name, config_name(export)} & set(names)):
+            continue
+        out.append((export, config))
+    return out
+
+
+def bundled_assets():
+    """Entries of the `assets:` lists in PUBSPECS, in first-seen order."""
+    entries, indent = [], None
+    for pubspec in PUBSPECS:
+        if not pubspec.exists():
+            continue
+        for line in pubspec.read_text(encoding="utf-8").splitlines():
+            stripped = line.strip()
+            if re.match(r"^\s+assets:\s*$", line):
+                indent = len(line) - len(line.lstrip())
+            elif indent is not None and stripped and not stripped.startswith("#"):
+                if stripped.startswith("- ") and len(line) - len(line.lstrip()) > indent:
+                    entries.append(stripped[2:].strip().strip("'\""))
+                else:
+                    indent = None
+        indent = None
+    return list(dict.fromkeys(entries))
+
+
+def in_bundle(path: Path, entries):
+    p = path.as_posix()
+    return any(p == e or (e.endswith("/") and p.startswith(e)) for e in entries)
+
+
+class Trees:
+    """Hash trees by file digest, cached in the content manifest."""
+
+    def __init__(self, enabled=True):
+        self.manifest = Manifest(enabled=enabled)
+        self.key = fingerprint(sys.modules[__name__], params={"hashLen": HASH_LEN, "items": ITEM_KEYS})
+        self.hashed = 0
+
+    def get(self, path: Path):
+        with section("read", file=str(path)):
+            raw = read_bytes(path)
+        entry = self.manifest.lookup("sync_exports", path, raw, self.key)
+        if entry and entry.get("result"):
+            return entry["result"]
+        self.hashed += 1
+        with section("hash", file=str(path)):
+            result = tree(json.loads(raw.decode("utf-8")))
+        self.manifest.record("sync_exports", path, raw, self.key, result=result)
+        return result
+
+
+def compare(trees, export, config):
+    if config is None:
+        return None
+    return list(diff(trees.get(export), trees.get(config)))
+
+
+def status(args, trees):
+    start = time.perf_counter()
+    results = [(export, config, compare(trees, export, config)) for export, config in pairs(args.names)]
+    elapsed = (time.perf_counter() - start) * 1000
+    trees.manifest.save()
+
+    bundle = bundled_assets()
+    drifted, duplicates = 0, []
+    for export, config, diffs in results:
+        if config is None:
+            print(f"⚠️  {export}: no assets/config counterpart named {config_name(export)}")
+            continue
+        if not diffs:
+            duplicates.append((export, config))
+            continue
+        drifted += 1
+        print(f"\n❌ {export}\n   vs {config}: {len(diffs)} differing subtree(s)")
+        for path, what in diffs[:args.limit]:
+            print(f"     {format_path(path)}: {what}")
+        if len(diffs) > args.limit:
+            print(f"     ... {len(diffs) - args.limit} more (--limit)")
+
+    if duplicates:
+        print("\nDuplicates of the config the app loads:")
+        for export, config in duplicates:
+            state = "bundled; drop it from the pubspec assets" if in_bundle(export, bundle) else "not bundled"
+            print(f"  {export}  ==  {config}  ({state})")
+
+    print(f"\nCompared {len(results)} pair(s) in {elapsed:.1f} ms ({trees.hashed} file(s) hashed, rest cached)")
+    if drifted:
+        raise SystemExit(f"❌ {drifted} pair(s) drifted; reconcile with: sync --from config|export")
+    print("✅ Exports and configs are in sync")
+
+
+def _selected(diff_entry, prefixes):
+    path, what = diff_entry
+    text = format_path(path)
+    for p in prefixes:
+        if text == p or (text.startswith(p) and text[len(p)] in ".["):
+            return True
+        # Syncing one item of a list also carries its position.
+        if what == ORDER and p.startswith(text) and p[len(text)] == "[":
+            return True
+    return not prefixes
+
+
+def sync(args, trees):
+    synced = 0
+    for export, config in pairs(args.names):
+        if config is None:
+            print(f"⚠️  {export}: no assets/config counterpart; skipped")
+            continue
+        src, dst = (config, export) if args.source == "config" else (export, config)
+        diffs = [d for d in compare(trees, export, config) if _selected(d, args.path)]
+        if not diffs:
+            continue
+        src_doc = read_json(src)
+        dst_doc = read_json(dst)
+        applied = [d for d in diffs if apply(src_doc, dst_doc, *d)]
+        print(f"\n{dst} <- {src}: {len(applied)} subtree(s)")
+        for path, what in applied:
+            print(f"  {format_path(path)}: {what}")
+        if args.dry_run:
+            continue
+        with section("write", file=str(dst)):
+            write_json(dst, dst_doc)
+        synced += 1
+    trees.manifest.save()
+    if args.dry_run:
+        print("\n✅ Dry run: nothing written")
+    else:
+        print(f"\n✅ Synced {synced} file(s) from {args.source}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect and sync drift between assets/data exports and assets/config.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    s = sub.add_parser("status", help="report differing subtrees and duplicate exports")
+    s.add_argument("names", nargs="*", help="limit to these export or config file names")
+    s.add_argument("--limit", type=int, default=20, help="differences listed per pair (default: 20)")
+    y = sub.add_parser("sync", help="copy differing subtrees from one side to the other")
+    y.add_argument("names", nargs="*", help="limit to these export or config file names")
+    y.add_argument("--from", dest="source", choices=("config", "export"), required=True,
+                   help="side whose content wins")
+    y.add_argument("--path", action="append", default=[],
+                   help="only sync paths starting with this prefix, e.g. 'questions[3]' (repeatable)")
+    y.add_argument("--dry-run", action="store_true", help="list what would change without writing")
+    for p in (s, y):
+        p.add_argument("--no-cache", action="store_true", help="rehash every file instead of using the manifest")
+    add_profile_args(*sub.choices.values())
+    args = parser.parse_args()
+    start_profile(args)
+
+    if not EXPORT_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {EXPORT_DIR} (run from repo root)")
+    trees = Trees(enabled=not args.no_cache)
+    if args.command == "status":
+        status(args, trees)
+    else:
+        sync(args, trees)
+
+
+if __name__ == "__main__":
+    run_main(main)
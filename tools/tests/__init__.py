@@ -0,0 +1,4 @@
+"""Unit tests for the shared tools/ modules.
+
+    python3 -m unittest discover -s tools/tests -t tools
+"""
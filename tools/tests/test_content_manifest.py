@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from content_manifest import Manifest, fingerprint, sha256_bytes
+
+INPUT = b'{"a": 1}'
+OUTPUT = b'{\n  "a": 1\n}\n'
+
+
+class ManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "manifest.json"
+        self.manifest = Manifest(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_on_recorded_output(self):
+        self.manifest.record("t", "f.json", INPUT, "k", output_digest=sha256_bytes(OUTPUT), result=[1])
+        self.assertEqual(self.manifest.lookup("t", "f.json", OUTPUT, "k")["result"], [1])
+
+    def test_unchanged_file_hits_on_its_own_bytes(self):
+        self.manifest.record("t", "f.json", INPUT, "k")
+        self.assertIsNotNone(self.manifest.lookup("t", "f.json", INPUT, "k"))
+
+    def test_restored_input_misses(self):
+        # The tool rewrote the file; putting the old bytes back must reprocess it.
+        self.manifest.record("t", "f.json", INPUT, "k", output_digest=sha256_bytes(OUTPUT))
+        self.assertIsNone(self.manifest.lookup("t", "f.json", INPUT, "k"))
+
+    def test_key_tool_and_path_miss(self):
+        self.manifest.record("t", "f.json", INPUT, "k")
+        self.assertIsNone(self.manifest.lookup("t", "f.json", INPUT, "other"))
+        self.assertIsNone(self.manifest.lookup("u", "f.json", INPUT, "k"))
+        self.assertIsNone(self.manifest.lookup("t", "g.json", INPUT, "k"))
+
+    def test_disabled_never_hits_or_saves(self):
+        off = Manifest(self.path, enabled=False)
+        off.record("t", "f.json", INPUT, "k")
+        self.assertIsNone(off.lookup("t", "f.json", INPUT, "k"))
+        off.save()
+        self.assertFalse(self.path.exists())
+
+    def test_save_round_trip(self):
+        self.manifest.record("t", "f.json", INPUT, "k", result={"n": 2})
+        self.manifest.save()
+        entry = Manifest(self.path).lookup("t", "f.json", INPUT, "k")
+        self.assertEqual(entry["result"], {"n": 2})
+
+    def test_fingerprint_tracks_params(self):
+        self.assertEqual(fingerprint(params={"a": 1}), fingerprint(params={"a": 1}))
+        self.assertNotEqual(fingerprint(params={"a": 1}), fingerprint(params={"a": 2}))
+
+
+if __name__ == "__main__":
+    unittest.main()
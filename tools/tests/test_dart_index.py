@@ -0,0 +1,56 @@
+import unittest
+
+from dart_index import STRING_LITERAL, index_source, tokenize
+
+SOURCE = r'''
+// class InLineComment {
+/* class InBlock { /* nested */ } */
+class A {
+  final s = "}";
+  final t = 'it\'s ${m["}"]} {';
+  final r = r'\';
+  final u = """ " } """;
+  A.fromFirestore(Map d) : s = '';
+  static A fromJson(Map d) => A.fromFirestore(d);
+  void f() { if (x) { y(); } }
+}
+final fooProvider = Provider((ref) => A());
+class B {}
+'''
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_strings_collapse_and_comments_drop(self):
+        src = 'a = "x" + \'y\' // c\n + r"\\" /* z */ b;'
+        self.assertEqual([t.text for t in tokenize(src)],
+                         ["a", "=", STRING_LITERAL, "+", STRING_LITERAL, "+", STRING_LITERAL, "b", ";"])
+
+    def test_interpolation_is_part_of_the_string(self):
+        tokens = tokenize("x = 'a ${b['}']} c'; y")
+        self.assertEqual([t.text for t in tokens], ["x", "=", STRING_LITERAL, ";", "y"])
+
+
+class IndexTest(unittest.TestCase):
+    def setUp(self):
+        self.idx = index_source(SOURCE)
+
+    def test_brackets_in_strings_and_comments_are_ignored(self):
+        self.assertEqual(sorted(self.idx.classes), ["A", "B"])
+        a = self.idx.classes["A"]
+        self.assertEqual((SOURCE[a.open], SOURCE[a.close]), ("{", "}"))
+        self.assertTrue(SOURCE[a.close + 1:].lstrip().startswith("final fooProvider"))
+
+    def test_members(self):
+        self.assertEqual(list(self.idx.classes["A"].members),
+                         ["s", "t", "r", "u", "A.fromFirestore", "fromJson", "f"])
+        self.assertTrue(self.idx.has_member("A", "A.fromJson", "fromJson"))
+        self.assertTrue(self.idx.has_member("A", "A.fromFirestore", "fromFirestore"))
+        self.assertFalse(self.idx.has_member("A", "toJson"))
+        self.assertFalse(self.idx.has_member("Missing", "f"))
+
+    def test_providers(self):
+        self.assertEqual(list(self.idx.providers), ["fooProvider"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import json
+import unittest
+from types import GeneratorType
+
+from json_stream import ObjectWriter, OutOfOrder, iter_canonical, iter_object
+
+
+class Trickle(io.StringIO):
+    """Hands out at most `n` characters per read, so values straddle chunks."""
+
+    def __init__(self, text, n=3):
+        super().__init__(text)
+        self.n = n
+
+    def read(self, size=-1):
+        return super().read(self.n)
+
+
+def canonical(data, kind=None):
+    return "".join(iter_canonical(data, kind))
+
+
+def stream(members, kind="journey_catalog"):
+    """Feed (key, value) pairs to an ObjectWriter; lists are streamed."""
+    out = io.StringIO()
+    w = ObjectWriter(out, kind=kind)
+    for key, value in members:
+        if isinstance(value, list):
+            w.begin_array(key)
+            for item in value:
+                w.item(item)
+            w.end_array()
+        else:
+            w.member(key, value)
+    w.close()
+    return out.getvalue()
+
+
+class IterObjectTest(unittest.TestCase):
+    DOC = {"version": "v2", "count": 12345, "products": [{"id": "a", "n": 1.5}, {"id": "é"}], "tail": None}
+
+    def read_all(self, fp):
+        out = {}
+        for key, value in iter_object(fp, "products"):
+            out[key] = list(value) if isinstance(value, GeneratorType) else value
+        return out
+
+    def test_members_in_file_order(self):
+        text = json.dumps(self.DOC, indent=2, ensure_ascii=False)
+        got = self.read_all(io.StringIO(text))
+        self.assertEqual(list(got), list(self.DOC))
+        self.assertEqual(got, self.DOC)
+
+    def test_small_reads(self):
+        # Numbers ending at a chunk edge must not be cut short.
+        self.assertEqual(self.read_all(Trickle(json.dumps(self.DOC))), self.DOC)
+
+    def test_unconsumed_array_is_skipped(self):
+        keys = [k for k, _ in iter_object(io.StringIO(json.dumps(self.DOC)), "products")]
+        self.assertEqual(keys, list(self.DOC))
+
+    def test_empty_object_and_array(self):
+        self.assertEqual(list(iter_object(io.StringIO("{}"), "products")), [])
+        self.assertEqual(self.read_all(io.StringIO('{"products": []}')), {"products": []})
+
+    def test_truncated_input(self):
+        with self.assertRaises(ValueError):
+            self.read_all(io.StringIO('{"products": [1, 2'))
+
+
+class ObjectWriterTest(unittest.TestCase):
+    PRODUCTS = [{"productId": "a", "sessions": [{"n": 1}]}, {"productId": "b", "title": "ü"}]
+
+    def test_matches_canonical_in_lead_order(self):
+        members = [("audienceKey", "x"), ("version", "v2"), ("products", self.PRODUCTS)]
+        self.assertEqual(stream(members), canonical(dict(members), "journey_catalog"))
+
+    def test_reorders_held_back_members(self):
+        members = [("extra", {"k": [1]}), ("version", "v2"), ("audienceKey", "x"),
+                   ("products", self.PRODUCTS), ("notes", "after")]
+        self.assertEqual(stream(members), canonical(dict(members), "journey_catalog"))
+
+    def test_lead_key_after_array_is_out_of_order(self):
+        with self.assertRaises(OutOfOrder):
+            stream([("products", self.PRODUCTS), ("version", "v2")])
+
+    def test_without_kind_keeps_arrival_order(self):
+        members = [("products", self.PRODUCTS), ("version", "v2")]
+        self.assertEqual(stream(members, kind=None), json.dumps(dict(members), indent=2, ensure_ascii=False) + "\n")
+
+    def test_empty_object_and_array(self):
+        self.assertEqual(stream([]), canonical({}))
+        self.assertEqual(stream([("products", [])]), canonical({"products": []}, "journey_catalog"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pass3_normalize_steps as steps
+from json_stream import iter_canonical
+
+SESSION = {"sessionNumber": 1, "title": "Start", "prompt": "Pick one", "responseType": "single_select",
+           "options": "A | B"}
+
+
+def expected(doc):
+    data = json.loads(json.dumps(doc))
+    steps.normalize_catalog(data)
+    return "".join(iter_canonical(data, "journey_catalog"))
+
+
+class RunTest(unittest.TestCase):
+    def run_on(self, doc):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "catalog.json"
+            path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+            whole = mock.patch.object(steps, "normalize_whole", wraps=steps.normalize_whole)
+            with mock.patch.object(steps, "FILES", [path]), mock.patch("builtins.print"), whole as fallback:
+                steps.run(backup=False, check=True)
+            return path.read_text(encoding="utf-8"), fallback.called
+
+    def test_streamed_catalog_matches_whole_write(self):
+        doc = {"audienceKey": "x", "version": "v1", "products": [{"productId": "p", "sessions": [SESSION]}]}
+        self.assertEqual(self.run_on(doc), (expected(doc), False))
+
+    def test_lead_key_after_products_falls_back(self):
+        # "version" canonically precedes "products", so streaming raises
+        # OutOfOrder and run() rewrites the file from the whole document.
+        doc = {"products": [{"productId": "p", "sessions": [SESSION]}], "version": "v1"}
+        self.assertEqual(self.run_on(doc), (expected(doc), True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import time
+import unittest
+
+from tool_jobs import map_jobs
+
+
+def _slow_square(n):
+    # Later items finish first, so out-of-order completion would show.
+    time.sleep(0.01 * (5 - n))
+    return n * n
+
+
+class MapJobsTest(unittest.TestCase):
+    def test_serial_keeps_order(self):
+        self.assertEqual(map_jobs(_slow_square, range(5), jobs=1), [0, 1, 4, 9, 16])
+
+    def test_pool_keeps_order(self):
+        self.assertEqual(map_jobs(_slow_square, range(5), jobs=3), [0, 1, 4, 9, 16])
+
+    def test_empty_and_generator_input(self):
+        self.assertEqual(map_jobs(_slow_square, [], jobs=0), [])
+        self.assertEqual(map_jobs(_slow_square, (n for n in (3, 1)), jobs=2), [9, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
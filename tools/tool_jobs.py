@@ -0,0 +1,28 @@
+"""Fan per-file work out to a process pool while keeping input order."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def add_jobs_arg(parser):
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="worker processes (0 = one per CPU, default: 1)",
+    )
+
+
+def map_jobs(fn, items, jobs=1):
+    """Like list(map(fn, items)), but across `jobs` processes.
+
+    Results come back in the order of `items`, so callers can print and
+    merge totals exactly as the serial loop would.
+    """
+    items = list(items)
+    workers = jobs or os.cpu_count() or 1
+    workers = min(workers, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, items))
@@ -0,0 +1,172 @@
+"""Shared --profile / --cprofile support for the tools/ scripts.
+
+    parser = argparse.ArgumentParser(...)
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+    ...
+    with section("file", file=str(path)):
+        ...
+    with section("pass", file=str(path), stage="normalize"):
+        ...
+
+    if __name__ == "__main__":
+        run_main(main)
+
+With --profile, one JSON record per run is appended to
+build/profile/timings.ndjson (or the given path; "-" for stderr): total and
+per-section wall/CPU time, file bytes read and written, tracemalloc peak,
+and the exit code. Byte counts come from the tools' own file reads and
+writes (content_io.read_bytes/read_text and the content_io writers call
+count_io), so they are the same whether or not the page cache had the
+file; stdout and the profile record itself are not counted. --cprofile PATH also
+dumps cProfile stats. Without either flag every call here is a no-op.
+Sections opened in worker processes (--jobs) are not recorded.
+"""
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROFILE_PATH = Path("build/profile/timings.ndjson")
+RECORD_VERSION = 3
+
+_active = None
+
+
+def add_profile_args(*parsers):
+    """Add --profile/--cprofile; tools with subcommands pass every subparser."""
+    for parser in parsers:
+        parser.add_argument("--profile", nargs="?", const=str(PROFILE_PATH), metavar="PATH",
+                            help=f"append a JSON timing record for this run to PATH (default: {PROFILE_PATH}; '-' = stderr)")
+        parser.add_argument("--cprofile", metavar="PATH", help="also write cProfile stats to PATH (python -m pstats PATH)")
+
+
+def count_io(read=0, written=0):
+    """Add file bytes read/written by the tool to the open sections."""
+    if _active is not None:
+        _active.read += read
+        _active.written += written
+
+
+class Profile:
+    def __init__(self, tool, out=None, cprofile=None):
+        self.tool = tool
+        # Resolved now: a tool may chdir before the record is written.
+        self.out = out if out in (None, "-") else Path(out).resolve()
+        self.cprofile_path = cprofile and Path(cprofile).resolve()
+        self.sections = []
+        self.stack = []
+        self.cprof = None
+        self.read = self.written = 0
+        self.started = datetime.now(timezone.utc)
+        tracemalloc.start()
+        if cprofile:
+            self.cprof = cProfile.Profile()
+            self.cprof.enable()
+        self.root = self.open("run", {})
+
+    def open(self, name, attrs):
+        # tracemalloc has one peak counter: fold it into the enclosing span
+        # before resetting it for this one.
+        if self.stack:
+            parent = self.stack[-1]
+            parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        span = {"name": name, "attrs": attrs, "peak": 0, "read": self.read, "written": self.written,
+                "wall": time.perf_counter(), "cpu": time.process_time()}
+        self.stack.append(span)
+        return span
+
+    def close(self, span):
+        wall = time.perf_counter() - span["wall"]
+        cpu = time.process_time() - span["cpu"]
+        peak = max(span["peak"], tracemalloc.get_traced_memory()[1])
+        self.stack.pop()
+        if self.stack:
+            self.stack[-1]["peak"] = max(self.stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        return {
+            "section": span["name"],
+            **span["attrs"],
+            "wallMs": round(wall * 1000, 3),
+            "cpuMs": round(cpu * 1000, 3),
+            "readBytes": self.read - span["read"],
+            "writeBytes": self.written - span["written"],
+            "peakTracedBytes": peak,
+        }
+
+    def finish(self, exit_code):
+        if self.cprof:
+            self.cprof.disable()
+            self.cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cprof.dump_stats(self.cprofile_path)
+        while len(self.stack) > 1:
+            self.sections.append(self.close(self.stack[-1]))
+        run = self.close(self.root)
+        tracemalloc.stop()
+        run.pop("section")
+        record = {
+            "version": RECORD_VERSION,
+            "tool": self.tool,
+            "argv": sys.argv[1:],
+            "startedAt": self.started.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "exitCode": exit_code,
+            **run,
+            "sections": self.sections,
+        }
+        if not self.out:
+            return
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self.out == "-":
+            sys.stderr.write(line)
+            return
+        self.out.parent.mkdir(parents=True, exist_ok=True)
+        with self.out.open("a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def start_profile(args, tool=None):
+    """Start profiling this run if --profile or --cprofile was given."""
+    global _active
+    if _active is None and (getattr(args, "profile", None) or getattr(args, "cprofile", None)):
+        _active = Profile(tool or Path(sys.argv[0]).stem, args.profile, args.cprofile)
+    return _active
+
+
+@contextmanager
+def section(name, **attrs):
+    prof = _active
+    if prof is None:
+        yield
+        return
+    span = prof.open(name, attrs)
+    try:
+        yield
+    finally:
+        prof.sections.append(prof.close(span))
+
+
+def _finish(code):
+    global _active
+    prof, _active = _active, None
+    if prof:
+        prof.finish(code)
+
+
+def run_main(main):
+    """Call `main` and close the profile it started with its exit status."""
+    try:
+        main()
+    except SystemExit as e:
+        _finish(e.code if isinstance(e.code, int) else (0 if e.code is None else 1))
+        raise
+    except BaseException:
+        _finish(1)
+        raise
+    _finish(0)
@@ -0,0 +1,315 @@
+"""Validate the weekly poll/story configs against the engagement schemas.
+
+The files under `Nexus_2_0_Engagement_JSON_Schemas_and_Templates 2/` are
+example-shaped schemas ("string", 1, "YYYY-MM-DD", "optional ..."), not
+JSON Schema. Each one is compiled once into a small JSON IR, cached in
+.tool_cache/schema_ir/ by schema hash and tool version, and the IR is turned
+into a tree of check closures that every document runs through. Violations
+are reported with RFC 6901 JSON pointers.
+
+    python3 tools/validate_engagement_configs.py
+    python3 tools/validate_engagement_configs.py --schema polls drops/polls_wk_040.json
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+from pathlib import Path
+
+from content_io import read_bytes
+from content_manifest import Manifest, fingerprint, sha256_bytes
+from tool_profile import add_profile_args, run_main, section, start_profile
+
+SCHEMA_DIR = Path("assets/data/Nexus_2_0_Engagement_JSON_Schemas_and_Templates 2")
+ENGAGEMENT_DIR = Path("assets/config/engagement")
+IR_CACHE_DIR = Path(".tool_cache/schema_ir")
+
+SCHEMAS = {
+    "polls": {
+        "schema": SCHEMA_DIR / "polls.v1.schema.json",
+        "documents": [ENGAGEMENT_DIR / "polls_v1.json", SCHEMA_DIR / "polls.v1.template.json"],
+    },
+    "stories": {
+        "schema": SCHEMA_DIR / "stories.v1.schema.json",
+        "documents": [ENGAGEMENT_DIR / "stories_v1.json", SCHEMA_DIR / "stories.v1.template.json"],
+    },
+}
+
+# Blocks in a list that all carry this key are a tagged union on it.
+TAG_KEY = "type"
+DATE_PLACEHOLDER = "YYYY-MM-DD"
+
+
+# ---------------------------------------------------------------------------
+# Example -> IR
+# ---------------------------------------------------------------------------
+
+def _is_optional(example) -> bool:
+    return example is None or (isinstance(example, str) and example.lower().startswith("optional"))
+
+
+def infer(example) -> dict:
+    if isinstance(example, dict):
+        return {
+            "type": "object",
+            "properties": {k: infer(v) for k, v in example.items()},
+            "required": [k for k, v in example.items() if not _is_optional(v)],
+        }
+    if isinstance(example, list):
+        return {"type": "array", "items": _infer_items(example)}
+    if isinstance(example, bool):
+        return {"type": "boolean"}
+    if isinstance(example, int):
+        return {"type": "integer"}
+    if isinstance(example, float):
+        return {"type": "number"}
+    if isinstance(example, str):
+        if example == DATE_PLACEHOLDER:
+            return {"type": "string", "format": "date"}
+        return {"type": "string"}
+    return {"type": "any"}
+
+
+def _merge_objects(examples) -> dict:
+    """One object IR for a list of same-shaped examples.
+
+    A key is required only when every example has it; the first example of
+    each key decides its type.
+    """
+    merged = {}
+    for ex in examples:
+        for k, v in ex.items():
+            merged.setdefault(k, v)
+    ir = infer(merged)
+    ir["required"] = [k for k in ir["required"] if all(k in ex for ex in examples)]
+    return ir
+
+
+def _infer_items(examples) -> dict:
+    if not examples:
+        return {"type": "any"}
+    if all(isinstance(x, dict) for x in examples):
+        tags = [x.get(TAG_KEY) for x in examples]
+        if all(isinstance(t, str) for t in tags) and len(set(tags)) > 1:
+            variants = {}
+            for tag in dict.fromkeys(tags):
+                variants[tag] = _merge_objects([x for x in examples if x[TAG_KEY] == tag])
+            return {"type": "union", "tag": TAG_KEY, "variants": variants}
+        return _merge_objects(examples)
+    if all(isinstance(x, str) for x in examples):
+        # ["string", "string"] is a placeholder list; concrete distinct values
+        # (the audiences list) are the allowed set.
+        concrete = [x for x in examples if x != "string" and not _is_optional(x)]
+        if concrete and len(set(concrete)) == len(examples):
+            return {"type": "enum", "values": list(dict.fromkeys(concrete))}
+        return infer(examples[0])
+    return infer(examples[0])
+
+
+def schema_key(raw: bytes) -> str:
+    return fingerprint(sys.modules[__name__], params={"schema": sha256_bytes(raw)})
+
+
+def load_ir(raw: bytes, key: str, use_cache=True) -> dict:
+    cached = IR_CACHE_DIR / f"{key}.json"
+    if use_cache and cached.exists():
+        try:
+            return json.loads(cached.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+
+    ir = infer(json.loads(raw.decode("utf-8")))
+    if use_cache:
+        IR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(".tmp")
+        tmp.write_text(json.dumps(ir, ensure_ascii=False) + "\n", encoding="utf-8")
+        os.replace(tmp, cached)
+    return ir
+
+
+# ---------------------------------------------------------------------------
+# IR -> closures
+# ---------------------------------------------------------------------------
+# A check is fn(value, path, errors). `path` is a linked (parent, token)
+# tuple so descending costs nothing until a pointer is actually reported.
+
+def pointer(path) -> str:
+    parts = []
+    while path:
+        path, token = path
+        parts.append(str(token).replace("~", "~0").replace("/", "~1"))
+    return "".join("/" + p for p in reversed(parts))
+
+
+def _type_name(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    return {dict: "object", list: "array", str: "string", int: "integer", float: "number"}.get(type(value), "unknown")
+
+
+def compile_ir(ir):
+    kind = ir["type"]
+
+    if kind == "object":
+        props = [(k, compile_ir(sub)) for k, sub in ir["properties"].items()]
+        required = ir["required"]
+
+        def check_object(value, path, errors):
+            if type(value) is not dict:
+                errors.append((pointer(path), f"expected object, got {_type_name(value)}"))
+                return
+            for k in required:
+                if k not in value:
+                    errors.append((pointer((path, k)), "missing required property"))
+            for k, check in props:
+                if k in value:
+                    check(value[k], (path, k), errors)
+        return check_object
+
+    if kind == "array":
+        item = compile_ir(ir["items"])
+
+        def check_array(value, path, errors):
+            if type(value) is not list:
+                errors.append((pointer(path), f"expected array, got {_type_name(value)}"))
+                return
+            for i, v in enumerate(value):
+                item(v, (path, i), errors)
+        return check_array
+
+    if kind == "union":
+        tag = ir["tag"]
+        variants = {t: compile_ir(sub) for t, sub in ir["variants"].items()}
+        allowed = ", ".join(variants)
+
+        def check_union(value, path, errors):
+            if type(value) is not dict:
+                errors.append((pointer(path), f"expected object, got {_type_name(value)}"))
+                return
+            check = variants.get(value.get(tag))
+            if check is None:
+                errors.append((pointer((path, tag)), f"{value.get(tag)!r} is not one of: {allowed}"))
+                return
+            check(value, path, errors)
+        return check_union
+
+    if kind == "enum":
+        values = frozenset(ir["values"])
+        allowed = ", ".join(ir["values"])
+
+        def check_enum(value, path, errors):
+            if type(value) is not str or value not in values:
+                errors.append((pointer(path), f"{value!r} is not one of: {allowed}"))
+        return check_enum
+
+    if kind == "string":
+        if ir.get("format") == "date":
+            def check_date(value, path, errors):
+                if type(value) is not str:
+                    errors.append((pointer(path), f"expected string, got {_type_name(value)}"))
+                    return
+                try:
+                    datetime.date.fromisoformat(value)
+                except ValueError:
+                    errors.append((pointer(path), f"{value!r} is not a {DATE_PLACEHOLDER} date"))
+            return check_date
+
+        def check_string(value, path, errors):
+            if type(value) is not str:
+                errors.append((pointer(path), f"expected string, got {_type_name(value)}"))
+        return check_string
+
+    if kind == "integer":
+        def check_integer(value, path, errors):
+            if type(value) is not int:
+                errors.append((pointer(path), f"expected integer, got {_type_name(value)}"))
+        return check_integer
+
+    if kind == "number":
+        def check_number(value, path, errors):
+            if type(value) not in (int, float):
+                errors.append((pointer(path), f"expected number, got {_type_name(value)}"))
+        return check_number
+
+    if kind == "boolean":
+        def check_boolean(value, path, errors):
+            if type(value) is not bool:
+                errors.append((pointer(path), f"expected boolean, got {_type_name(value)}"))
+        return check_boolean
+
+    return lambda value, path, errors: None
+
+
+def validate(check, data) -> list:
+    errors = []
+    check(data, None, errors)
+    return [list(e) for e in errors]
+
+
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate engagement configs against the example-shaped schemas.")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), help="validate only this schema (required with paths)")
+    parser.add_argument("--no-cache", action="store_true", help="recompile schemas and revalidate every document")
+    parser.add_argument("paths", nargs="*", type=Path, help="documents to validate instead of the defaults")
+    add_profile_args(parser)
+    args = parser.parse_args()
+    start_profile(args)
+
+    if args.paths and not args.schema:
+        parser.error("--schema is required when paths are given")
+    if not SCHEMA_DIR.exists():
+        raise SystemExit(f"❌ Missing folder: {SCHEMA_DIR} (run from repo root)")
+
+    manifest = Manifest(enabled=not args.no_cache)
+    names = [args.schema] if args.schema else list(SCHEMAS)
+    total_docs = 0
+    total_errors = 0
+
+    for name in names:
+        spec = SCHEMAS[name]
+        schema_raw = read_bytes(spec["schema"])
+        key = schema_key(schema_raw)
+        with section("compile", schema=name):
+            check = compile_ir(load_ir(schema_raw, key, use_cache=not args.no_cache))
+
+        for path in args.paths or spec["documents"]:
+            if not path.exists():
+                print(f"❌ Missing file: {path}")
+                total_errors += 1
+                continue
+            with section("read", file=str(path)):
+                raw = read_bytes(path)
+            entry = manifest.lookup(f"validate:{name}", path, raw, key)
+            if entry:
+                errors = entry["result"]
+            else:
+                with section("file", file=str(path), schema=name):
+                    try:
+                        errors = validate(check, json.loads(raw.decode("utf-8")))
+                    except ValueError as e:
+                        errors = [["", f"invalid JSON: {e}"]]
+                manifest.record(f"validate:{name}", path, raw, key, result=errors)
+
+            total_docs += 1
+            total_errors += len(errors)
+            if errors:
+                print(f"❌ {path} ({name}): {len(errors)} violation(s)")
+                for ptr, msg in errors:
+                    print(f"  - {ptr or '/'}: {msg}")
+            else:
+                print(f"✅ {path} ({name})")
+
+    manifest.save()
+    if total_errors:
+        print(f"\n❌ {total_errors} violation(s) across {total_docs} document(s).")
+        raise SystemExit(1)
+    print(f"\n✅ {total_docs} document(s) valid.")
+
+
+if __name__ == "__main__":
+    run_main(main)